@@ -16,11 +16,213 @@ class Settings(BaseSettings):
     #  - actual list (when set programmatically)
     CORS_ORIGINS: Optional[Union[str, List[str]]] = "*"
 
+    # database connection pools (per process, for both the sync and async engines;
+    # pool and timeout settings only apply to PostgreSQL)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    # connections older than this are replaced (stay under server/proxy idle limits)
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # server-side statement_timeout for every connection (0 = no limit)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # async engine URL; None = DATABASE_URL with its async driver (asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # serve the candidate hot path (link lookup, register, start, save-answer)
+    # with async handlers on the async engine instead of threadpool threads
+    DB_ASYNC_ROUTES: bool = False
+
     # optional extras
     SECRET_KEY: Optional[str] = None
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
 
+    # audio uploads (Whisper rejects files over 25 MB)
+    MAX_AUDIO_UPLOAD_BYTES: int = 25 * 1024 * 1024
+    # non-seekable uploads are copied to a temp file that moves to disk past this size
+    AUDIO_SPOOL_MAX_MEMORY_BYTES: int = 1024 * 1024
+
+    # audio preprocessing before transcription (skipped if ffmpeg is not installed)
+    AUDIO_PREPROCESSING_ENABLED: bool = True
+    FFMPEG_PATH: str = "ffmpeg"
+    # frames quieter than this are treated as silence when trimming
+    AUDIO_SILENCE_THRESHOLD_DBFS: float = -45.0
+    # silence kept around the voiced region so word edges are not clipped
+    AUDIO_SILENCE_PADDING_MS: int = 200
+    AUDIO_OUTPUT_CODEC: str = "libopus"
+    AUDIO_OUTPUT_FORMAT: str = "ogg"
+    AUDIO_OUTPUT_BITRATE: str = "24k"
+
+    # long recordings are split at silences and transcribed in parallel
+    # (requires audio preprocessing)
+    CHUNKED_TRANSCRIPTION_ENABLED: bool = True
+    # only recordings longer than this are split
+    TRANSCRIPTION_CHUNK_MIN_SECONDS: float = 40.0
+    TRANSCRIPTION_CHUNK_SECONDS: float = 20.0
+    TRANSCRIPTION_CHUNK_OVERLAP_SECONDS: float = 1.0
+    # how far either side of the target boundary to look for the quietest point
+    TRANSCRIPTION_CHUNK_SEARCH_SECONDS: float = 3.0
+    # concurrent segment transcriptions per worker process
+    TRANSCRIPTION_CHUNK_WORKERS: int = 8
+    # streamed answers (WebSocket /ai/answer/stream): each segment is sent for
+    # transcription at the first pause of STREAMING_PAUSE_MS once it is at least
+    # STREAMING_SEGMENT_MIN_SECONDS long, or at its quietest point near
+    # STREAMING_SEGMENT_MAX_SECONDS when the candidate does not pause
+    STREAMING_SEGMENT_MIN_SECONDS: float = 4.0
+    STREAMING_SEGMENT_MAX_SECONDS: float = 15.0
+    STREAMING_PAUSE_MS: int = 400
+    # the session is abandoned when no audio or stop message arrives for this long
+    STREAMING_IDLE_TIMEOUT_SECONDS: float = 30.0
+
+    # AI transcription
+    # "openai" (hosted Whisper API) or "local" (faster-whisper on local CPU cores)
+    TRANSCRIPTION_BACKEND: str = "openai"
+    WHISPER_MODEL: str = "whisper-1"
+    LOCAL_WHISPER_MODEL: str = "base"
+    # CTranslate2 quantization: int8, int8_float32, float32
+    LOCAL_WHISPER_COMPUTE_TYPE: str = "int8"
+    # pool processes, each holding its own model copy
+    LOCAL_WHISPER_WORKERS: int = 2
+    # threads per pool process (0 = all cores)
+    LOCAL_WHISPER_CPU_THREADS: int = 2
+    LOCAL_WHISPER_TIMEOUT_SECONDS: int = 120
+    # max entries in the in-process transcription cache (0 disables the memory tier)
+    TRANSCRIPTION_CACHE_SIZE: int = 1024
+    # hedged requests: when a call is slower than this percentile of recent
+    # latencies, a second attempt is sent and the first to finish wins
+    TRANSCRIPTION_HEDGING_ENABLED: bool = True
+    TRANSCRIPTION_HEDGE_PERCENTILE: float = 95.0
+    TRANSCRIPTION_HEDGE_MIN_DELAY_SECONDS: float = 0.5
+    # latencies remembered per backend; hedging starts once MIN_SAMPLES were seen
+    TRANSCRIPTION_HEDGE_SAMPLE_SIZE: int = 200
+    TRANSCRIPTION_HEDGE_MIN_SAMPLES: int = 20
+    # larger uploads are sent once (hedging holds the audio in memory)
+    TRANSCRIPTION_HEDGE_MAX_BYTES: int = 5 * 1024 * 1024
+    TRANSCRIPTION_HEDGE_THREADS: int = 32
+    # circuit breaker: opens when the error rate over the window reaches the
+    # threshold; requests then go to TRANSCRIPTION_FALLBACK_BACKEND or fail fast
+    TRANSCRIPTION_FALLBACK_BACKEND: Optional[str] = None
+    CIRCUIT_BREAKER_ERROR_THRESHOLD: float = 0.5
+    CIRCUIT_BREAKER_MIN_REQUESTS: int = 10
+    CIRCUIT_BREAKER_WINDOW_SECONDS: float = 60.0
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = 30.0
+
+    # AI evaluation
+    # "gemini" or "heuristic" (local, deterministic); interviews may override
+    EVALUATOR_BACKEND: str = "gemini"
+    # answers instead when the primary backend errors or times out (empty = no fallback)
+    EVALUATOR_FALLBACK_BACKEND: Optional[str] = "heuristic"
+    # 0 disables the timeout
+    EVALUATION_TIMEOUT_SECONDS: float = 20.0
+    EVALUATION_THREADS: int = 32
+    # heuristic evaluator: answers under HEURISTIC_MIN_WORDS score 1,
+    # full length credit at HEURISTIC_TARGET_WORDS
+    HEURISTIC_MIN_WORDS: int = 3
+    HEURISTIC_TARGET_WORDS: int = 80
+    GEMINI_MODEL: str = "gemini-pro"
+    # bump whenever the evaluation prompt changes so cached results are not reused
+    EVALUATION_PROMPT_VERSION: str = "4"
+    # evaluation prompt token budget; longer answers keep their beginning and end
+    # (tokens are estimated at EVALUATION_CHARS_PER_TOKEN characters per token)
+    EVALUATION_MAX_ANSWER_TOKENS: int = 1500
+    # per answer; batch prompts get this times the number of answers
+    EVALUATION_MAX_OUTPUT_TOKENS: int = 256
+    EVALUATION_CHARS_PER_TOKEN: float = 4.0
+    # cheap-model-first routing for the gemini evaluator: answers are scored by
+    # EVALUATION_FAST_MODEL and re-scored by GEMINI_MODEL when the score falls in
+    # the borderline range, the response cannot be parsed, the model's confidence
+    # is below EVALUATION_ESCALATE_MIN_CONFIDENCE or the call fails
+    # (empty = always use GEMINI_MODEL)
+    EVALUATION_FAST_MODEL: Optional[str] = "gemini-1.5-flash"
+    EVALUATION_ESCALATE_SCORE_MIN: int = 5
+    EVALUATION_ESCALATE_SCORE_MAX: int = 6
+    EVALUATION_ESCALATE_MIN_CONFIDENCE: int = 7
+    # local pre-screen before the evaluator: answers with no words or fewer than
+    # PRESCREEN_MIN_CONTENT_WORDS non-filler words score 1, and answers of at most
+    # PRESCREEN_OFF_TOPIC_MAX_WORDS content words whose character trigram TF-IDF
+    # similarity to the question is below PRESCREEN_MIN_SIMILARITY score 2 (unrelated
+    # English text scores about 0.1-0.2, so the default only catches answers
+    # sharing next to nothing with the question)
+    PRESCREEN_ENABLED: bool = True
+    PRESCREEN_MIN_CONTENT_WORDS: int = 3
+    PRESCREEN_MIN_SIMILARITY: float = 0.05
+    PRESCREEN_OFF_TOPIC_MAX_WORDS: int = 40
+    # question rubrics: when the admin gives no expected points, ask Gemini for
+    # them once when the question is added (falls back to the question's key terms)
+    RUBRIC_GENERATION_ENABLED: bool = True
+    RUBRIC_MAX_POINTS: int = 5
+    # max entries in the in-process evaluation cache (0 disables the memory tier)
+    EVALUATION_CACHE_SIZE: int = 2048
+
+    # admin interview dashboard: candidates per page (clients may ask for up to the max)
+    DASHBOARD_PAGE_SIZE: int = 50
+    DASHBOARD_MAX_PAGE_SIZE: int = 200
+    # admin interview and candidate listings: rows per page (keyset pagination)
+    LIST_PAGE_SIZE: int = 50
+    LIST_MAX_PAGE_SIZE: int = 200
+    # candidate reports kept serialized in process, invalidated by the
+    # candidate's stats version (0 disables the cache)
+    REPORT_CACHE_SIZE: int = 512
+
+    # serve /ai/* with async handlers that await provider calls on the
+    # event loop instead of holding threadpool threads
+    AI_ASYNC_ROUTES: bool = False
+
+    # shared AI provider clients
+    # pooled keep-alive HTTP connections to the OpenAI API
+    AI_HTTP_MAX_CONNECTIONS: int = 64
+    AI_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 32
+    AI_HTTP_KEEPALIVE_SECONDS: float = 120.0
+    AI_HTTP_TIMEOUT_SECONDS: float = 60.0
+    AI_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    # "grpc" (one multiplexed channel) or "rest"
+    GEMINI_TRANSPORT: str = "grpc"
+    # open provider connections at start-up instead of on the first request
+    AI_CLIENT_WARMUP_ENABLED: bool = True
+    # OpenAI connections opened during warm-up
+    AI_CLIENT_WARMUP_CONNECTIONS: int = 4
+
+    # provider rate limiting: token bucket (requests per minute, 0 = no cap)
+    # plus a concurrency window that shrinks on 429/503 and regrows on success
+    OPENAI_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_MAX_CONCURRENCY: int = 16
+    GEMINI_REQUESTS_PER_MINUTE: int = 60
+    GEMINI_MAX_CONCURRENCY: int = 16
+    PROVIDER_MIN_CONCURRENCY: int = 1
+    # how long a call may queue (including backoff) before it is rejected
+    PROVIDER_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    PROVIDER_MAX_RETRIES: int = 4
+    # jittered exponential backoff after a 429/503
+    PROVIDER_BACKOFF_BASE_SECONDS: float = 0.5
+    PROVIDER_BACKOFF_MAX_SECONDS: float = 8.0
+
+    # single-flight: concurrent identical transcribe/evaluate calls share one provider call
+    SINGLE_FLIGHT_ENABLED: bool = True
+    # also coordinate worker processes through the ai_call_locks table
+    SINGLE_FLIGHT_CROSS_WORKER: bool = False
+    # how long a duplicate waits for the in-flight call before making its own
+    SINGLE_FLIGHT_WAIT_SECONDS: float = 120.0
+    SINGLE_FLIGHT_POLL_INTERVAL_SECONDS: float = 0.25
+    # lock rows older than this are assumed orphaned by a crashed worker
+    SINGLE_FLIGHT_LOCK_TTL_SECONDS: int = 180
+
+    # evaluation job queue
+    # number of in-process worker threads (0 = rely on run_evaluation_worker.py)
+    EVALUATION_WORKERS: int = 4
+    EVALUATION_JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    EVALUATION_JOB_MAX_ATTEMPTS: int = 3
+    # running jobs untouched for this long are assumed orphaned and re-claimed
+    EVALUATION_JOB_STALE_SECONDS: int = 300
+    # rate-limited jobs wait before being re-claimed: the provider's retry-after,
+    # at least this base doubled per consecutive throttle, up to the max
+    EVALUATION_JOB_THROTTLE_BACKOFF_SECONDS: float = 2.0
+    EVALUATION_JOB_THROTTLE_BACKOFF_MAX_SECONDS: float = 300.0
+    # a job throttled this many times is marked failed
+    EVALUATION_JOB_MAX_THROTTLES: int = 10
+    # upper bound for how long a client may block waiting on a job result
+    EVALUATION_JOB_MAX_WAIT_SECONDS: int = 30
+    # max answers scored in one Gemini request (workers claim up to this many jobs at once)
+    EVALUATION_BATCH_SIZE: int = 10
+
     class Config:
         env_file = ".env"
         # ignore any extra environment vars instead of failing
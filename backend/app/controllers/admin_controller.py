@@ -1,7 +1,8 @@
 """
 Admin controller for handling admin-related requests
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, asc, cast, desc, func, nulls_last, or_, select
+from sqlalchemy.orm import Session, contains_eager, joinedload
 from fastapi import HTTPException, status
 from app.models.admin import Admin
 from app.models.interview import Interview
@@ -9,9 +10,19 @@ from app.models.candidate import Candidate
 from app.models.answer import Answer
 from app.models.question import Question
 from app.models.interview_link import InterviewLink
+from app.models.candidate_stats import CandidateStats
+from app.models.interview_stats import InterviewStats
 from app.schemas.admin import AdminSignupRequest, AdminLoginRequest, AdminLoginResponse
 from app.schemas.interview import InterviewCreate, InterviewResponse, InterviewListResponse
-from app.schemas.answer import DashboardResponse, ReportResponse, CandidateDetail, CandidateAnswerDetail
+from app.schemas.candidate import CandidateListResponse, CandidateResponse
+from app.schemas.answer import (
+    DashboardResponse,
+    DashboardSort,
+    ReportResponse,
+    CandidateDetail,
+    CandidateAnswerDetail,
+    SortOrder
+)
 from app.services.auth_service import (
     verify_password,
     get_password_hash,
@@ -20,9 +31,30 @@ from app.services.auth_service import (
 )
 from app.services.interview_service import create_interview_with_link
 from app.services.email_service import send_interview_invitation
-from typing import List, Optional
+from app.services.ai_service import evaluate_texts_batch
+from app.services.evaluator_backends import BACKENDS as EVALUATOR_BACKENDS, get_routing_stats
+from app.services.prescreen_service import get_prescreen_stats
+from app.services.ai_client_service import get_client_pool_stats
+from app.services.rate_limit_service import ProviderThrottled, get_limiter_stats
+from app.services.resilience_service import get_resilience_stats
+from app.services.single_flight_service import get_single_flight_stats
+from app.services.prompt_service import get_token_usage_stats
+from app.services.rubric_service import compile_rubric
+from app.services.stats_service import record_answer_change, score_change
+from app.services.pagination_service import InvalidCursor, keyset_page, search_pattern
+from app.services.cache_service import (
+    get_evaluation_cache_stats,
+    invalidate_evaluation_cache,
+    get_transcription_cache_stats,
+    get_cached_report,
+    store_cached_report,
+    get_report_cache_stats
+)
+from app.config import settings
+from typing import Optional
 from datetime import datetime
 import json
+import math
 
 
 def signup_admin(db: Session, signup_data: AdminSignupRequest) -> AdminLoginResponse:
@@ -125,11 +157,21 @@ def create_interview(
     
     Returns:
         InterviewResponse with shareable link
+    
+    Raises:
+        HTTPException: If the evaluator backend is unknown
     """
+    if interview_data.evaluator_backend and interview_data.evaluator_backend not in EVALUATOR_BACKENDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown evaluator backend: {interview_data.evaluator_backend}"
+        )
+    
     interview, link_code = create_interview_with_link(  # No password returned
         db=db,
         title=interview_data.title,
-        description=interview_data.description
+        description=interview_data.description,
+        evaluator_backend=interview_data.evaluator_backend
     )
     
     # Generate shareable link URL
@@ -143,6 +185,7 @@ def create_interview(
         id=str(interview.id),
         title=interview.title,
         description=interview.description,
+        evaluator_backend=interview.evaluator_backend,
         created_at=interview.created_at,
         shareable_link=shareable_link,
         candidate_password=None  # No password
@@ -152,15 +195,21 @@ def create_interview(
 def add_question_to_interview(
     db: Session,
     interview_id: str,
-    question_text: str
+    question_text: str,
+    expected_points: Optional[str] = None
 ) -> dict:
     """
     Add a question to an interview
     
+    The question's evaluation rubric is compiled here, once, and stored
+    with it; every evaluation of an answer to it reuses the rubric.
+    
     Args:
         db: Database session
         interview_id: Interview ID
         question_text: Question text
+        expected_points: Key points a good answer covers, one per line
+            (generated when omitted)
     
     Returns:
         Dictionary with question details
@@ -177,7 +226,8 @@ def add_question_to_interview(
     
     question = Question(
         interview_id=interview_id,
-        question_text=question_text
+        question_text=question_text,
+        rubric=compile_rubric(question_text, expected_points)
     )
     db.add(question)
     db.commit()
@@ -187,25 +237,63 @@ def add_question_to_interview(
         "id": str(question.id),
         "interview_id": str(question.interview_id),
         "question_text": question.question_text,
+        "rubric": question.rubric,
         "created_at": question.created_at
     }
 
 
-def get_all_interviews(db: Session) -> InterviewListResponse:
+def get_all_interviews(
+    db: Session,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    search: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include_total: bool = True
+) -> InterviewListResponse:
     """
-    Get all interviews
+    Get one page of interviews, newest first
+    
+    Pages are keyset-paginated on (created_at, id) and links are loaded in
+    the same query, so a page costs one query (two with the total count)
+    however deep it is.
     
     Args:
         db: Database session
+        cursor: next_cursor from the previous page (None for the first page)
+        limit: Interviews per page (defaults to LIST_PAGE_SIZE, capped at LIST_MAX_PAGE_SIZE)
+        search: Only interviews whose title contains this text (case-insensitive)
+        created_from: Only interviews created at or after this time
+        created_to: Only interviews created before this time
+        include_total: Also count all matching interviews
     
     Returns:
-        InterviewListResponse with list of interviews
+        InterviewListResponse with the page of interviews
+    
+    Raises:
+        HTTPException: If the cursor is invalid
     """
-    interviews = db.query(Interview).all()
+    limit = max(1, min(limit or settings.LIST_PAGE_SIZE, settings.LIST_MAX_PAGE_SIZE))
+    filters = []
+    if search:
+        filters.append(Interview.title.ilike(search_pattern(search), escape="\\"))
+    if created_from:
+        filters.append(Interview.created_at >= created_from)
+    if created_to:
+        filters.append(Interview.created_at < created_to)
+    
+    query = db.query(Interview).options(joinedload(Interview.interview_link)).filter(*filters)
+    try:
+        interviews, next_cursor = keyset_page(query, Interview.created_at, Interview.id, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    total = db.query(func.count(Interview.id)).filter(*filters).scalar() if include_total else None
     
     interview_responses = []
     for interview in interviews:
-        print(f"Interview ID: {interview.id}, Title: {interview.title}, Description: {interview.description}, Created: {interview.created_at}")
         # Get shareable link if exists
         shareable_link = None
         if interview.interview_link:
@@ -215,6 +303,7 @@ def get_all_interviews(db: Session) -> InterviewListResponse:
             id=str(interview.id),
             title=interview.title,
             description=interview.description,
+            evaluator_backend=interview.evaluator_backend,
             created_at=interview.created_at,
             shareable_link=shareable_link,
             
@@ -223,102 +312,209 @@ def get_all_interviews(db: Session) -> InterviewListResponse:
     
     return InterviewListResponse(
         interviews=interview_responses,
-        total=len(interview_responses)
+        total=total,
+        next_cursor=next_cursor
     )
 
 
-def get_interview_dashboard(db: Session, interview_id: str) -> DashboardResponse:
+def get_interview_dashboard(
+    db: Session,
+    interview_id: str,
+    page: int = 1,
+    page_size: Optional[int] = None,
+    sort_by: DashboardSort = "created_at",
+    order: SortOrder = "desc"
+) -> DashboardResponse:
     """
-    Get dashboard data for a specific interview
+    Get dashboard data for a specific interview, one page of candidates at a time
+    
+    Runs two queries however many candidates and answers there are: one for
+    the interview with its totals and answer rollup, and one for the page's
+    candidates joined to their precomputed stats (see stats_service), so no
+    answers are scanned.
     
     Args:
         db: Database session
         interview_id: Interview ID
+        page: 1-based page number
+        page_size: Candidates per page (defaults to DASHBOARD_PAGE_SIZE, capped at DASHBOARD_MAX_PAGE_SIZE)
+        sort_by: created_at, average_score or last_answer_at (candidates without scores sort last)
+        order: asc or desc
     
     Returns:
-        DashboardResponse with interview stats and candidate list
+        DashboardResponse with interview stats and the page of candidates
     
     Raises:
         HTTPException: If interview not found
     """
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
+    page = max(1, page)
+    page_size = max(1, min(page_size or settings.DASHBOARD_PAGE_SIZE, settings.DASHBOARD_MAX_PAGE_SIZE))
+    
+    candidate_count = (
+        select(func.count(Candidate.id))
+        .where(Candidate.interview_id == Interview.id)
+        .correlate(Interview)
+        .scalar_subquery()
+    )
+    question_count = (
+        select(func.count(Question.id))
+        .where(Question.interview_id == Interview.id)
+        .correlate(Interview)
+        .scalar_subquery()
+    )
+    interview = db.query(
+        Interview.id,
+        Interview.title,
+        candidate_count.label("total_candidates"),
+        question_count.label("total_questions"),
+        InterviewStats.answer_count,
+        InterviewStats.scored_count,
+        InterviewStats.score_sum
+    ).outerjoin(
+        InterviewStats, InterviewStats.interview_id == Interview.id
+    ).filter(Interview.id == interview_id).first()
     if not interview:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Interview not found"
         )
     
-    # Get all candidates for this interview
-    candidates = db.query(Candidate).filter(Candidate.interview_id == interview_id).all()
-    
-    candidate_details = []
-    for candidate in candidates:
-        # Get answers for this candidate
-        answers = db.query(Answer).filter(Answer.candidate_id == candidate.id).all()
-        
-        # Calculate average score
-        scores = [a.score for a in answers if a.score is not None]
-        average_score = sum(scores) / len(scores) if scores else None
-        
-        candidate_details.append(CandidateDetail(
-            candidate_id=str(candidate.id),
-            name=candidate.name,
-            email=candidate.email,
-            created_at=candidate.created_at,
-            total_answers=len(answers),
-            average_score=average_score
-        ))
-    
-    # Get total questions
-    total_questions = db.query(Question).filter(Question.interview_id == interview_id).count()
+    average_score = (
+        cast(CandidateStats.score_sum, Float) / func.nullif(CandidateStats.scored_count, 0)
+    ).label("average_score")
+    sort_column = {
+        "created_at": Candidate.created_at,
+        "average_score": average_score,
+        "last_answer_at": CandidateStats.last_answer_at
+    }[sort_by]
+    direction = desc if order == "desc" else asc
+    
+    rows = (
+        db.query(
+            Candidate.id,
+            Candidate.name,
+            Candidate.email,
+            Candidate.created_at,
+            CandidateStats.answer_count,
+            average_score,
+            CandidateStats.last_answer_at
+        )
+        .outerjoin(CandidateStats, CandidateStats.candidate_id == Candidate.id)
+        .filter(Candidate.interview_id == interview_id)
+        # Candidate ID breaks ties so pages never overlap or skip rows
+        .order_by(nulls_last(direction(sort_column)), direction(Candidate.id))
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
     
     return DashboardResponse(
         interview_id=str(interview.id),
         interview_title=interview.title,
-        total_candidates=len(candidates),
-        total_questions=total_questions,
-        candidates=candidate_details
+        total_candidates=interview.total_candidates,
+        total_questions=interview.total_questions,
+        total_answers=interview.answer_count or 0,
+        average_score=interview.score_sum / interview.scored_count if interview.scored_count else None,
+        page=page,
+        page_size=page_size,
+        candidates=[
+            CandidateDetail(
+                candidate_id=str(row.id),
+                name=row.name,
+                email=row.email,
+                created_at=row.created_at,
+                total_answers=row.answer_count or 0,
+                average_score=float(row.average_score) if row.average_score is not None else None,
+                last_answer_at=row.last_answer_at
+            )
+            for row in rows
+        ]
     )
 
 
-def get_interview_candidates(db: Session, interview_id: str) -> List[dict]:
+def get_interview_candidates(
+    db: Session,
+    interview_id: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    search: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include_total: bool = True
+) -> CandidateListResponse:
     """
-    Get all candidates for an interview
+    Get one page of an interview's candidates, newest first (keyset-paginated on created_at, id)
     
     Args:
         db: Database session
         interview_id: Interview ID
+        cursor: next_cursor from the previous page (None for the first page)
+        limit: Candidates per page (defaults to LIST_PAGE_SIZE, capped at LIST_MAX_PAGE_SIZE)
+        search: Only candidates whose name or email contains this text (case-insensitive)
+        created_from: Only candidates registered at or after this time
+        created_to: Only candidates registered before this time
+        include_total: Also count all matching candidates
     
     Returns:
-        List of candidate dictionaries
+        CandidateListResponse with the page of candidates
     
     Raises:
-        HTTPException: If interview not found
+        HTTPException: If interview not found or the cursor is invalid
     """
-    interview = db.query(Interview).filter(Interview.id == interview_id).first()
-    if not interview:
+    if not db.query(Interview.id).filter(Interview.id == interview_id).first():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Interview not found"
         )
     
-    candidates = db.query(Candidate).filter(Candidate.interview_id == interview_id).all()
-    
-    return [
-        {
-            "id": str(c.id),
-            "name": c.name,
-            "email": c.email,
-            "created_at": c.created_at
-        }
-        for c in candidates
-    ]
+    limit = max(1, min(limit or settings.LIST_PAGE_SIZE, settings.LIST_MAX_PAGE_SIZE))
+    filters = [Candidate.interview_id == interview_id]
+    if search:
+        pattern = search_pattern(search)
+        filters.append(or_(
+            Candidate.name.ilike(pattern, escape="\\"),
+            Candidate.email.ilike(pattern, escape="\\")
+        ))
+    if created_from:
+        filters.append(Candidate.created_at >= created_from)
+    if created_to:
+        filters.append(Candidate.created_at < created_to)
+    
+    try:
+        candidates, next_cursor = keyset_page(
+            db.query(Candidate).filter(*filters), Candidate.created_at, Candidate.id, cursor, limit
+        )
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    total = db.query(func.count(Candidate.id)).filter(*filters).scalar() if include_total else None
+    
+    return CandidateListResponse(
+        candidates=[
+            CandidateResponse(
+                id=str(c.id),
+                interview_id=str(c.interview_id),
+                name=c.name,
+                email=c.email,
+                created_at=c.created_at
+            )
+            for c in candidates
+        ],
+        total=total,
+        next_cursor=next_cursor
+    )
 
 
 def get_candidate_report(db: Session, candidate_id: str) -> ReportResponse:
     """
     Get detailed report for a candidate
     
+    The candidate, interview, answers with their question text and the
+    interview's question count come from a single query; answers are in
+    question order.
+    
     Args:
         db: Database session
         candidate_id: Candidate ID
@@ -329,47 +525,273 @@ def get_candidate_report(db: Session, candidate_id: str) -> ReportResponse:
     Raises:
         HTTPException: If candidate not found
     """
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-    if not candidate:
+    question_count = (
+        select(func.count(Question.id))
+        .where(Question.interview_id == Candidate.interview_id)
+        .correlate(Candidate)
+        .scalar_subquery()
+    )
+    rows = (
+        db.query(Candidate, question_count)
+        .join(Candidate.interview)
+        .outerjoin(Candidate.answers)
+        .outerjoin(Answer.question)
+        .options(
+            contains_eager(Candidate.interview),
+            contains_eager(Candidate.answers).contains_eager(Answer.question)
+        )
+        .filter(Candidate.id == candidate_id)
+        .order_by(Question.created_at, Question.id)
+        .populate_existing()
+        .all()
+    )
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Candidate not found"
         )
+    candidate, total_questions = rows[0]
+    answers = candidate.answers
     
-    # Get interview
-    interview = candidate.interview
-    
-    # Get all answers for this candidate
-    answers = db.query(Answer).filter(Answer.candidate_id == candidate_id).all()
-    
-    answer_details = []
-    for answer in answers:
-        question = db.query(Question).filter(Question.id == answer.question_id).first()
-        answer_details.append(CandidateAnswerDetail(
+    answer_details = [
+        CandidateAnswerDetail(
             answer_id=str(answer.id),
-            question_text=question.question_text if question else "Unknown question",
+            question_text=answer.question.question_text if answer.question else "Unknown question",
             transcript=answer.transcript,
             score=answer.score,
             feedback=answer.feedback,
             created_at=answer.created_at
-        ))
+        )
+        for answer in answers
+    ]
     
     # Calculate average score
     scores = [a.score for a in answers if a.score is not None]
     average_score = sum(scores) / len(scores) if scores else None
     
-    # Get total questions in interview
-    total_questions = db.query(Question).filter(Question.interview_id == candidate.interview_id).count()
-    
     return ReportResponse(
         candidate_id=str(candidate.id),
         candidate_name=candidate.name,
         candidate_email=candidate.email,
         interview_id=str(candidate.interview_id),
-        interview_title=interview.title,
+        interview_title=candidate.interview.title,
         answers=answer_details,
         average_score=average_score,
         total_questions=total_questions,
         completed_questions=len(answers)
     )
 
+
+def get_candidate_report_json(db: Session, candidate_id: str) -> bytes:
+    """
+    Get a candidate's report as serialized JSON, from the report cache when possible
+    
+    Cached payloads are keyed by the candidate's stats version, which every
+    answer save bumps, so a hit costs one primary-key lookup and a changed
+    report is rebuilt on its next view.
+    
+    Args:
+        db: Database session
+        candidate_id: Candidate ID
+    
+    Returns:
+        JSON-encoded ReportResponse
+    
+    Raises:
+        HTTPException: If candidate not found
+    """
+    stats = db.query(CandidateStats.version, CandidateStats.updated_at).filter(
+        CandidateStats.candidate_id == candidate_id
+    ).first()
+    # updated_at also changes when rebuild_stats recreates the row
+    version = tuple(stats) if stats else (0, None)
+    
+    payload = get_cached_report(candidate_id, version)
+    if payload is None:
+        payload = get_candidate_report(db, candidate_id).model_dump_json().encode("utf-8")
+        store_cached_report(candidate_id, version, payload)
+    return payload
+
+
+def evaluate_candidate_answers(db: Session, candidate_id: str) -> ReportResponse:
+    """
+    Re-score all of a candidate's answers with a single batched Gemini request
+    
+    Args:
+        db: Database session
+        candidate_id: Candidate ID
+    
+    Returns:
+        ReportResponse with the updated scores
+    
+    Raises:
+        HTTPException: If candidate not found or evaluation fails
+            (503 with Retry-After when the AI provider is rate limited)
+    """
+    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate not found"
+        )
+    
+    answers = db.query(Answer).filter(
+        Answer.candidate_id == candidate_id,
+        Answer.transcript.isnot(None)
+    ).all()
+    
+    if answers:
+        questions = {
+            question.id: question
+            for question in db.query(Question).filter(Question.interview_id == candidate.interview_id).all()
+        }
+        try:
+            results = evaluate_texts_batch(
+                [answer.transcript for answer in answers],
+                [questions.get(answer.question_id) for answer in answers],
+                backend=candidate.interview.evaluator_backend
+            )
+        except ProviderThrottled as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="AI service is busy, please retry shortly",
+                headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Evaluation failed: {str(e)}"
+            )
+        # Re-read the answers locked so the stats delta is taken against their current scores
+        locked = {
+            answer.id: answer
+            for answer in db.query(Answer).filter(
+                Answer.id.in_([answer.id for answer in answers])
+            ).with_for_update().populate_existing()
+        }
+        scored_delta = score_delta = 0
+        for answer, (score, feedback) in zip(answers, results):
+            current = locked.get(answer.id)
+            if current is None:
+                continue  # Deleted meanwhile
+            scored, delta = score_change(current.score, score)
+            scored_delta += scored
+            score_delta += delta
+            current.score = score
+            current.feedback = feedback
+        record_answer_change(db, candidate.id, 0, scored_delta, score_delta)
+        db.commit()
+    
+    return get_candidate_report(db, candidate_id)
+
+
+def get_evaluation_cache_status() -> dict:
+    """
+    Get evaluation cache hit/miss counters for this worker process
+    
+    Returns:
+        Dictionary with cache counters and the active prompt version
+    """
+    return {
+        "prompt_version": settings.EVALUATION_PROMPT_VERSION,
+        **get_evaluation_cache_stats()
+    }
+
+
+def invalidate_evaluation_cache_entries(all_versions: bool = False) -> dict:
+    """
+    Invalidate cached evaluations after a prompt template change
+    
+    Args:
+        all_versions: Also drop entries for the current prompt version
+    
+    Returns:
+        Dictionary with the number of deleted cache rows
+    """
+    deleted = invalidate_evaluation_cache(all_versions=all_versions)
+    return {
+        "deleted": deleted,
+        "prompt_version": settings.EVALUATION_PROMPT_VERSION
+    }
+
+
+def get_report_cache_status() -> dict:
+    """
+    Get candidate report cache hit/miss counters for this worker process
+    
+    Returns:
+        Dictionary with cache counters
+    """
+    return get_report_cache_stats()
+
+
+def get_transcription_cache_status() -> dict:
+    """
+    Get transcription cache hit/miss counters for this worker process
+    
+    Returns:
+        Dictionary with cache counters and the active transcription backend
+    """
+    return {
+        "backend": settings.TRANSCRIPTION_BACKEND,
+        **get_transcription_cache_stats()
+    }
+
+
+def get_ai_client_status() -> dict:
+    """
+    Get AI provider connection pool utilization for this worker process
+    
+    Returns:
+        Dictionary of per-provider pool and request counters, plus
+        single-flight (request coalescing) counters
+    """
+    return {
+        **get_client_pool_stats(),
+        "single_flight": get_single_flight_stats()
+    }
+
+
+def get_ai_rate_limit_status() -> dict:
+    """
+    Get per-provider limiter state for this worker process
+    
+    Returns:
+        Dictionary of queue depth, concurrency window and throttling counters
+    """
+    return get_limiter_stats()
+
+
+def get_ai_circuit_status() -> dict:
+    """
+    Get circuit breaker state and hedged-request counters per transcription backend
+    
+    Returns:
+        Dictionary keyed by backend name, plus the configured fallback backend
+    """
+    return {
+        "fallback_backend": settings.TRANSCRIPTION_FALLBACK_BACKEND,
+        "backends": get_resilience_stats()
+    }
+
+
+def get_ai_token_usage_status() -> dict:
+    """
+    Get evaluation prompt token usage for this worker process
+    
+    Returns:
+        Dictionary of per-model input/output token counters and the configured budgets
+    """
+    return get_token_usage_stats()
+
+
+def get_ai_routing_status() -> dict:
+    """
+    Get evaluation routing counters for this worker process
+    
+    Returns:
+        Dictionary of escalation thresholds, escalation rate by reason,
+        median latency of fast-only and escalated evaluations, and how many
+        answers the local pre-screen scored without a backend call
+    """
+    return {**get_routing_stats(), "prescreen": get_prescreen_stats()}
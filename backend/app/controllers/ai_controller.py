@@ -1,19 +1,55 @@
 """
 AI controller for handling AI-related requests (transcription and evaluation)
 """
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
 from app.models.answer import Answer
 from app.models.candidate import Candidate
 from app.models.question import Question
-from app.services.ai_service import transcribe_audio, evaluate_text
+from app.models.evaluation_job import JOB_STATUS_FAILED
+from app.config import settings
+from app.services.ai_pipeline_service import TranscriptionResult
+from app.services.ai_service import (
+    transcribe_audio,
+    transcribe_audio_detailed,
+    evaluate_text
+)
+from app.services.async_ai_service import (
+    transcribe_audio_async,
+    transcribe_audio_detailed_async,
+    evaluate_text_async
+)
+from app.services.answer_service import upsert_answer, upsert_answer_async
+from app.services.streaming_service import StreamingTranscription
+from app.services.upload_service import AudioUpload, prepare_audio_upload, AudioUploadTooLarge
+from app.services.rate_limit_service import ProviderThrottled
+from app.services.resilience_service import CircuitOpen
+from app.services.evaluation_queue_service import (
+    enqueue_evaluation_job,
+    enqueue_evaluation_job_async,
+    get_evaluation_job,
+    wait_for_evaluation_job
+)
+from dataclasses import asdict
+from typing import BinaryIO, Optional, Tuple, Union
+import asyncio
 import base64
+import logging
+import math
+import uuid
+
+logger = logging.getLogger(__name__)
 
 
 def transcribe_audio_file(
     db: Session,
     candidate_id: str,
-    audio_data: bytes
+    audio_stream: BinaryIO,
+    filename: Optional[str] = None
 ) -> dict:
     """
     Transcribe audio using Whisper API
@@ -21,124 +57,531 @@ def transcribe_audio_file(
     Args:
         db: Database session
         candidate_id: Candidate ID (from token)
-        audio_data: Audio file bytes
+        audio_stream: Uploaded audio file object
+        filename: Uploaded filename
     
     Returns:
-        Dictionary with transcript
+        Dictionary with transcript, bytes_processed and per-segment timing
     
     Raises:
-        HTTPException: If transcription fails
+        HTTPException: If the upload is too large or transcription fails
+            (503 with Retry-After when the AI provider is rate limited or unavailable)
     """
+    upload = _prepare_upload(audio_stream, filename)
+    
+    logger.info("Transcribing %s bytes for candidate %s", upload.size, candidate_id)
     try:
-        transcript = transcribe_audio(audio_data)
-        return {"transcript": transcript}
+        result = transcribe_audio_detailed(upload.file, upload.sha256, upload.filename)
+        return _transcription_response(upload, result)
+    except (ProviderThrottled, CircuitOpen) as e:
+        raise _unavailable_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Transcription failed: {str(e)}"
         )
+    finally:
+        if upload.file is not audio_stream:
+            upload.file.close()
 
 
 def evaluate_answer(
+    db: Session,
+    candidate: Candidate,
+    transcript: str,
+    question_id: Optional[str] = None
+) -> dict:
+    """
+    Queue a transcript for evaluation by the background workers
+    
+    Args:
+        db: Database session
+        candidate: Authenticated candidate
+        transcript: Transcribed text
+        question_id: Optional question ID; the result is saved to that answer
+    
+    Returns:
+        Dictionary with job_id and status
+    
+    Raises:
+        HTTPException: If the question is not part of the candidate's interview
+    """
+    if question_id is not None:
+        question_id = _find_candidate_question(db, candidate, question_id).id
+    
+    job = enqueue_evaluation_job(
+        db,
+        candidate_id=candidate.id,
+        transcript=transcript,
+        question_id=question_id
+    )
+    return {
+        "job_id": str(job.id),
+        "status": job.status
+    }
+
+
+async def get_evaluation_result(
     db: Session,
     candidate_id: str,
-    transcript: str
+    job_id: str,
+    wait_seconds: float = 0
 ) -> dict:
     """
-    Evaluate transcript using Gemini API
+    Get the state of an evaluation job, optionally waiting for it to finish
     
     Args:
         db: Database session
         candidate_id: Candidate ID (from token)
-        transcript: Transcribed text
+        job_id: Evaluation job ID
+        wait_seconds: Long-poll timeout (capped by EVALUATION_JOB_MAX_WAIT_SECONDS)
     
     Returns:
-        Dictionary with score and feedback
+        Dictionary with job status and, once completed, score and feedback
     
     Raises:
-        HTTPException: If evaluation fails
+        HTTPException: If the job does not exist or belongs to another candidate
     """
-    try:
-        score, feedback = evaluate_text(transcript)
-        return {
-            "score": score,
-            "feedback": feedback
-        }
-    except Exception as e:
+    job_uuid = _parse_uuid(job_id, "Evaluation job")
+    wait_seconds = min(max(wait_seconds, 0), settings.EVALUATION_JOB_MAX_WAIT_SECONDS)
+    if wait_seconds:
+        job = await wait_for_evaluation_job(db, job_uuid, wait_seconds)
+    else:
+        job = await run_in_threadpool(get_evaluation_job, db, job_uuid)
+    
+    if not job or str(job.candidate_id) != str(candidate_id):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Evaluation failed: {str(e)}"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Evaluation job not found"
         )
+    
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "question_id": str(job.question_id) if job.question_id else None,
+        "score": job.score,
+        "feedback": job.feedback,
+        "error": job.error if job.status == JOB_STATUS_FAILED else None,
+        "created_at": job.created_at,
+        "completed_at": job.completed_at
+    }
 
 
 def save_answer(
     db: Session,
-    candidate_id: str,
+    candidate: Candidate,
     question_id: str,
-    transcript: str,
-    score: int,
-    feedback: str
+    transcript: str
 ) -> dict:
     """
-    Save candidate answer with transcript, score, and feedback
+    Save a candidate's answer transcript and queue its evaluation
+    
+    The score and feedback are never taken from the client: the answer is
+    saved unscored and the background workers write the evaluation through
+    to it (poll GET /ai/evaluate/{job_id}).
     
     Args:
         db: Database session
-        candidate_id: Candidate ID
+        candidate: Authenticated candidate
         question_id: Question ID
         transcript: Transcribed answer
-        score: AI evaluation score (1-10)
-        feedback: AI feedback
     
     Returns:
-        Dictionary with saved answer details
+        Dictionary with saved answer details, job_id and the job status
+    
+    Raises:
+        HTTPException: If the question is not part of the candidate's interview
+    """
+    question = _find_candidate_question(db, candidate, question_id)
+    
+    answer = upsert_answer(
+        db,
+        candidate_id=candidate.id,
+        question_id=question.id,
+        transcript=transcript,
+        score=None,
+        feedback=None
+    )
+    job = enqueue_evaluation_job(
+        db,
+        candidate_id=candidate.id,
+        transcript=transcript,
+        question_id=question.id
+    )
+    return _queued_answer(answer, job)
+
+
+def submit_answer(
+    db: Session,
+    candidate: Candidate,
+    question_id: str,
+    audio_stream: BinaryIO,
+    filename: Optional[str] = None
+) -> dict:
+    """
+    Transcribe, evaluate and save an answer in one server-side pipeline
+    
+    The score and feedback never pass through the client, so they cannot
+    be tampered with before being saved.
+    
+    Args:
+        db: Database session
+        candidate: Authenticated candidate
+        question_id: Question being answered
+        audio_stream: Uploaded audio file object
+        filename: Uploaded filename
+    
+    Returns:
+        Dictionary with the saved answer details
     
     Raises:
-        HTTPException: If save fails
+        HTTPException: If the question is not part of the candidate's interview,
+            the upload is too large, or transcription or evaluation fails
+            (503 with Retry-After when the AI provider is rate limited or unavailable)
     """
-    # Verify candidate exists
-    candidate = db.query(Candidate).filter(Candidate.id == candidate_id).first()
-    if not candidate:
+    question, evaluator_backend = _load_answer_question(db, candidate, question_id)
+    upload = _prepare_upload(audio_stream, filename)
+    
+    logger.info("Processing %s byte answer for candidate %s", upload.size, candidate.id)
+    try:
+        transcript = transcribe_audio(upload.file, upload.sha256, upload.filename)
+    except (ProviderThrottled, CircuitOpen) as e:
+        raise _unavailable_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Transcription failed: {str(e)}"
+        )
+    finally:
+        if upload.file is not audio_stream:
+            upload.file.close()
+    
+    try:
+        score, feedback = evaluate_text(transcript, question, backend=evaluator_backend)
+    except ProviderThrottled as e:
+        raise _unavailable_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Evaluation failed: {str(e)}"
+        )
+    
+    answer = upsert_answer(
+        db,
+        candidate_id=candidate.id,
+        question_id=question.id,
+        transcript=transcript,
+        score=score,
+        feedback=feedback
+    )
+    return _serialize_answer(answer)
+
+
+async def transcribe_audio_file_async(
+    db: Session,
+    candidate_id: str,
+    audio_stream: BinaryIO,
+    filename: Optional[str] = None
+) -> dict:
+    """
+    Async variant of transcribe_audio_file (the provider call is awaited, not run in a thread)
+    
+    Raises:
+        HTTPException: If the upload is too large or transcription fails
+            (503 with Retry-After when the AI provider is rate limited or unavailable)
+    """
+    upload = await run_in_threadpool(_prepare_upload, audio_stream, filename)
+    
+    logger.info("Transcribing %s bytes for candidate %s", upload.size, candidate_id)
+    try:
+        result = await transcribe_audio_detailed_async(upload.file, upload.sha256, upload.filename)
+        return _transcription_response(upload, result)
+    except (ProviderThrottled, CircuitOpen) as e:
+        raise _unavailable_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Transcription failed: {str(e)}"
+        )
+    finally:
+        if upload.file is not audio_stream:
+            upload.file.close()
+
+
+async def evaluate_answer_async(
+    db: Session,
+    candidate: Candidate,
+    transcript: str,
+    question_id: Optional[str] = None
+) -> dict:
+    """Async variant of evaluate_answer (queueing is a short database write)"""
+    return await run_in_threadpool(evaluate_answer, db, candidate, transcript, question_id)
+
+
+async def save_answer_async_session(
+    db: AsyncSession,
+    candidate: Candidate,
+    question_id: str,
+    transcript: str
+) -> dict:
+    """
+    save_answer on the async engine, for the already authenticated candidate
+    
+    Raises:
+        HTTPException: If the question is not part of the candidate's interview
+    """
+    question_uuid = _parse_uuid(question_id, "Question")
+    question_exists = await db.scalar(
+        select(Question.id).where(
+            Question.id == question_uuid,
+            Question.interview_id == candidate.interview_id
+        )
+    )
+    if question_exists is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Candidate not found"
+            detail="Question not found"
         )
     
-    # Verify question exists
-    question = db.query(Question).filter(Question.id == question_id).first()
+    answer = await upsert_answer_async(
+        db,
+        candidate_id=candidate.id,
+        question_id=question_uuid,
+        transcript=transcript,
+        score=None,
+        feedback=None
+    )
+    job = await enqueue_evaluation_job_async(
+        db,
+        candidate_id=candidate.id,
+        transcript=transcript,
+        question_id=question_uuid
+    )
+    return _queued_answer(answer, job)
+
+
+async def submit_answer_async(
+    db: Session,
+    candidate: Candidate,
+    question_id: str,
+    audio_stream: BinaryIO,
+    filename: Optional[str] = None
+) -> dict:
+    """
+    Async variant of submit_answer
+    
+    Database work runs in the threadpool; the transcription and evaluation
+    provider calls are awaited on the event loop without holding a pooled
+    connection.
+    
+    Raises:
+        HTTPException: If the question is not part of the candidate's interview,
+            the upload is too large, or transcription or evaluation fails
+            (503 with Retry-After when the AI provider is rate limited or unavailable)
+    """
+    question, evaluator_backend = await run_in_threadpool(_load_answer_question, db, candidate, question_id)
+    upload = await run_in_threadpool(_prepare_upload, audio_stream, filename)
+    
+    logger.info("Processing %s byte answer for candidate %s", upload.size, candidate.id)
+    try:
+        transcript = await transcribe_audio_async(upload.file, upload.sha256, upload.filename)
+    except (ProviderThrottled, CircuitOpen) as e:
+        raise _unavailable_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Transcription failed: {str(e)}"
+        )
+    finally:
+        if upload.file is not audio_stream:
+            upload.file.close()
+    
+    try:
+        score, feedback = await evaluate_text_async(transcript, question, backend=evaluator_backend)
+    except ProviderThrottled as e:
+        raise _unavailable_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Evaluation failed: {str(e)}"
+        )
+    
+    answer = await run_in_threadpool(
+        upsert_answer,
+        db,
+        candidate_id=candidate.id,
+        question_id=question.id,
+        transcript=transcript,
+        score=score,
+        feedback=feedback
+    )
+    return _serialize_answer(answer)
+
+
+async def stream_answer(
+    websocket: WebSocket,
+    db: Session,
+    candidate: Candidate,
+    question_id: str,
+    input_format: str = "webm"
+) -> None:
+    """
+    Transcribe an answer while it is being recorded, then evaluate and save it
+    
+    The client sends the recording as binary messages while the candidate
+    speaks and a "stop" text message when they finish. Segments are
+    transcribed as they complete, and the server sends
+    {"type": "transcript", "text": ...} whenever the rolling transcript grows.
+    After "stop" only the final segment is left, so the saved answer follows
+    shortly as {"type": "answer", ...}. Failures are sent as
+    {"type": "error", "detail": ...} before the socket is closed.
+    
+    Args:
+        websocket: Accepted WebSocket connection
+        db: Database session
+        candidate: Authenticated candidate
+        question_id: Question being answered
+        input_format: "pcm" for raw s16le 16 kHz mono, otherwise any ffmpeg-readable stream
+    """
+    send_lock = asyncio.Lock()
+    
+    async def send(message: dict) -> None:
+        async with send_lock:
+            await websocket.send_json(jsonable_encoder(message))
+    
+    async def fail(detail: str, code: int, **extra) -> None:
+        await send({"type": "error", "detail": detail, **extra})
+        await websocket.close(code=code)
+    
+    try:
+        question, evaluator_backend = await run_in_threadpool(_load_answer_question, db, candidate, question_id)
+    except HTTPException as e:
+        return await fail(e.detail, status.WS_1008_POLICY_VIOLATION)
+    
+    session = StreamingTranscription(
+        input_format,
+        on_transcript=lambda text: send({"type": "transcript", "text": text})
+    )
+    try:
+        await session.start()
+        while True:
+            message = await asyncio.wait_for(websocket.receive(), settings.STREAMING_IDLE_TIMEOUT_SECONDS)
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+            if message.get("bytes"):
+                await session.feed(message["bytes"])
+            elif (message.get("text") or "").strip() == "stop":
+                break
+        result = await session.finish()
+    except WebSocketDisconnect:
+        logger.info("Candidate %s disconnected during a streamed answer", candidate.id)
+        return await session.abort()
+    except asyncio.TimeoutError:
+        await session.abort()
+        return await fail("No audio received, please try again", status.WS_1008_POLICY_VIOLATION)
+    except AudioUploadTooLarge as e:
+        await session.abort()
+        return await fail(str(e), status.WS_1009_MESSAGE_TOO_BIG)
+    except (ProviderThrottled, CircuitOpen) as e:
+        await session.abort()
+        return await fail(
+            "AI service is busy, please retry shortly",
+            status.WS_1013_TRY_AGAIN_LATER,
+            retry_after=max(1, math.ceil(e.retry_after))
+        )
+    except Exception as e:
+        await session.abort()
+        logger.exception("Streamed transcription failed for candidate %s", candidate.id)
+        return await fail(f"Transcription failed: {str(e)}", status.WS_1011_INTERNAL_ERROR)
+    
+    logger.info(
+        "Streamed %s byte answer for candidate %s, transcript ready %.2fs after stop",
+        session.bytes_received, candidate.id, result.wall_seconds
+    )
+    try:
+        score, feedback = await evaluate_text_async(result.text, question, backend=evaluator_backend)
+    except ProviderThrottled as e:
+        return await fail(
+            "AI service is busy, please retry shortly",
+            status.WS_1013_TRY_AGAIN_LATER,
+            retry_after=max(1, math.ceil(e.retry_after))
+        )
+    except Exception as e:
+        return await fail(f"Evaluation failed: {str(e)}", status.WS_1011_INTERNAL_ERROR)
+    
+    answer = await run_in_threadpool(
+        upsert_answer,
+        db,
+        candidate_id=candidate.id,
+        question_id=question.id,
+        transcript=result.text,
+        score=score,
+        feedback=feedback
+    )
+    await send({
+        "type": "answer",
+        **_serialize_answer(answer),
+        "transcription_seconds": result.wall_seconds,
+        "segments": [asdict(segment) for segment in result.segments]
+    })
+    await websocket.close()
+
+
+def _find_candidate_question(db: Session, candidate: Candidate, question_id: str) -> Question:
+    """Load a question of the candidate's interview, or raise 404"""
+    question = db.query(Question).filter(
+        Question.id == _parse_uuid(question_id, "Question"),
+        Question.interview_id == candidate.interview_id
+    ).first()
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Question not found"
         )
+    return question
+
+
+def _load_answer_question(db: Session, candidate: Candidate, question_id: str) -> Tuple[Question, Optional[str]]:
+    """
+    Load the question being answered and the interview's evaluator backend,
+    then hand the session's pooled connection back
     
-    # Check if answer already exists (update) or create new
-    existing_answer = db.query(Answer).filter(
-        Answer.candidate_id == candidate_id,
-        Answer.question_id == question_id
-    ).first()
+    Provider calls take seconds to tens of seconds; holding a connection
+    through them would let a few concurrent answers exhaust the pool. The
+    loaded question stays usable and saving the answer checks out a new
+    connection on the same session.
     
-    if existing_answer:
-        # Update existing answer
-        existing_answer.transcript = transcript
-        existing_answer.score = score
-        existing_answer.feedback = feedback
-        db.commit()
-        db.refresh(existing_answer)
-        answer = existing_answer
-    else:
-        # Create new answer
-        answer = Answer(
-            candidate_id=candidate_id,
-            question_id=question_id,
-            transcript=transcript,
-            score=score,
-            feedback=feedback
+    Raises:
+        HTTPException: If the question is not part of the candidate's interview
+    """
+    question = _find_candidate_question(db, candidate, question_id)
+    evaluator_backend = candidate.interview.evaluator_backend
+    db.close()
+    return question, evaluator_backend
+
+
+def _prepare_upload(audio_stream: BinaryIO, filename: Optional[str]) -> AudioUpload:
+    """Hash and size-check an upload, turning oversized ones into a 413"""
+    try:
+        return prepare_audio_upload(audio_stream, filename)
+    except AudioUploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
         )
-        db.add(answer)
-        db.commit()
-        db.refresh(answer)
-    
+
+
+def _transcription_response(upload: AudioUpload, result: TranscriptionResult) -> dict:
+    return {
+        "transcript": result.text,
+        "bytes_processed": upload.size,
+        "cached": result.cached,
+        "transcription_seconds": result.wall_seconds,
+        "segments": [asdict(segment) for segment in result.segments]
+    }
+
+
+def _serialize_answer(answer: Answer) -> dict:
     return {
         "id": str(answer.id),
         "candidate_id": str(answer.candidate_id),
@@ -149,3 +592,31 @@ def save_answer(
         "created_at": answer.created_at
     }
 
+
+def _queued_answer(answer: Answer, job) -> dict:
+    """Saved answer plus the evaluation job that will score it"""
+    return {
+        **_serialize_answer(answer),
+        "job_id": str(job.id),
+        "status": job.status
+    }
+
+
+def _parse_uuid(value: str, label: str) -> uuid.UUID:
+    """Parse an ID path/form parameter, turning malformed IDs into a 404"""
+    try:
+        return uuid.UUID(str(value))
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{label} not found"
+        )
+
+
+def _unavailable_error(error: Union[ProviderThrottled, CircuitOpen]) -> HTTPException:
+    """Map a rate-limited or circuit-broken provider call to 503 so clients retry later"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="AI service is busy, please retry shortly",
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
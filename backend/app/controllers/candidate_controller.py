@@ -1,6 +1,8 @@
 """
 Candidate controller for handling candidate-related requests
 """
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.models.candidate import Candidate
@@ -10,9 +12,11 @@ from app.models.interview_link import InterviewLink
 from app.schemas.candidate import CandidateRegister, CandidateLoginResponse
 from app.services.candidate_service import (
     register_candidate,
+    register_candidate_async,
     verify_candidate_password,
     get_candidate_by_id
 )
+from app.services.interview_service import get_interview_by_link_code_async, get_interview_questions_async
 from app.services.auth_service import create_access_token
 
 
@@ -41,18 +45,25 @@ def get_interview_by_link(db: Session, link_code: str) -> dict:
     interview = interview_link.interview
     questions = db.query(Question).filter(Question.interview_id == interview.id).order_by(Question.created_at).all()
     
-    return {
-        "interview_id": str(interview.id),
-        "title": interview.title,
-        "description": interview.description,
-        "questions": [
-            {
-                "id": str(q.id),
-                "question_text": q.question_text
-            }
-            for q in questions
-        ]
-    }
+    return _interview_with_questions(interview, questions)
+
+
+async def get_interview_by_link_async(db: AsyncSession, link_code: str) -> dict:
+    """
+    Async variant of get_interview_by_link
+    
+    Raises:
+        HTTPException: If link code is invalid
+    """
+    interview = await get_interview_by_link_code_async(db, link_code)
+    if not interview:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Invalid interview link"
+        )
+    
+    questions = await get_interview_questions_async(db, interview.id)
+    return _interview_with_questions(interview, questions)
 
 
 def register_candidate_for_interview(
@@ -79,27 +90,39 @@ def register_candidate_for_interview(
             email=registration_data.email,
             link_code=registration_data.link_code
         )
-        
-        # Create JWT token for candidate
-        token_data = {
-            "sub": str(candidate.id),
-            "email": candidate.email,
-            "type": "candidate",
-            "interview_id": str(candidate.interview_id)
-        }
-        access_token = create_access_token(data=token_data)
-        
-        return CandidateLoginResponse(
-            access_token=access_token,
-            candidate_id=str(candidate.id),
-            interview_id=str(candidate.interview_id),
-            name=candidate.name
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return _candidate_login(candidate)
+
+
+async def register_candidate_for_interview_async(
+    db: AsyncSession,
+    registration_data: CandidateRegister
+) -> CandidateLoginResponse:
+    """
+    Async variant of register_candidate_for_interview
+    
+    Raises:
+        HTTPException: If registration fails
+    """
+    try:
+        candidate, interview = await register_candidate_async(
+            db=db,
+            name=registration_data.name,
+            email=registration_data.email,
+            link_code=registration_data.link_code
         )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    
+    return _candidate_login(candidate)
 
 
 def start_interview(db: Session, candidate_id: str) -> dict:
@@ -126,6 +149,49 @@ def start_interview(db: Session, candidate_id: str) -> dict:
     interview = candidate.interview
     questions = db.query(Question).filter(Question.interview_id == interview.id).order_by(Question.created_at).all()
     
+    return _interview_with_questions(interview, questions)
+
+
+async def start_interview_async(db: AsyncSession, candidate: Candidate) -> dict:
+    """
+    Async variant of start_interview, for the already authenticated candidate
+    
+    Returns:
+        Dictionary with interview and questions
+    
+    Raises:
+        HTTPException: If the candidate's interview no longer exists
+    """
+    interview = await db.get(Interview, candidate.interview_id)
+    if not interview:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Interview not found"
+        )
+    
+    questions = await get_interview_questions_async(db, interview.id)
+    return _interview_with_questions(interview, questions)
+
+
+def _candidate_login(candidate: Candidate) -> CandidateLoginResponse:
+    """JWT login response for a newly registered candidate"""
+    token_data = {
+        "sub": str(candidate.id),
+        "email": candidate.email,
+        "type": "candidate",
+        "interview_id": str(candidate.interview_id)
+    }
+    access_token = create_access_token(data=token_data)
+    
+    return CandidateLoginResponse(
+        access_token=access_token,
+        candidate_id=str(candidate.id),
+        interview_id=str(candidate.interview_id),
+        name=candidate.name
+    )
+
+
+def _interview_with_questions(interview: Interview, questions: List[Question]) -> dict:
     return {
         "interview_id": str(interview.id),
         "title": interview.title,
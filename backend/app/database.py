@@ -2,20 +2,63 @@
 Database configuration and session management
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
+# Async drivers for the sync drivers DATABASE_URL may name
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite"
+}
+
+
+def _engine_options(url: str) -> dict:
+    """Pool and timeout settings shared by the sync and async engines"""
+    url = make_url(url)
+    options = {
+        "pool_pre_ping": True,
+        "echo": False  # Set to True for SQL query logging
+    }
+    if url.get_backend_name() != "postgresql":
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS
+    )
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        if url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def async_database_url() -> str:
+    """ASYNC_DATABASE_URL, or DATABASE_URL switched to its async driver"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(hide_password=False)
+
+
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False  # Set to True for SQL query logging
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine, created on first use so the async driver is only needed when it is used
+_async_engine = None
+_async_session_factory = None
+
 # Base class for models
 Base = declarative_base()
 
@@ -31,3 +74,40 @@ def get_db():
     finally:
         db.close()
 
+
+def get_async_engine():
+    """Get the shared async engine (asyncpg for PostgreSQL)"""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        url = async_database_url()
+        _async_engine = create_async_engine(url, **_engine_options(url))
+        _async_session_factory = async_sessionmaker(
+            _async_engine,
+            autoflush=False,
+            expire_on_commit=False  # lazy refreshes are not possible on an async session
+        )
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Create a new async session"""
+    get_async_engine()
+    return _async_session_factory()
+
+
+async def get_async_db():
+    """
+    Async dependency for FastAPI to get a database session.
+    Yields an AsyncSession and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's pooled connections (if it was ever created)"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
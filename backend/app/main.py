@@ -4,7 +4,11 @@ FastAPI application entry point
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.routes import admin_routes, candidate_routes, ai_routes, interview_routes
+from app.routes import admin_routes, candidate_routes, candidate_async_routes, ai_routes, ai_async_routes, stream_routes, interview_routes
+from app.database import dispose_async_engine
+from app.services.evaluation_queue_service import start_evaluation_workers, stop_evaluation_workers
+from app.services.transcription_backends import get_transcription_backend
+from app.services.ai_client_service import start_client_warmup, close_clients, close_async_clients
 
 # Create FastAPI app
 app = FastAPI(
@@ -26,9 +30,37 @@ app.add_middleware(
 
 # Include routers
 app.include_router(admin_routes.router)
-app.include_router(candidate_routes.router)
-app.include_router(ai_routes.router)
-app.include_router(interview_routes.router)
+app.include_router(candidate_async_routes.router if settings.DB_ASYNC_ROUTES else candidate_routes.router)
+app.include_router(ai_async_routes.router if settings.AI_ASYNC_ROUTES else ai_routes.router)
+app.include_router(stream_routes.router)
+app.include_router(candidate_async_routes.interview_router if settings.DB_ASYNC_ROUTES else interview_routes.router)
+
+
+@app.on_event("startup")
+def start_background_workers():
+    """Start the evaluation job workers, load the transcription backend and warm AI clients"""
+    start_evaluation_workers()
+    get_transcription_backend()
+    start_client_warmup()
+
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    """Stop the evaluation job workers and close pooled AI connections"""
+    stop_evaluation_workers()
+    close_clients()
+
+
+@app.on_event("shutdown")
+async def close_async_ai_clients():
+    """Close the async AI client's pooled connections"""
+    await close_async_clients()
+
+
+@app.on_event("shutdown")
+async def close_async_database():
+    """Close the async engine's pooled database connections"""
+    await dispose_async_engine()
 
 
 @app.get("/")
@@ -8,6 +8,12 @@ from app.models.candidate import Candidate
 from app.models.answer import Answer
 from app.models.candidate_auth import CandidateAuth
 from app.models.interview_link import InterviewLink
+from app.models.evaluation_job import EvaluationJob
+from app.models.evaluation_cache import EvaluationCacheEntry
+from app.models.transcription_cache import TranscriptionCacheEntry
+from app.models.ai_call_lock import AICallLock
+from app.models.candidate_stats import CandidateStats
+from app.models.interview_stats import InterviewStats
 
 __all__ = [
     "Admin",
@@ -16,6 +22,12 @@ __all__ = [
     "Candidate",
     "Answer",
     "CandidateAuth",
-    "InterviewLink"
+    "InterviewLink",
+    "EvaluationJob",
+    "EvaluationCacheEntry",
+    "TranscriptionCacheEntry",
+    "AICallLock",
+    "CandidateStats",
+    "InterviewStats"
 ]
 
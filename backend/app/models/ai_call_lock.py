@@ -0,0 +1,19 @@
+"""
+AICallLock model for SQLAlchemy
+"""
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from app.database import Base
+
+
+class AICallLock(Base):
+    """Marks an AI call in flight in some worker so other workers wait for its cached result"""
+    __tablename__ = "ai_call_locks"
+    
+    call_key = Column(String(255), primary_key=True)
+    owner = Column(String(100), nullable=False)  # hostname:pid:token of the worker making the call
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<AICallLock(call_key={self.call_key}, owner={self.owner})>"
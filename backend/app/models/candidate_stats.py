@@ -0,0 +1,28 @@
+"""
+CandidateStats model for SQLAlchemy
+"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.database import Base
+
+
+class CandidateStats(Base):
+    """Per-candidate answer aggregates, kept up to date whenever an answer is saved"""
+    __tablename__ = "candidate_stats"
+    
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), primary_key=True)
+    interview_id = Column(UUID(as_uuid=True), ForeignKey("interviews.id", ondelete="CASCADE"), nullable=False, index=True)
+    answer_count = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)  # answers with a score
+    score_sum = Column(Integer, nullable=False, default=0)
+    last_answer_at = Column(DateTime)
+    version = Column(Integer, nullable=False, default=0)  # bumped on every change
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    @property
+    def average_score(self):
+        return self.score_sum / self.scored_count if self.scored_count else None
+    
+    def __repr__(self):
+        return f"<CandidateStats(candidate_id={self.candidate_id}, answer_count={self.answer_count})>"
@@ -0,0 +1,21 @@
+"""
+EvaluationCacheEntry model for SQLAlchemy
+"""
+from sqlalchemy import Column, String, Text, Integer, DateTime
+from datetime import datetime
+from app.database import Base
+
+
+class EvaluationCacheEntry(Base):
+    """Persisted evaluation result keyed by a hash of its inputs"""
+    __tablename__ = "evaluation_cache"
+    
+    cache_key = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(50), nullable=False, index=True)
+    score = Column(Integer, nullable=False)
+    feedback = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<EvaluationCacheEntry(cache_key={self.cache_key}, score={self.score})>"
@@ -0,0 +1,38 @@
+"""
+EvaluationJob model for SQLAlchemy
+"""
+from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+from datetime import datetime
+from app.database import Base
+
+
+# Job lifecycle states
+JOB_STATUS_PENDING = "pending"
+JOB_STATUS_RUNNING = "running"
+JOB_STATUS_COMPLETED = "completed"
+JOB_STATUS_FAILED = "failed"
+
+
+class EvaluationJob(Base):
+    """Queued transcript evaluation drained by background workers"""
+    __tablename__ = "evaluation_jobs"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id", ondelete="CASCADE"), nullable=False, index=True)
+    question_id = Column(UUID(as_uuid=True), ForeignKey("questions.id", ondelete="CASCADE"), nullable=True)
+    transcript = Column(Text, nullable=False)
+    status = Column(String(20), nullable=False, default=JOB_STATUS_PENDING, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    throttles = Column(Integer, nullable=False, default=0)  # requeues because the provider was rate limited
+    run_after = Column(DateTime)  # not claimed before this time (throttle backoff)
+    score = Column(Integer)
+    feedback = Column(Text)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    started_at = Column(DateTime)
+    completed_at = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<EvaluationJob(id={self.id}, status={self.status}, attempts={self.attempts})>"
@@ -16,6 +16,7 @@ class Interview(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False)
     description = Column(Text)
+    evaluator_backend = Column(String(50))  # None = settings.EVALUATOR_BACKEND
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -0,0 +1,27 @@
+"""
+InterviewStats model for SQLAlchemy
+"""
+from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.database import Base
+
+
+class InterviewStats(Base):
+    """Interview-wide answer rollup, kept up to date whenever an answer is saved"""
+    __tablename__ = "interview_stats"
+    
+    interview_id = Column(UUID(as_uuid=True), ForeignKey("interviews.id", ondelete="CASCADE"), primary_key=True)
+    answer_count = Column(Integer, nullable=False, default=0)
+    scored_count = Column(Integer, nullable=False, default=0)  # answers with a score
+    score_sum = Column(Integer, nullable=False, default=0)
+    last_answer_at = Column(DateTime)
+    version = Column(Integer, nullable=False, default=0)  # bumped on every change
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    
+    @property
+    def average_score(self):
+        return self.score_sum / self.scored_count if self.scored_count else None
+    
+    def __repr__(self):
+        return f"<InterviewStats(interview_id={self.interview_id}, answer_count={self.answer_count})>"
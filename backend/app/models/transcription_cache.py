@@ -0,0 +1,20 @@
+"""
+TranscriptionCacheEntry model for SQLAlchemy
+"""
+from sqlalchemy import Column, String, Text, Integer, DateTime
+from datetime import datetime
+from app.database import Base
+
+
+class TranscriptionCacheEntry(Base):
+    """Persisted transcript keyed by the SHA-256 of the uploaded audio"""
+    __tablename__ = "transcription_cache"
+    
+    audio_hash = Column(String(64), primary_key=True)  # SHA-256 hex digest of the audio bytes
+    model = Column(String(100), primary_key=True)
+    transcript = Column(Text, nullable=False)
+    byte_size = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<TranscriptionCacheEntry(audio_hash={self.audio_hash}, model={self.model})>"
@@ -1,15 +1,17 @@
 """
 Admin API routes
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 from app.database import get_db
 from app.routes.dependencies import get_current_admin
 from app.models.admin import Admin
 from app.schemas.admin import AdminSignupRequest, AdminLoginRequest, AdminLoginResponse
 from app.schemas.interview import InterviewCreate, InterviewResponse, InterviewListResponse
-from app.schemas.answer import DashboardResponse, ReportResponse
+from app.schemas.candidate import CandidateListResponse
+from app.schemas.answer import DashboardResponse, DashboardSort, ReportResponse, SortOrder
 from app.controllers.admin_controller import (
     signup_admin,
     login_admin,
@@ -18,7 +20,17 @@ from app.controllers.admin_controller import (
     get_all_interviews,
     get_interview_dashboard,
     get_interview_candidates,
-    get_candidate_report
+    get_candidate_report_json,
+    evaluate_candidate_answers,
+    get_evaluation_cache_status,
+    invalidate_evaluation_cache_entries,
+    get_transcription_cache_status,
+    get_report_cache_status,
+    get_ai_client_status,
+    get_ai_rate_limit_status,
+    get_ai_circuit_status,
+    get_ai_token_usage_status,
+    get_ai_routing_status
 )
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -65,6 +77,7 @@ def create_interview_endpoint(
 def add_question(
     interview_id: str,
     question_text: str,
+    expected_points: Optional[str] = None,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
@@ -72,46 +85,66 @@ def add_question(
     Add a question to an interview
     Requires admin authentication
     Accepts interview_id and question_text as query parameters or form data
+    Optional expected_points (one per line) seed the evaluation rubric
     """
-    return add_question_to_interview(db, interview_id, question_text)
+    return add_question_to_interview(db, interview_id, question_text, expected_points)
 
 
 @router.get("/interviews", response_model=InterviewListResponse)
 def get_interviews(
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    search: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include_total: bool = True,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     """
-    Get all interviews
+    Get one page of interviews, newest first
+    Pass next_cursor back as cursor for the following page
     Requires admin authentication
     """
-    return get_all_interviews(db)
+    return get_all_interviews(db, cursor, limit, search, created_from, created_to, include_total)
 
 
 @router.get("/interview/{interview_id}/dashboard", response_model=DashboardResponse)
 def get_dashboard(
     interview_id: str,
+    page: int = Query(1, ge=1),
+    page_size: Optional[int] = Query(None, ge=1),
+    sort_by: DashboardSort = "created_at",
+    order: SortOrder = "desc",
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     """
     Get dashboard data for a specific interview
+    Candidates are paginated and sorted by created_at, average_score or last_answer_at
     Requires admin authentication
     """
-    return get_interview_dashboard(db, interview_id)
+    return get_interview_dashboard(db, interview_id, page, page_size, sort_by, order)
 
 
-@router.get("/interview/{interview_id}/candidates")
+@router.get("/interview/{interview_id}/candidates", response_model=CandidateListResponse)
 def get_candidates(
     interview_id: str,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    search: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    include_total: bool = True,
     current_admin: Admin = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     """
-    Get all candidates for an interview
+    Get one page of an interview's candidates, newest first
+    Pass next_cursor back as cursor for the following page
     Requires admin authentication
     """
-    return get_interview_candidates(db, interview_id)
+    return get_interview_candidates(db, interview_id, cursor, limit, search, created_from, created_to, include_total)
 
 
 @router.get("/report/{candidate_id}", response_model=ReportResponse)
@@ -122,7 +155,121 @@ def get_report(
 ):
     """
     Get detailed report for a candidate
+    Repeat views are served from the report cache until an answer changes
     Requires admin authentication
     """
-    return get_candidate_report(db, candidate_id)
+    return Response(content=get_candidate_report_json(db, candidate_id), media_type="application/json")
 
+
+@router.post("/report/{candidate_id}/evaluate", response_model=ReportResponse)
+def evaluate_report(
+    candidate_id: str,
+    current_admin: Admin = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Re-evaluate all answers for a candidate in one batched AI request
+    Requires admin authentication
+    """
+    return evaluate_candidate_answers(db, candidate_id)
+
+
+@router.get("/ai/evaluation-cache")
+def evaluation_cache_stats(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Get evaluation cache hit/miss counters
+    Requires admin authentication
+    """
+    return get_evaluation_cache_status()
+
+
+@router.post("/ai/evaluation-cache/invalidate")
+def invalidate_evaluation_cache(
+    all_versions: bool = False,
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Invalidate cached evaluations from older prompt versions
+    Pass all_versions=true to clear the whole cache
+    Requires admin authentication
+    """
+    return invalidate_evaluation_cache_entries(all_versions)
+
+
+@router.get("/report-cache")
+def report_cache_stats(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Get candidate report cache hit/miss counters
+    Requires admin authentication
+    """
+    return get_report_cache_status()
+
+
+@router.get("/ai/transcription-cache")
+def transcription_cache_stats(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Get transcription cache hit/miss counters
+    Requires admin authentication
+    """
+    return get_transcription_cache_status()
+
+
+@router.get("/ai/clients")
+def ai_client_stats(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Get AI provider connection pool utilization
+    Requires admin authentication
+    """
+    return get_ai_client_status()
+
+
+@router.get("/ai/rate-limits")
+def ai_rate_limit_stats(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Get AI provider queue depth and throttling counters
+    Requires admin authentication
+    """
+    return get_ai_rate_limit_status()
+
+
+@router.get("/ai/circuit-breakers")
+def ai_circuit_breaker_stats(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Get transcription circuit breaker state and hedged-request counters
+    Requires admin authentication
+    """
+    return get_ai_circuit_status()
+
+
+@router.get("/ai/token-usage")
+def ai_token_usage_stats(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Get evaluation prompt input/output token counts
+    Requires admin authentication
+    """
+    return get_ai_token_usage_status()
+
+
+@router.get("/ai/routing")
+def ai_routing_stats(
+    current_admin: Admin = Depends(get_current_admin)
+):
+    """
+    Get evaluation escalation rate (fast model to primary model) and latency
+    Requires admin authentication
+    """
+    return get_ai_routing_status()
@@ -3,13 +3,16 @@ AI API routes for transcription and evaluation
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.orm import Session
+from typing import Optional
 from app.database import get_db
 from app.routes.dependencies import get_current_candidate
 from app.models.candidate import Candidate
+from app.schemas.answer import AnswerResponse
 from app.controllers.ai_controller import (
     transcribe_audio_file,
     evaluate_answer,
-    save_answer
+    get_evaluation_result,
+    submit_answer
 )
 
 router = APIRouter(prefix="/ai", tags=["ai"])
@@ -23,26 +26,55 @@ def transcribe(
 ):
     """
     Transcribe audio using Whisper API
+    The upload is streamed to the provider without being read into memory;
+    uploads over MAX_AUDIO_UPLOAD_BYTES are rejected with 413
     Requires candidate authentication
     """
-    # Read audio file bytes
-    audio_data = audio_file.file.read()
-    return transcribe_audio_file(db, str(current_candidate.id), audio_data)
+    return transcribe_audio_file(db, str(current_candidate.id), audio_file.file, audio_file.filename)
 
 
-@router.post("/evaluate")
+@router.post("/answer", response_model=AnswerResponse)
+def answer(
+    audio_file: UploadFile = File(...),
+    question_id: str = Form(...),
+    current_candidate: Candidate = Depends(get_current_candidate),
+    db: Session = Depends(get_db)
+):
+    """
+    Transcribe, evaluate and save an answer in a single request
+    Returns the saved answer with its score and feedback
+    Requires candidate authentication
+    """
+    return submit_answer(db, current_candidate, question_id, audio_file.file, audio_file.filename)
+
+
+@router.post("/evaluate", status_code=status.HTTP_202_ACCEPTED)
 def evaluate(
     transcript: str = Form(...),
+    question_id: Optional[str] = Form(None),
     current_candidate: Candidate = Depends(get_current_candidate),
     db: Session = Depends(get_db)
 ):
     """
-    Evaluate transcript using Gemini API
-    Returns score (1-10) and 2-line feedback
+    Queue transcript evaluation (Gemini)
+    Returns a job ID immediately; poll /ai/evaluate/{job_id} for the
+    score (1-10) and 2-line feedback
+    When question_id is given the result is saved to that answer
     Requires candidate authentication
-    Accepts transcript as form data or query parameter
     """
-    return evaluate_answer(db, str(current_candidate.id), transcript)
-
+    return evaluate_answer(db, current_candidate, transcript, question_id)
 
 
+@router.get("/evaluate/{job_id}")
+async def get_evaluation(
+    job_id: str,
+    wait_seconds: float = 0,
+    current_candidate: Candidate = Depends(get_current_candidate),
+    db: Session = Depends(get_db)
+):
+    """
+    Get evaluation job status and result
+    Pass wait_seconds to long-poll until the job completes or fails
+    Requires candidate authentication
+    """
+    return await get_evaluation_result(db, str(current_candidate.id), job_id, wait_seconds)
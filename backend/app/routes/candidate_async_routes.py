@@ -0,0 +1,74 @@
+"""
+Async candidate routes (served instead of candidate_routes and interview_routes
+when DB_ASYNC_ROUTES is enabled)
+
+Same paths and behaviour, but database work is awaited on the async engine, so
+a candidate waiting on the database does not occupy a threadpool thread.
+"""
+from fastapi import APIRouter, Depends, Form
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.routes.dependencies import get_current_candidate_async
+from app.models.candidate import Candidate
+from app.schemas.candidate import CandidateRegister, CandidateLoginResponse
+from app.controllers.candidate_controller import (
+    get_interview_by_link_async,
+    register_candidate_for_interview_async,
+    start_interview_async
+)
+from app.controllers.ai_controller import save_answer_async_session
+
+router = APIRouter(prefix="/candidate", tags=["candidate"])
+interview_router = APIRouter(tags=["interview"])
+
+
+@interview_router.get("/interview/{link_code}")
+async def get_interview_by_link_code(
+    link_code: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get interview details by link code (public endpoint)
+    No authentication required
+    """
+    return await get_interview_by_link_async(db, link_code)
+
+
+@router.post("/save-answer")
+async def save_answer_endpoint(
+    question_id: str = Form(...),
+    transcript: str = Form(...),
+    current_candidate: Candidate = Depends(get_current_candidate_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Save candidate answer transcript and queue its evaluation
+    Scores are computed server-side; poll GET /ai/evaluate/{job_id} for the result
+    Requires candidate authentication
+    """
+    return await save_answer_async_session(db, current_candidate, question_id, transcript)
+
+
+@router.post("/register", response_model=CandidateLoginResponse)
+async def register(
+    registration_data: CandidateRegister,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Register a candidate for an interview
+    Returns a JWT token
+    No authentication required (public registration)
+    """
+    return await register_candidate_for_interview_async(db, registration_data)
+
+
+@router.post("/start")
+async def start(
+    current_candidate: Candidate = Depends(get_current_candidate_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Start interview - get questions for candidate
+    Requires candidate authentication
+    """
+    return await start_interview_async(db, current_candidate)
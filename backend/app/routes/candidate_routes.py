@@ -12,6 +12,7 @@ from app.controllers.candidate_controller import (
     register_candidate_for_interview,
     start_interview
 )
+from app.controllers.ai_controller import save_answer
 
 router = APIRouter(prefix="/candidate", tags=["candidate"])
 
@@ -20,24 +21,15 @@ router = APIRouter(prefix="/candidate", tags=["candidate"])
 def save_answer_endpoint(
     question_id: str = Form(...),
     transcript: str = Form(...),
-    score: int = Form(...),
-    feedback: str = Form(...),
     current_candidate: Candidate = Depends(get_current_candidate),
     db: Session = Depends(get_db)
 ):
     """
-    Save candidate answer with transcript, score, and feedback
+    Save candidate answer transcript and queue its evaluation
+    Scores are computed server-side; poll GET /ai/evaluate/{job_id} for the result
     Requires candidate authentication
     """
-    from app.controllers.ai_controller import save_answer
-    return save_answer(
-        db,
-        str(current_candidate.id),
-        question_id,
-        transcript,
-        score,
-        feedback
-    )
+    return save_answer(db, current_candidate, question_id, transcript)
 
 
 @router.post("/register", response_model=CandidateLoginResponse)
@@ -1,13 +1,16 @@
 """
 Dependency injection functions for FastAPI routes
 """
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, WebSocketException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models.admin import Admin
 from app.models.candidate import Candidate
 from app.services.auth_service import decode_token, get_admin_by_email, get_candidate_by_id
+from app.services.candidate_service import get_candidate_by_id_async
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
@@ -120,3 +123,72 @@ def get_current_candidate(
             detail=f"Could not validate credentials: {str(e)}"
         )
 
+
+async def get_current_candidate_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> Candidate:
+    """
+    Async variant of get_current_candidate, loading the candidate on the async engine
+    
+    Raises:
+        HTTPException: If token is invalid or candidate not found
+    """
+    try:
+        payload = decode_token(credentials.credentials)
+    except JWTError:
+        payload = None
+    if not payload or payload.get("type") != "candidate" or not payload.get("sub"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication token"
+        )
+    
+    import uuid
+    try:
+        candidate_id = uuid.UUID(payload["sub"])
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid candidate ID format"
+        )
+    
+    candidate = await get_candidate_by_id_async(db, candidate_id)
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Candidate not found"
+        )
+    return candidate
+
+
+def get_websocket_candidate(
+    token: str = Query(...),
+    db: Session = Depends(get_db)
+) -> Candidate:
+    """
+    Dependency to get the authenticated candidate of a WebSocket connection
+    
+    Browsers cannot set headers on WebSocket requests, so the JWT is passed
+    as the token query parameter.
+    
+    Raises:
+        WebSocketException: Policy violation close if the token is invalid
+    """
+    try:
+        payload = decode_token(token)
+    except JWTError:
+        payload = None
+    if not payload or payload.get("type") != "candidate" or not payload.get("sub"):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid authentication token")
+    
+    import uuid
+    try:
+        candidate_id = uuid.UUID(payload["sub"])
+    except (ValueError, TypeError):
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Invalid candidate ID format")
+    
+    candidate = get_candidate_by_id(db, candidate_id)
+    if not candidate:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Candidate not found")
+    return candidate
@@ -0,0 +1,28 @@
+"""
+Streaming answer routes (WebSocket)
+"""
+from fastapi import APIRouter, Depends, Query, WebSocket
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.routes.dependencies import get_websocket_candidate
+from app.models.candidate import Candidate
+from app.controllers.ai_controller import stream_answer
+
+router = APIRouter(prefix="/ai", tags=["ai"])
+
+
+@router.websocket("/answer/stream")
+async def answer_stream(
+    websocket: WebSocket,
+    question_id: str = Query(...),
+    audio_format: str = Query("webm"),
+    current_candidate: Candidate = Depends(get_websocket_candidate),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream an answer's audio while it is recorded; it is transcribed as it
+    arrives, then evaluated and saved once the client sends "stop"
+    Requires the candidate token as the token query parameter
+    """
+    await websocket.accept()
+    await stream_answer(websocket, db, current_candidate, question_id, audio_format)
@@ -2,7 +2,7 @@
 Answer-related Pydantic schemas
 """
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
 
 
@@ -45,14 +45,24 @@ class CandidateDetail(BaseModel):
     created_at: datetime
     total_answers: int
     average_score: Optional[float]
+    last_answer_at: Optional[datetime] = None
+
+
+# Dashboard candidate ordering: registration date, average score or most recent answer
+DashboardSort = Literal["created_at", "average_score", "last_answer_at"]
+SortOrder = Literal["asc", "desc"]
 
 
 class DashboardResponse(BaseModel):
-    """Interview dashboard response schema"""
+    """Interview dashboard response schema (one page of candidates)"""
     interview_id: str
     interview_title: str
     total_candidates: int
     total_questions: int
+    total_answers: int = 0
+    average_score: Optional[float] = None  # across all of the interview's scored answers
+    page: int = 1
+    page_size: int
     candidates: List[CandidateDetail]
 
 
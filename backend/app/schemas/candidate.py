@@ -2,7 +2,7 @@
 Candidate-related Pydantic schemas
 """
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -30,6 +30,13 @@ class CandidateResponse(BaseModel):
         from_attributes = True
 
 
+class CandidateListResponse(BaseModel):
+    """One page of an interview's candidates"""
+    candidates: List[CandidateResponse]
+    total: Optional[int] = None  # None when the count was not requested
+    next_cursor: Optional[str] = None  # None on the last page
+
+
 class CandidateLoginResponse(BaseModel):
     """Candidate login response schema"""
     access_token: str
@@ -11,6 +11,7 @@ class InterviewCreate(BaseModel):
     """Create interview request schema"""
     title: str
     description: Optional[str] = None
+    evaluator_backend: Optional[str] = None  # "gemini" or "heuristic"; None = server default
 
 
 class QuestionCreate(BaseModel):
@@ -23,6 +24,7 @@ class InterviewResponse(BaseModel):
     id: str
     title: str
     description: Optional[str]
+    evaluator_backend: Optional[str] = None
     created_at: datetime
     shareable_link: Optional[str] = None
     candidate_password: Optional[str] = None  
@@ -34,5 +36,6 @@ class InterviewResponse(BaseModel):
 class InterviewListResponse(BaseModel):
     """List of interviews response schema"""
     interviews: List[InterviewResponse]
-    total: int
+    total: Optional[int] = None  # None when the count was not requested
+    next_cursor: Optional[str] = None  # None on the last page
 
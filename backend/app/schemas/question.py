@@ -17,6 +17,7 @@ class QuestionResponse(BaseModel):
     id: str
     interview_id: str
     question_text: str
+    rubric: Optional[str] = None
     created_at: datetime
     
     class Config:
@@ -0,0 +1,327 @@
+"""
+Shared AI provider clients: pooled keep-alive HTTP for OpenAI, one Gemini
+channel with cached model handles, start-up warm-up and pool utilization stats
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Optional
+import httpx
+import google.generativeai as genai
+from openai import AsyncOpenAI, OpenAI
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Initialize Gemini (one long-lived channel shared by every model handle)
+genai.configure(api_key=settings.GEMINI_API_KEY, transport=settings.GEMINI_TRANSPORT)
+
+
+class _RequestStats:
+    """Thread-safe request counters for one provider"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @contextmanager
+    def track(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight
+            }
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    """httpx transport that records request counts and exposes its connection pool"""
+
+    def __init__(self, stats: _RequestStats, **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._stats.track():
+            return super().handle_request(request)
+
+    def connection_counts(self) -> Dict[str, Optional[int]]:
+        """Open/idle/active connections in the pool; None when httpx does not expose them"""
+        # httpx keeps the httpcore pool on a private attribute, so read it defensively
+        connections = getattr(getattr(self, "_pool", None), "connections", None)
+        if connections is None:
+            return {"open_connections": None, "idle_connections": None, "active_connections": None}
+        connections = list(connections)
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle
+        }
+
+
+class _CountingAsyncTransport(httpx.AsyncHTTPTransport):
+    """Async counterpart of _CountingTransport"""
+
+    def __init__(self, stats: _RequestStats, **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        with self._stats.track():
+            return await super().handle_async_request(request)
+
+    connection_counts = _CountingTransport.connection_counts
+
+
+_openai_stats = _RequestStats()
+_gemini_stats = _RequestStats()
+
+_openai_client: Optional[OpenAI] = None
+_openai_transport: Optional[_CountingTransport] = None
+_async_openai_client: Optional[AsyncOpenAI] = None
+_async_openai_transport: Optional[_CountingAsyncTransport] = None
+_gemini_models: Dict[str, genai.GenerativeModel] = {}
+_clients_lock = threading.Lock()
+
+_warmed: Dict[str, bool] = {"openai": False, "gemini": False}
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Get the shared OpenAI client
+
+    The client keeps up to AI_HTTP_MAX_KEEPALIVE_CONNECTIONS connections open
+    for AI_HTTP_KEEPALIVE_SECONDS, so calls reuse warm TLS connections.
+    """
+    global _openai_client, _openai_transport
+
+    with _clients_lock:
+        if _openai_client is None:
+            _openai_transport = _CountingTransport(_openai_stats, limits=_http_limits())
+            timeout = _http_timeout()
+            _openai_client = OpenAI(
+                api_key=settings.WHISPER_API_KEY,
+                timeout=timeout,
+                # 429/503 retries are handled (with backoff) by the provider limiter
+                max_retries=0,
+                http_client=httpx.Client(transport=_openai_transport, timeout=timeout)
+            )
+        return _openai_client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Get the shared AsyncOpenAI client (same pool limits as get_openai_client)
+
+    Requests are awaited on the event loop, so in-flight calls do not hold
+    threadpool threads. The client must be used from a single event loop.
+    """
+    global _async_openai_client, _async_openai_transport
+
+    with _clients_lock:
+        if _async_openai_client is None:
+            _async_openai_transport = _CountingAsyncTransport(
+                _openai_stats,
+                limits=_http_limits()
+            )
+            timeout = _http_timeout()
+            _async_openai_client = AsyncOpenAI(
+                api_key=settings.WHISPER_API_KEY,
+                timeout=timeout,
+                max_retries=0,
+                http_client=httpx.AsyncClient(transport=_async_openai_transport, timeout=timeout)
+            )
+        return _async_openai_client
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.AI_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.AI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.AI_HTTP_KEEPALIVE_SECONDS
+    )
+
+
+def _http_timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        settings.AI_HTTP_TIMEOUT_SECONDS,
+        connect=settings.AI_HTTP_CONNECT_TIMEOUT_SECONDS
+    )
+
+
+def get_gemini_model(model_name: Optional[str] = None) -> genai.GenerativeModel:
+    """
+    Get the shared Gemini model handle
+
+    Args:
+        model_name: Gemini model; defaults to settings.GEMINI_MODEL
+    """
+    model_name = model_name or settings.GEMINI_MODEL
+
+    with _clients_lock:
+        if model_name not in _gemini_models:
+            _gemini_models[model_name] = genai.GenerativeModel(model_name)
+        return _gemini_models[model_name]
+
+
+def generate_content(prompt: str, model_name: Optional[str] = None, **kwargs):
+    """
+    Run a Gemini generate_content call on the shared model handle
+
+    Args:
+        prompt: Prompt text
+        model_name: Gemini model; defaults to settings.GEMINI_MODEL
+        **kwargs: Passed through to GenerativeModel.generate_content
+
+    Returns:
+        Gemini GenerateContentResponse
+    """
+    model = get_gemini_model(model_name)
+    with _gemini_stats.track():
+        return model.generate_content(prompt, **kwargs)
+
+
+async def generate_content_async(prompt: str, model_name: Optional[str] = None, **kwargs):
+    """Async twin of generate_content (awaited on the event loop)"""
+    model = get_gemini_model(model_name)
+    with _gemini_stats.track():
+        return await model.generate_content_async(prompt, **kwargs)
+
+
+def _warm_openai() -> None:
+    client = get_openai_client()
+    # Concurrent lightweight requests so several pooled connections are opened up front
+    connections = max(1, settings.AI_CLIENT_WARMUP_CONNECTIONS)
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        futures = [
+            executor.submit(client.models.retrieve, settings.WHISPER_MODEL)
+            for _ in range(connections)
+        ]
+        for future in futures:
+            future.result()
+
+
+def _warm_gemini() -> None:
+    get_gemini_model()
+    if settings.EVALUATION_FAST_MODEL:
+        get_gemini_model(settings.EVALUATION_FAST_MODEL)
+    with _gemini_stats.track():
+        genai.get_model(f"models/{settings.GEMINI_MODEL}")
+
+
+def warm_up_clients() -> Dict[str, bool]:
+    """
+    Open connections to the providers the configured backends will use
+
+    Failures are logged rather than raised: the first real request simply
+    pays the connection cost instead.
+
+    Returns:
+        Dictionary of provider name to whether its warm-up succeeded
+    """
+    providers = {}
+    if settings.TRANSCRIPTION_BACKEND == "openai":
+        providers["openai"] = _warm_openai
+    if "gemini" in (settings.EVALUATOR_BACKEND, settings.EVALUATOR_FALLBACK_BACKEND):
+        providers["gemini"] = _warm_gemini
+
+    results = {}
+    for name, warm in providers.items():
+        try:
+            warm()
+            _warmed[name] = True
+        except Exception as e:
+            logger.warning("Warm-up of %s client failed: %s", name, e)
+        results[name] = _warmed[name]
+    return results
+
+
+def start_client_warmup() -> None:
+    """Warm up provider connections in the background so start-up is not delayed"""
+    if not settings.AI_CLIENT_WARMUP_ENABLED:
+        return
+    threading.Thread(target=warm_up_clients, name="ai-client-warmup", daemon=True).start()
+
+
+def get_client_pool_stats() -> dict:
+    """
+    Get connection pool utilization and request counters for each provider
+
+    Returns:
+        Dictionary keyed by provider name
+    """
+    with _clients_lock:
+        transport = _openai_transport
+        async_transport = _async_openai_transport
+        gemini_models = sorted(_gemini_models)
+
+    openai_stats = {
+        "warmed": _warmed["openai"],
+        "max_connections": settings.AI_HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.AI_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        "keepalive_seconds": settings.AI_HTTP_KEEPALIVE_SECONDS,
+        **_openai_stats.snapshot()
+    }
+    if transport is not None:
+        openai_stats.update(transport.connection_counts())
+        active = openai_stats["active_connections"]
+        openai_stats["utilization"] = round(
+            active / settings.AI_HTTP_MAX_CONNECTIONS, 4
+        ) if active is not None and settings.AI_HTTP_MAX_CONNECTIONS else None
+
+    if async_transport is not None:
+        openai_stats["async_pool"] = async_transport.connection_counts()
+
+    return {
+        "openai": openai_stats,
+        "gemini": {
+            "warmed": _warmed["gemini"],
+            "transport": settings.GEMINI_TRANSPORT,
+            "models": gemini_models,
+            **_gemini_stats.snapshot()
+        }
+    }
+
+
+def close_clients() -> None:
+    """Close pooled provider connections (application shutdown)"""
+    global _openai_client, _openai_transport
+
+    with _clients_lock:
+        if _openai_client is not None:
+            _openai_client.close()
+        _openai_client = None
+        _openai_transport = None
+
+
+async def close_async_clients() -> None:
+    """Close the async client's pooled connections (application shutdown)"""
+    global _async_openai_client, _async_openai_transport
+
+    with _clients_lock:
+        client = _async_openai_client
+        _async_openai_client = None
+        _async_openai_transport = None
+    if client is not None:
+        await client.close()
@@ -0,0 +1,211 @@
+"""
+Transcription and evaluation steps shared by ai_service and async_ai_service
+
+Both entry points run the same pipeline and differ only in how provider
+calls are made (threads vs the event loop); everything else lives here so
+the two cannot drift apart.
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterable, List, Optional, Set, Tuple
+from app.config import settings
+from app.services.cache_service import evaluation_cache_key, store_cached_evaluation
+from app.services.audio_service import (
+    SAMPLE_RATE,
+    PreprocessedAudio,
+    preprocess_audio,
+    ffmpeg_executable,
+    split_at_silence
+)
+from app.services.transcription_backends import TranscriptionBackend, get_transcription_backend
+from app.services.evaluator_backends import EvaluatorBackend, get_evaluator_backend
+from app.services.prompt_service import QuestionContext
+from app.services.rate_limit_service import ProviderThrottled
+from app.services.resilience_service import CircuitBreaker, CircuitOpen, get_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+# Extra time the caller waits past the evaluation deadline, so a call still
+# queued in the rate limiter at the deadline raises ProviderThrottled first
+TIMEOUT_GRACE_SECONDS = 1.0
+
+
+@dataclass
+class SegmentTiming:
+    """Position and provider latency of one transcribed segment"""
+    start_seconds: Optional[float]
+    end_seconds: Optional[float]
+    latency_seconds: float
+
+
+@dataclass
+class TranscriptionResult:
+    """Transcript plus timing details for one transcribe_audio_detailed call"""
+    text: str
+    cached: bool = False
+    wall_seconds: float = 0.0
+    segments: List[SegmentTiming] = field(default_factory=list)
+
+
+def preprocess_for_transcription(audio: BinaryIO) -> Optional[PreprocessedAudio]:
+    """Run audio preprocessing if enabled; on any failure the original audio is sent instead"""
+    if not settings.AUDIO_PREPROCESSING_ENABLED or ffmpeg_executable() is None:
+        return None
+
+    encode_max_seconds = None
+    if settings.CHUNKED_TRANSCRIPTION_ENABLED:
+        encode_max_seconds = settings.TRANSCRIPTION_CHUNK_MIN_SECONDS
+
+    start = audio.tell()
+    try:
+        return preprocess_audio(audio, encode_max_seconds)
+    except Exception:
+        logger.exception("Audio preprocessing failed, sending original audio")
+        audio.seek(start)
+        return None
+
+
+def recording_timing(preprocessed: Optional[PreprocessedAudio], call_started: float) -> SegmentTiming:
+    """Timing of a recording transcribed in one request (position unknown without preprocessing)"""
+    return SegmentTiming(
+        start_seconds=0.0 if preprocessed is not None else None,
+        end_seconds=preprocessed.duration_seconds if preprocessed is not None else None,
+        latency_seconds=time.monotonic() - call_started
+    )
+
+
+def transcription_segments(samples) -> List[Tuple[int, int]]:
+    """Overlapping silence-aligned (start, end) sample ranges to transcribe separately"""
+    return split_at_silence(
+        samples,
+        settings.TRANSCRIPTION_CHUNK_SECONDS,
+        settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS,
+        settings.TRANSCRIPTION_CHUNK_SEARCH_SECONDS
+    )
+
+
+def segment_timing(start: int, end: int, call_started: float) -> SegmentTiming:
+    """Timing of the segment covering samples [start, end)"""
+    return SegmentTiming(
+        start_seconds=start / SAMPLE_RATE,
+        end_seconds=end / SAMPLE_RATE,
+        latency_seconds=time.monotonic() - call_started
+    )
+
+
+def join_segments(
+    outputs: Iterable[Tuple[str, str, SegmentTiming]]
+) -> Tuple[str, List[SegmentTiming], Set[str]]:
+    """
+    Stitch per-segment (text, backend name, timing) outputs, in segment order
+
+    Returns:
+        Tuple of (transcript, timings, names of the backends that answered)
+    """
+    outputs = list(outputs)
+    transcript = ""
+    for text, _used, _timing in outputs:
+        transcript = stitch_transcripts(transcript, text)
+    return (
+        transcript,
+        [timing for _text, _used, timing in outputs],
+        {used for _text, used, _timing in outputs}
+    )
+
+
+def stitch_transcripts(previous: str, following: str, max_overlap_words: int = 15) -> str:
+    """
+    Join two consecutive segment transcripts, dropping the words the
+    overlapping audio made both segments contain
+
+    The longest run of words (compared case- and punctuation-insensitively)
+    that ends `previous` and starts `following` is kept only once.
+    """
+    previous_words = previous.split()
+    following_words = following.split()
+    if not previous_words:
+        return following.strip()
+    if not following_words:
+        return previous.strip()
+
+    def normalize(word: str) -> str:
+        return word.strip(".,!?;:\"'()").lower()
+
+    tail = [normalize(word) for word in previous_words[-max_overlap_words:]]
+    head = [normalize(word) for word in following_words[:max_overlap_words]]
+    overlap = 0
+    for size in range(min(len(tail), len(head)), 0, -1):
+        if tail[-size:] == head[:size]:
+            overlap = size
+            break
+
+    return " ".join(previous_words + following_words[overlap:])
+
+
+def select_transcription_backend(
+    backend: TranscriptionBackend
+) -> Tuple[TranscriptionBackend, Optional[CircuitBreaker]]:
+    """
+    Backend to send a transcription request to, given backend's circuit breaker
+
+    Returns:
+        (backend, its breaker) while the breaker allows requests; the caller
+        records the outcome on the breaker. (TRANSCRIPTION_FALLBACK_BACKEND, None)
+        while it is open.
+
+    Raises:
+        CircuitOpen: If the breaker is open and there is no fallback backend
+    """
+    breaker = get_circuit_breaker(backend.name)
+    if breaker.allow_request():
+        return backend, breaker
+
+    name = settings.TRANSCRIPTION_FALLBACK_BACKEND
+    if not name or name == backend.name:
+        raise CircuitOpen(backend.name, breaker.retry_after())
+    return get_transcription_backend(name), None
+
+
+def evaluation_cache_key_for(
+    transcript: str,
+    context: Optional[QuestionContext],
+    evaluator: EvaluatorBackend
+) -> str:
+    """Evaluation cache key of transcript scored by evaluator for the question in context"""
+    return evaluation_cache_key(
+        transcript,
+        context.text if context else None,
+        evaluator.model,
+        settings.EVALUATION_PROMPT_VERSION,
+        rubric=context.rubric if context else None
+    )
+
+
+def store_evaluation(cache_key: str, evaluator: EvaluatorBackend, score: int, feedback: str) -> None:
+    """Cache a result produced by evaluator (never one from the fallback)"""
+    store_cached_evaluation(
+        cache_key,
+        evaluator.model,
+        settings.EVALUATION_PROMPT_VERSION,
+        score,
+        feedback
+    )
+
+
+def fallback_evaluator(evaluator: EvaluatorBackend, error: Exception) -> EvaluatorBackend:
+    """
+    EVALUATOR_FALLBACK_BACKEND, to answer after evaluator failed with error
+
+    Rate limiting is always re-raised: a fallback score would be persisted as
+    if the primary had produced it.
+
+    Raises:
+        Exception: error, if there is no fallback or error is ProviderThrottled
+    """
+    name = settings.EVALUATOR_FALLBACK_BACKEND
+    if not name or name == evaluator.name or isinstance(error, ProviderThrottled):
+        raise error
+    fallback = get_evaluator_backend(name)
+    logger.warning("%s evaluation failed (%r), using %s", evaluator.name, error, fallback.name)
+    return fallback
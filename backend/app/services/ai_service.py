@@ -1,56 +1,277 @@
 """
-AI service for Whisper (speech-to-text) and Gemini (text evaluation)
+AI service for speech-to-text and answer evaluation (pluggable backends)
 """
 import base64
 import io
-from typing import Tuple, Optional
-from openai import OpenAI
-import google.generativeai as genai
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import BinaryIO, List, Set, Tuple, Optional, Union
 from app.config import settings
+from app.models.question import Question
+from app.services.cache_service import (
+    get_cached_evaluation,
+    get_cached_transcription,
+    store_cached_transcription
+)
+from app.services.upload_service import hash_stream, stream_size
+from app.services.audio_service import encode_pcm
+from app.services.transcription_backends import TranscriptionBackend, get_transcription_backend
+from app.services.evaluator_backends import EvaluatorBackend, get_routed_evaluator
+from app.services.prompt_service import QuestionContext, question_context
+from app.services.prescreen_service import prescreen, prescreen_batch
+from app.services.rate_limit_service import ProviderThrottled, provider_deadline
+from app.services.single_flight_service import single_flight
+from app.services.resilience_service import CircuitOpen, get_latency_tracker, hedged_call
+from app.services.ai_pipeline_service import (
+    TIMEOUT_GRACE_SECONDS,
+    SegmentTiming,
+    TranscriptionResult,
+    evaluation_cache_key_for,
+    fallback_evaluator,
+    join_segments,
+    preprocess_for_transcription,
+    recording_timing,
+    segment_timing,
+    select_transcription_backend,
+    store_evaluation,
+    transcription_segments
+)
 
-# Initialize OpenAI client for Whisper
-openai_client = OpenAI(api_key=settings.WHISPER_API_KEY)
+logger = logging.getLogger(__name__)
 
-# Initialize Gemini
-genai.configure(api_key=settings.GEMINI_API_KEY)
+# Transcribes segments of long recordings concurrently (shared by all requests)
+_chunk_executor = ThreadPoolExecutor(
+    max_workers=settings.TRANSCRIPTION_CHUNK_WORKERS,
+    thread_name_prefix="transcription-chunk"
+)
 
+# Runs hedged transcription attempts (both the original and the duplicate)
+_hedge_executor = ThreadPoolExecutor(
+    max_workers=settings.TRANSCRIPTION_HEDGE_THREADS,
+    thread_name_prefix="transcription-hedge"
+)
 
-def transcribe_audio(audio_data: bytes) -> str:
+# Runs evaluations so slow providers can be abandoned after EVALUATION_TIMEOUT_SECONDS
+_evaluation_executor = ThreadPoolExecutor(
+    max_workers=settings.EVALUATION_THREADS,
+    thread_name_prefix="evaluation"
+)
+
+
+def transcribe_audio(
+    audio: Union[bytes, BinaryIO],
+    audio_hash: Optional[str] = None,
+    filename: str = "audio.wav"
+) -> str:
     """
-    Transcribe audio using Whisper API
+    Transcribe audio with the configured TranscriptionBackend (Whisper API or local)
+    
+    See transcribe_audio_detailed for caching, preprocessing and chunking.
     
     Args:
-        audio_data: Audio file bytes (WAV, MP3, etc.)
+        audio: Audio file bytes or a seekable file handle (WAV, MP3, etc.)
+        audio_hash: SHA-256 hex digest of the audio, if already computed
+        filename: Filename sent to Whisper (it infers the format from the extension)
     
     Returns:
         Transcribed text string
     
     Raises:
+        ProviderThrottled: If the provider's rate limit left no capacity in time
+        Exception: If transcription fails
+    """
+    return transcribe_audio_detailed(audio, audio_hash, filename).text
+
+
+def transcribe_audio_detailed(
+    audio: Union[bytes, BinaryIO],
+    audio_hash: Optional[str] = None,
+    filename: str = "audio.wav"
+) -> TranscriptionResult:
+    """
+    Transcribe audio and report per-segment timing
+    
+    Byte-identical uploads (e.g. client retries) are answered from the
+    transcription cache without calling the backend again, and concurrent
+    ones wait for the first upload's transcription. File handles are
+    streamed to the provider as-is, without being read into memory.
+    Preprocessed recordings longer than TRANSCRIPTION_CHUNK_MIN_SECONDS are
+    split at silences into overlapping segments that are transcribed
+    concurrently and stitched back together. Slow provider calls are hedged,
+    and while the backend's circuit breaker is open calls go to
+    TRANSCRIPTION_FALLBACK_BACKEND (or fail fast without one).
+    
+    Args:
+        audio: Audio file bytes or a seekable file handle (WAV, MP3, etc.)
+        audio_hash: SHA-256 hex digest of the audio, if already computed
+        filename: Filename sent to Whisper (it infers the format from the extension)
+    
+    Returns:
+        TranscriptionResult
+    
+    Raises:
+        ProviderThrottled: If the provider's rate limit left no capacity in time
+        CircuitOpen: If the backend's circuit breaker is open and there is no fallback
         Exception: If transcription fails
     """
+    backend = get_transcription_backend()
+    
+    if isinstance(audio, (bytes, bytearray)):
+        audio = io.BytesIO(audio)
+    if audio_hash is None:
+        audio_hash = hash_stream(audio)
+    
+    def lookup() -> Optional[TranscriptionResult]:
+        cached = get_cached_transcription(audio_hash, backend.model)
+        return None if cached is None else TranscriptionResult(text=cached, cached=True)
+    
+    result = lookup()
+    if result is not None:
+        return result
+    
+    # Concurrent uploads of the same audio (double clicks, retries) share one transcription
+    return single_flight(
+        f"transcription:{backend.model}:{audio_hash}",
+        lambda: _transcribe_uncached(backend, audio, audio_hash, filename),
+        lookup
+    )
+
+
+def _transcribe_uncached(
+    backend: TranscriptionBackend,
+    audio: BinaryIO,
+    audio_hash: str,
+    filename: str
+) -> TranscriptionResult:
+    """Preprocess, transcribe (chunked if long) and cache a recording missing from the cache"""
+    byte_size = stream_size(audio)
+    started = time.monotonic()
+    
+    # Shrink the upload (mono, 16 kHz, silence trimmed, compact codec);
+    # silent recordings never reach the provider
+    preprocessed = preprocess_for_transcription(audio)
+    if preprocessed is not None:
+        if preprocessed.is_silent:
+            store_cached_transcription(audio_hash, backend.model, "", byte_size)
+            return TranscriptionResult(text="", wall_seconds=time.monotonic() - started)
+        audio, filename = preprocessed.file, preprocessed.filename
+    
     try:
-        # Create a file-like object from bytes
-        audio_file = io.BytesIO(audio_data)
-        audio_file.name = "audio.wav"  # Whisper needs a filename
-        
-        # Call Whisper API
-        transcript = openai_client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file,
-            response_format="text"
-        )
-        
-        return transcript if isinstance(transcript, str) else str(transcript)
+        if preprocessed is not None and preprocessed.file is None:
+            # Long recording: preprocessing left it unencoded for chunking
+            transcript, segments, answered_by = _transcribe_chunked(backend, preprocessed.samples)
+        else:
+            call_started = time.monotonic()
+            transcript, used = _call_transcription_backend(backend, audio, filename)
+            answered_by = {used.name}
+            segments = [recording_timing(preprocessed, call_started)]
+    except (ProviderThrottled, CircuitOpen):
+        raise
     except Exception as e:
         raise Exception(f"Whisper transcription failed: {str(e)}")
+    
+    # Transcripts from the alternate backend are not cached under the primary model
+    if answered_by == {backend.name}:
+        store_cached_transcription(audio_hash, backend.model, transcript, byte_size)
+    
+    result = TranscriptionResult(text=transcript, wall_seconds=time.monotonic() - started, segments=segments)
+    if len(segments) > 1:
+        logger.info(
+            "Transcribed %s segments in %.2fs wall (%.2fs summed provider time)",
+            len(segments), result.wall_seconds, sum(segment.latency_seconds for segment in segments)
+        )
+    return result
 
 
-def evaluate_text(transcript: str) -> Tuple[int, str]:
+def _transcribe_chunked(backend, samples) -> Tuple[str, List[SegmentTiming], Set[str]]:
+    """Transcribe overlapping silence-aligned segments concurrently and stitch the text"""
+    bounds = transcription_segments(samples)
+    
+    def run(segment_bounds):
+        start, end = segment_bounds
+        encoded = encode_pcm(samples[start:end])
+        call_started = time.monotonic()
+        text, used = _call_transcription_backend(
+            backend, io.BytesIO(encoded), f"segment.{settings.AUDIO_OUTPUT_FORMAT}"
+        )
+        return text, used.name, segment_timing(start, end, call_started)
+    
+    # map() keeps segment order; the shared pool bounds concurrency across requests
+    return join_segments(_chunk_executor.map(run, bounds))
+
+
+def _call_transcription_backend(
+    backend: TranscriptionBackend,
+    audio: BinaryIO,
+    filename: str
+) -> Tuple[str, TranscriptionBackend]:
+    """
+    Transcribe through the backend's circuit breaker
+    
+    Returns:
+        Tuple of (transcript, backend that produced it)
+    
+    Raises:
+        CircuitOpen: If the breaker is open and there is no fallback backend
     """
-    Evaluate transcript using Gemini API and return score (1-10) and 2-line feedback
+    target, breaker = select_transcription_backend(backend)
+    if breaker is None:
+        return target.transcribe(audio, filename), target
+    
+    try:
+        transcript = _hedged_transcribe(backend, audio, filename)
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return transcript, backend
+
+
+def _hedged_transcribe(backend: TranscriptionBackend, audio: BinaryIO, filename: str) -> str:
+    """Send the request, and a duplicate if it is slower than the backend's hedge percentile"""
+    if not (settings.TRANSCRIPTION_HEDGING_ENABLED and backend.hedge):
+        return backend.transcribe(audio, filename)
+    if stream_size(audio) > settings.TRANSCRIPTION_HEDGE_MAX_BYTES:
+        # Too large to hold twice; also kept out of the latency sample
+        return backend.transcribe(audio, filename)
+    
+    # Each attempt needs its own stream over the same bytes
+    data = audio.read()
+    return hedged_call(
+        _hedge_executor,
+        lambda: backend.transcribe(io.BytesIO(data), filename),
+        get_latency_tracker(backend.name)
+    )
+
+
+def evaluate_text(
+    transcript: str,
+    question: Optional[Question] = None,
+    backend: Optional[str] = None
+) -> Tuple[int, str]:
+    """
+    Evaluate transcript and return score (1-10) and 2-line feedback
+    
+    Empty, filler-only and clearly off-topic answers are scored locally by
+    the pre-screen without calling the backend (PRESCREEN_ENABLED).
+    The question's text and compiled rubric are part of the prompt. With
+    EVALUATION_FAST_MODEL set, Gemini answers are scored by the fast model
+    first and escalated to GEMINI_MODEL only when that result is borderline,
+    unparseable or low-confidence (see EscalatingEvaluator). Results
+    are served from the evaluation cache when the same normalized transcript
+    was already scored for the same question, rubric, model and prompt
+    version, and concurrent identical evaluations wait for the first one
+    instead of calling the backend again. If the backend errors or takes longer than
+    EVALUATION_TIMEOUT_SECONDS, EVALUATOR_FALLBACK_BACKEND answers instead;
+    without a fallback the error is raised. Rate limiting is never answered
+    by the fallback: ProviderThrottled is raised so the caller can retry
+    later instead of persisting a stand-in score.
     
     Args:
         transcript: The transcribed text to evaluate
+        question: Question being answered (None when unknown)
+        backend: Evaluator backend name (defaults to settings.EVALUATOR_BACKEND)
     
     Returns:
         Tuple of (score: int, feedback: str)
@@ -58,58 +279,151 @@ def evaluate_text(transcript: str) -> Tuple[int, str]:
         - feedback: Two-line feedback string
     
     Raises:
-        Exception: If evaluation fails
+        ProviderThrottled: If the backend is rate limited (within the evaluation timeout)
+        Exception: If evaluation fails and there is no fallback
     """
-    try:
-        # Initialize Gemini model
-        model = genai.GenerativeModel('gemini-pro')
-        
-        # Create evaluation prompt
-        prompt = f"""Evaluate the following interview answer and provide:
-1. A score from 1 to 10 (where 10 is excellent)
-2. Two lines of constructive feedback
+    context = question_context(question)
+    screened = prescreen(transcript, context)
+    if screened is not None:
+        return screened
+    return _evaluate_single(transcript, context, get_routed_evaluator(backend))
 
-Answer to evaluate:
-"{transcript}"
 
-Please respond in this exact format:
-SCORE: [number from 1-10]
-FEEDBACK: [two lines of feedback, each on a new line]"""
-        
-        # Generate response
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
-        
-        # Parse response
-        score = 5  # Default score
-        feedback = "No specific feedback available."
-        
-        # Extract score
-        if "SCORE:" in response_text:
-            score_line = [line for line in response_text.split("\n") if "SCORE:" in line.upper()][0]
-            try:
-                score = int(score_line.split(":")[-1].strip())
-                # Ensure score is between 1 and 10
-                score = max(1, min(10, score))
-            except (ValueError, IndexError):
-                pass
-        
-        # Extract feedback
-        if "FEEDBACK:" in response_text:
-            feedback_lines = response_text.split("FEEDBACK:")[-1].strip().split("\n")
-            feedback = "\n".join(feedback_lines[:2])  # Take first 2 lines
-            if not feedback.strip():
-                feedback = "No specific feedback available."
-        else:
-            # Try to extract feedback from response
-            lines = response_text.split("\n")
-            feedback_lines = [line.strip() for line in lines if line.strip() and "SCORE:" not in line.upper()]
-            if feedback_lines:
-                feedback = "\n".join(feedback_lines[:2])
+def _evaluate_single(
+    transcript: str,
+    context: Optional[QuestionContext],
+    evaluator: EvaluatorBackend
+) -> Tuple[int, str]:
+    cache_key = evaluation_cache_key_for(transcript, context, evaluator)
+    cached = get_cached_evaluation(cache_key)
+    if cached is not None:
+        return cached
+    
+    def compute() -> Tuple[int, str]:
+        try:
+            score, feedback = _with_timeout(evaluator.evaluate, transcript, context)
+        except Exception as e:
+            return fallback_evaluator(evaluator, e).evaluate(transcript, context)
         
+        store_evaluation(cache_key, evaluator, score, feedback)
         return score, feedback
+    
+    # Concurrent evaluations of the same answer share one backend call
+    return single_flight(f"evaluation:{cache_key}", compute, lambda: get_cached_evaluation(cache_key))
+
+
+def evaluate_texts_batch(
+    transcripts: List[str],
+    questions: Optional[List[Optional[Question]]] = None,
+    backend: Optional[str] = None
+) -> List[Tuple[int, str]]:
+    """
+    Evaluate several transcripts with one backend request per batch
+    
+    The whole batch is pre-screened first, so trivial answers never reach
+    the backend. Cached answers are answered locally and identical answers are evaluated
+    once; the rest are sent to the backend's batch API (for Gemini, a single
+    prompt returning a JSON array). Answers to the same question are batched
+    together so the question and rubric are sent once per batch. Any answer
+    whose result is missing or malformed is re-evaluated on its own.
+    
+    Args:
+        transcripts: Transcribed answers (may belong to different candidates)
+        questions: Question per transcript (None entries when unknown)
+        backend: Evaluator backend name (defaults to settings.EVALUATOR_BACKEND)
+    
+    Returns:
+        List of (score, feedback) tuples in the same order as transcripts
+    
+    Raises:
+        ProviderThrottled: If the backend is rate limited (within the evaluation timeout)
+        Exception: If evaluation fails and there is no fallback
+    """
+    contexts = [question_context(question) for question in questions or [None] * len(transcripts)]
+    
+    evaluator = get_routed_evaluator(backend)
+    results: List[Optional[Tuple[int, str]]] = prescreen_batch(transcripts, contexts)
+    screened = {index for index, result in enumerate(results) if result is not None}
+    cache_keys = [
+        evaluation_cache_key_for(transcript, context, evaluator)
+        for transcript, context in zip(transcripts, contexts)
+    ]
+    misses = []
+    duplicates = {}  # index -> index of the identical answer that is evaluated instead
+    first_index = {}
+    for index, cache_key in enumerate(cache_keys):
+        if index in screened:
+            continue
+        if cache_key in first_index:
+            duplicates[index] = first_index[cache_key]
+            continue
+        first_index[cache_key] = index
+        results[index] = get_cached_evaluation(cache_key)
+        if results[index] is None:
+            misses.append(index)
+    # Stable sort: answers to the same question end up in the same batches
+    misses.sort(key=lambda index: (contexts[index] is None, contexts[index] and contexts[index].text))
+    
+    batch_size = max(1, settings.EVALUATION_BATCH_SIZE)
+    for start in range(0, len(misses), batch_size):
+        chunk = misses[start:start + batch_size]
+        if len(chunk) == 1:
+            continue  # Single answers go through the regular path below
         
-    except Exception as e:
-        # Return default values on error
-        return 5, f"Evaluation error: {str(e)}"
+        try:
+            parsed = _with_timeout(
+                evaluator.evaluate_batch,
+                [transcripts[index] for index in chunk],
+                [contexts[index] for index in chunk]
+            )
+        except ProviderThrottled:
+            # Splitting into single requests would only add to the provider's load;
+            # batches that did get through are cached, so a retry only re-sends the rest
+            raise
+        except Exception:
+            logger.exception("Batch evaluation request failed, falling back to single evaluations")
+            continue
+        
+        for offset, (score, feedback) in parsed.items():
+            index = chunk[offset]
+            results[index] = (score, feedback)
+            store_evaluation(cache_keys[index], evaluator, score, feedback)
+    
+    # Fall back to one request per answer for anything the batch did not cover
+    for index, result in enumerate(results):
+        if result is None and index not in duplicates:
+            results[index] = _evaluate_single(transcripts[index], contexts[index], evaluator)
+    
+    for index, original in duplicates.items():
+        results[index] = results[original]
+    
+    return results
+
 
+def _with_timeout(func, *args):
+    """
+    Run func with EVALUATION_TIMEOUT_SECONDS as the deadline
+    
+    Provider calls made by func stop queueing in the rate limiter at the
+    deadline (raising ProviderThrottled), so nothing is sent after the caller
+    has given up. A call the provider is still answering at the deadline
+    keeps running in the pool, but its result is ignored so the caller can
+    fall back straight away.
+    
+    Raises:
+        TimeoutError: If func did not finish in time
+    """
+    if settings.EVALUATION_TIMEOUT_SECONDS <= 0:
+        return func(*args)
+    deadline = time.monotonic() + settings.EVALUATION_TIMEOUT_SECONDS
+    
+    def run():
+        with provider_deadline(deadline):
+            return func(*args)
+    
+    future = _evaluation_executor.submit(run)
+    try:
+        return future.result(timeout=settings.EVALUATION_TIMEOUT_SECONDS + TIMEOUT_GRACE_SECONDS)
+    except FutureTimeoutError:
+        future.cancel()  # Still waiting for an executor thread: never start it
+        raise
@@ -0,0 +1,108 @@
+"""
+Answer service for persisting candidate answers
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.answer import Answer
+from app.services.stats_service import record_answer_change, record_answer_change_async, score_change
+
+
+def upsert_answer(
+    db: Session,
+    candidate_id: str,
+    question_id: str,
+    transcript: Optional[str],
+    score: Optional[int],
+    feedback: Optional[str]
+) -> Answer:
+    """
+    Create or update the answer for a candidate/question pair
+    
+    The candidate's stats and the interview rollup are adjusted in the same
+    transaction.
+    
+    Args:
+        db: Database session
+        candidate_id: Candidate ID
+        question_id: Question ID
+        transcript: Transcribed answer
+        score: AI evaluation score (1-10)
+        feedback: AI feedback
+    
+    Returns:
+        The saved Answer (committed and refreshed)
+    """
+    # Check if answer already exists (update) or create new; the row lock keeps
+    # concurrent re-saves from applying the same old score twice to the stats
+    answer = db.query(Answer).filter(
+        Answer.candidate_id == candidate_id,
+        Answer.question_id == question_id
+    ).with_for_update().first()
+    
+    if answer:
+        # Update existing answer
+        answer_delta = 0
+        scored_delta, score_delta = score_change(answer.score, score)
+        answer.transcript = transcript
+        answer.score = score
+        answer.feedback = feedback
+    else:
+        # Create new answer
+        answer_delta = 1
+        scored_delta, score_delta = score_change(None, score)
+        answer = Answer(
+            candidate_id=candidate_id,
+            question_id=question_id,
+            transcript=transcript,
+            score=score,
+            feedback=feedback
+        )
+        db.add(answer)
+    
+    record_answer_change(db, candidate_id, answer_delta, scored_delta, score_delta, datetime.utcnow())
+    db.commit()
+    db.refresh(answer)
+    return answer
+
+
+async def upsert_answer_async(
+    db: AsyncSession,
+    candidate_id,
+    question_id,
+    transcript: Optional[str],
+    score: Optional[int],
+    feedback: Optional[str]
+) -> Answer:
+    """Async variant of upsert_answer"""
+    answer = await db.scalar(
+        select(Answer).where(
+            Answer.candidate_id == candidate_id,
+            Answer.question_id == question_id
+        ).with_for_update()
+    )
+    
+    if answer:
+        answer_delta = 0
+        scored_delta, score_delta = score_change(answer.score, score)
+        answer.transcript = transcript
+        answer.score = score
+        answer.feedback = feedback
+    else:
+        answer_delta = 1
+        scored_delta, score_delta = score_change(None, score)
+        answer = Answer(
+            candidate_id=candidate_id,
+            question_id=question_id,
+            transcript=transcript,
+            score=score,
+            feedback=feedback
+        )
+        db.add(answer)
+    
+    await record_answer_change_async(db, candidate_id, answer_delta, scored_delta, score_delta, datetime.utcnow())
+    await db.commit()
+    await db.refresh(answer)
+    return answer
@@ -0,0 +1,260 @@
+"""
+Async AI service: the ai_service pipeline with provider calls awaited on the event loop
+
+Provider requests use the async SDK clients, so a slow Whisper or Gemini call
+holds a coroutine rather than a threadpool thread. Short blocking steps
+(cache and database lookups, ffmpeg preprocessing) still run in the
+threadpool. The steps around the provider calls come from
+ai_pipeline_service, shared with ai_service, so caching, chunking, circuit
+breaking and fallbacks behave the same in both.
+"""
+import asyncio
+import io
+import logging
+import time
+from typing import BinaryIO, List, Optional, Set, Tuple, Union
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.models.question import Question
+from app.services.cache_service import (
+    get_cached_evaluation,
+    get_cached_transcription,
+    store_cached_transcription
+)
+from app.services.upload_service import hash_stream, stream_size
+from app.services.audio_service import encode_pcm
+from app.services.transcription_backends import TranscriptionBackend, get_transcription_backend
+from app.services.evaluator_backends import get_routed_evaluator
+from app.services.prompt_service import question_context
+from app.services.prescreen_service import prescreen
+from app.services.rate_limit_service import ProviderThrottled, provider_deadline
+from app.services.single_flight_service import single_flight_async
+from app.services.resilience_service import CircuitOpen, get_latency_tracker, hedged_call_async
+from app.services.ai_pipeline_service import (
+    TIMEOUT_GRACE_SECONDS,
+    SegmentTiming,
+    TranscriptionResult,
+    evaluation_cache_key_for,
+    fallback_evaluator,
+    join_segments,
+    preprocess_for_transcription,
+    recording_timing,
+    segment_timing,
+    select_transcription_backend,
+    store_evaluation,
+    transcription_segments
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def transcribe_audio_async(
+    audio: Union[bytes, BinaryIO],
+    audio_hash: Optional[str] = None,
+    filename: str = "audio.wav"
+) -> str:
+    """
+    Async variant of ai_service.transcribe_audio
+
+    Raises:
+        ProviderThrottled: If the provider's rate limit left no capacity in time
+        CircuitOpen: If the backend's circuit breaker is open and there is no fallback
+        Exception: If transcription fails
+    """
+    return (await transcribe_audio_detailed_async(audio, audio_hash, filename)).text
+
+
+async def transcribe_audio_detailed_async(
+    audio: Union[bytes, BinaryIO],
+    audio_hash: Optional[str] = None,
+    filename: str = "audio.wav"
+) -> TranscriptionResult:
+    """
+    Async variant of ai_service.transcribe_audio_detailed
+
+    Args:
+        audio: Audio file bytes or a seekable file handle (WAV, MP3, etc.)
+        audio_hash: SHA-256 hex digest of the audio, if already computed
+        filename: Filename sent to Whisper (it infers the format from the extension)
+
+    Returns:
+        TranscriptionResult
+
+    Raises:
+        ProviderThrottled: If the provider's rate limit left no capacity in time
+        CircuitOpen: If the backend's circuit breaker is open and there is no fallback
+        Exception: If transcription fails
+    """
+    backend = get_transcription_backend()
+
+    if isinstance(audio, (bytes, bytearray)):
+        audio = io.BytesIO(audio)
+    if audio_hash is None:
+        audio_hash = await run_in_threadpool(hash_stream, audio)
+
+    async def lookup() -> Optional[TranscriptionResult]:
+        cached = await run_in_threadpool(get_cached_transcription, audio_hash, backend.model)
+        return None if cached is None else TranscriptionResult(text=cached, cached=True)
+
+    result = await lookup()
+    if result is not None:
+        return result
+
+    return await single_flight_async(
+        f"transcription:{backend.model}:{audio_hash}",
+        lambda: _transcribe_uncached(backend, audio, audio_hash, filename),
+        lookup
+    )
+
+
+async def _transcribe_uncached(
+    backend: TranscriptionBackend,
+    audio: BinaryIO,
+    audio_hash: str,
+    filename: str
+) -> TranscriptionResult:
+    byte_size = stream_size(audio)
+    started = time.monotonic()
+
+    preprocessed = await run_in_threadpool(preprocess_for_transcription, audio)
+    if preprocessed is not None:
+        if preprocessed.is_silent:
+            await run_in_threadpool(store_cached_transcription, audio_hash, backend.model, "", byte_size)
+            return TranscriptionResult(text="", wall_seconds=time.monotonic() - started)
+        audio, filename = preprocessed.file, preprocessed.filename
+
+    try:
+        if preprocessed is not None and preprocessed.file is None:
+            transcript, segments, answered_by = await _transcribe_chunked(backend, preprocessed.samples)
+        else:
+            call_started = time.monotonic()
+            transcript, used = await call_transcription_backend_async(backend, audio, filename)
+            answered_by = {used.name}
+            segments = [recording_timing(preprocessed, call_started)]
+    except (ProviderThrottled, CircuitOpen):
+        raise
+    except Exception as e:
+        raise Exception(f"Whisper transcription failed: {str(e)}")
+
+    if answered_by == {backend.name}:
+        await run_in_threadpool(store_cached_transcription, audio_hash, backend.model, transcript, byte_size)
+
+    return TranscriptionResult(text=transcript, wall_seconds=time.monotonic() - started, segments=segments)
+
+
+async def _transcribe_chunked(backend, samples) -> Tuple[str, List[SegmentTiming], Set[str]]:
+    """Transcribe silence-aligned segments concurrently (at most TRANSCRIPTION_CHUNK_WORKERS at once)"""
+    bounds = transcription_segments(samples)
+    semaphore = asyncio.Semaphore(max(1, settings.TRANSCRIPTION_CHUNK_WORKERS))
+
+    async def run(start: int, end: int):
+        async with semaphore:
+            encoded = await run_in_threadpool(encode_pcm, samples[start:end])
+            call_started = time.monotonic()
+            text, used = await call_transcription_backend_async(
+                backend, io.BytesIO(encoded), f"segment.{settings.AUDIO_OUTPUT_FORMAT}"
+            )
+            return text, used.name, segment_timing(start, end, call_started)
+
+    # gather() keeps segment order
+    return join_segments(await asyncio.gather(*(run(start, end) for start, end in bounds)))
+
+
+async def call_transcription_backend_async(
+    backend: TranscriptionBackend,
+    audio: BinaryIO,
+    filename: str
+) -> Tuple[str, TranscriptionBackend]:
+    """
+    Transcribe through the backend's circuit breaker
+
+    Returns:
+        Tuple of (transcript, backend that produced it)
+
+    Raises:
+        CircuitOpen: If the breaker is open and there is no fallback backend
+    """
+    target, breaker = select_transcription_backend(backend)
+    if breaker is None:
+        return await target.transcribe_async(audio, filename), target
+
+    try:
+        transcript = await _hedged_transcribe(backend, audio, filename)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return transcript, backend
+
+
+async def _hedged_transcribe(backend: TranscriptionBackend, audio: BinaryIO, filename: str) -> str:
+    if not (settings.TRANSCRIPTION_HEDGING_ENABLED and backend.hedge):
+        return await backend.transcribe_async(audio, filename)
+    if stream_size(audio) > settings.TRANSCRIPTION_HEDGE_MAX_BYTES:
+        return await backend.transcribe_async(audio, filename)
+
+    data = audio.read()
+    return await hedged_call_async(
+        lambda: backend.transcribe_async(io.BytesIO(data), filename),
+        get_latency_tracker(backend.name)
+    )
+
+
+async def evaluate_text_async(
+    transcript: str,
+    question: Optional[Question] = None,
+    backend: Optional[str] = None
+) -> Tuple[int, str]:
+    """
+    Async variant of ai_service.evaluate_text
+
+    Args:
+        transcript: The transcribed text to evaluate
+        question: Question being answered (None when unknown)
+        backend: Evaluator backend name (defaults to settings.EVALUATOR_BACKEND)
+
+    Returns:
+        Tuple of (score: int, feedback: str)
+
+    Raises:
+        ProviderThrottled: If the backend is rate limited (within the evaluation timeout)
+        Exception: If evaluation fails and there is no fallback
+    """
+    context = question_context(question)
+    screened = prescreen(transcript, context)
+    if screened is not None:
+        return screened
+
+    evaluator = get_routed_evaluator(backend)
+    cache_key = evaluation_cache_key_for(transcript, context, evaluator)
+
+    async def lookup() -> Optional[Tuple[int, str]]:
+        return await run_in_threadpool(get_cached_evaluation, cache_key)
+
+    cached = await lookup()
+    if cached is not None:
+        return cached
+
+    async def compute() -> Tuple[int, str]:
+        try:
+            score, feedback = await _with_timeout(evaluator.evaluate_async(transcript, context))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return await fallback_evaluator(evaluator, e).evaluate_async(transcript, context)
+
+        await run_in_threadpool(store_evaluation, cache_key, evaluator, score, feedback)
+        return score, feedback
+
+    return await single_flight_async(f"evaluation:{cache_key}", compute, lookup)
+
+
+async def _with_timeout(awaitable):
+    """Await with EVALUATION_TIMEOUT_SECONDS as the deadline (see ai_service._with_timeout)"""
+    if settings.EVALUATION_TIMEOUT_SECONDS <= 0:
+        return await awaitable
+    # wait_for runs the awaitable as a task, which copies the deadline set here
+    with provider_deadline(time.monotonic() + settings.EVALUATION_TIMEOUT_SECONDS):
+        return await asyncio.wait_for(awaitable, settings.EVALUATION_TIMEOUT_SECONDS + TIMEOUT_GRACE_SECONDS)
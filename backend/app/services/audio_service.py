@@ -0,0 +1,368 @@
+"""
+Audio service for preprocessing recordings before transcription (requires ffmpeg)
+"""
+import asyncio
+import io
+import logging
+import shutil
+import subprocess
+import threading
+import wave
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Whisper works on 16 kHz mono internally, so anything richer is wasted upload
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # s16le
+FRAME_MS = 20
+
+# Copy ffmpeg stdin in 64 KiB chunks
+PIPE_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class PreprocessedAudio:
+    """Result of preprocessing an uploaded recording"""
+    file: Optional[BinaryIO]  # None when the recording is silent
+    filename: str
+    is_silent: bool
+    duration_seconds: float
+    input_bytes: int
+    output_bytes: int
+    samples: Optional[np.ndarray] = None  # trimmed 16 kHz mono PCM
+
+
+@lru_cache(maxsize=1)
+def ffmpeg_executable() -> Optional[str]:
+    """Resolve the ffmpeg binary, or None if it is not installed"""
+    return shutil.which(settings.FFMPEG_PATH)
+
+
+def decode_to_pcm(audio: BinaryIO) -> np.ndarray:
+    """
+    Decode any ffmpeg-readable audio to 16 kHz mono signed 16-bit samples
+    
+    Args:
+        audio: Readable stream positioned at the start of the recording
+    
+    Returns:
+        int16 numpy array of samples
+    """
+    pcm = _run_ffmpeg(
+        ["-i", "pipe:0", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "pipe:1"],
+        audio
+    )
+    return np.frombuffer(pcm, dtype=np.int16)
+
+
+def encode_pcm(samples: np.ndarray) -> bytes:
+    """Encode 16 kHz mono samples with the configured compact codec"""
+    return _run_ffmpeg(
+        [
+            "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "pipe:0",
+            "-c:a", settings.AUDIO_OUTPUT_CODEC,
+            "-b:a", settings.AUDIO_OUTPUT_BITRATE,
+            "-f", settings.AUDIO_OUTPUT_FORMAT, "pipe:1"
+        ],
+        io.BytesIO(samples.astype(np.int16).tobytes())
+    )
+
+
+def encode_wav(samples: np.ndarray) -> bytes:
+    """Wrap 16 kHz mono samples in a WAV container (works without ffmpeg)"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.astype(np.int16).tobytes())
+    return buffer.getvalue()
+
+
+def frame_levels_dbfs(samples: np.ndarray) -> np.ndarray:
+    """RMS level of each FRAME_MS frame in dBFS (vectorized)"""
+    frame_size = SAMPLE_RATE * FRAME_MS // 1000
+    frame_count = len(samples) // frame_size
+    if frame_count == 0:
+        return np.empty(0)
+    
+    frames = samples[:frame_count * frame_size].astype(np.float32).reshape(frame_count, frame_size)
+    rms = np.sqrt(np.mean(np.square(frames / 32768.0), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def voiced_bounds(samples: np.ndarray) -> Optional[Tuple[int, int]]:
+    """
+    Find the sample range between the first and last voiced frames, padded
+    by AUDIO_SILENCE_PADDING_MS on each side
+    
+    Returns:
+        (start, end) sample offsets, or None if no frame is above the threshold
+    """
+    levels = frame_levels_dbfs(samples)
+    voiced = np.flatnonzero(levels > settings.AUDIO_SILENCE_THRESHOLD_DBFS)
+    if voiced.size == 0:
+        return None
+    
+    frame_size = SAMPLE_RATE * FRAME_MS // 1000
+    padding = SAMPLE_RATE * settings.AUDIO_SILENCE_PADDING_MS // 1000
+    start = max(0, int(voiced[0]) * frame_size - padding)
+    end = min(len(samples), (int(voiced[-1]) + 1) * frame_size + padding)
+    return start, end
+
+
+def find_pause(levels: np.ndarray, start_frame: int, pause_frames: int) -> Optional[int]:
+    """
+    Find the first pause of at least pause_frames silent frames at or after start_frame
+    
+    Returns:
+        Frame index in the middle of the pause, or None if there is none yet
+    """
+    silent = (levels[start_frame:] <= settings.AUDIO_SILENCE_THRESHOLD_DBFS).astype(np.int32)
+    if pause_frames <= 0 or len(silent) < pause_frames:
+        return None
+    runs = np.convolve(silent, np.ones(pause_frames, dtype=np.int32), mode="valid")
+    pauses = np.flatnonzero(runs == pause_frames)
+    if pauses.size == 0:
+        return None
+    return start_frame + int(pauses[0]) + pause_frames // 2
+
+
+def split_at_silence(
+    samples: np.ndarray,
+    target_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float
+) -> List[Tuple[int, int]]:
+    """
+    Split a recording into roughly target_seconds long segments
+    
+    Each cut is placed at the quietest frame within search_seconds of the
+    target boundary, so words are rarely split, and every segment after the
+    first starts overlap_seconds before the previous cut so a word straddling
+    the boundary still appears whole in one of them.
+    
+    Returns:
+        List of (start, end) sample offsets
+    """
+    frame_size = SAMPLE_RATE * FRAME_MS // 1000
+    levels = frame_levels_dbfs(samples)
+    target_frames = max(1, int(target_seconds * 1000 / FRAME_MS))
+    search_frames = min(int(search_seconds * 1000 / FRAME_MS), target_frames // 2)
+    overlap = int(overlap_seconds * SAMPLE_RATE)
+    
+    cuts = []
+    position = 0
+    while len(levels) - position > target_frames + search_frames:
+        low = position + target_frames - search_frames
+        high = position + target_frames + search_frames
+        quietest = low + int(np.argmin(levels[low:high]))
+        cuts.append(quietest * frame_size)
+        position = quietest
+    
+    segments = []
+    start = 0
+    for cut in cuts:
+        segments.append((start, cut))
+        start = max(0, cut - overlap)
+    segments.append((start, len(samples)))
+    return segments
+
+
+def preprocess_audio(audio: BinaryIO, encode_max_seconds: Optional[float] = None) -> PreprocessedAudio:
+    """
+    Decode, downmix to mono, resample to 16 kHz, trim leading/trailing
+    silence and re-encode with AUDIO_OUTPUT_CODEC
+    
+    Args:
+        audio: Seekable stream positioned at the start of the recording
+        encode_max_seconds: Skip re-encoding trimmed recordings longer than
+            this (the caller will encode segments of `samples` itself)
+    
+    Returns:
+        PreprocessedAudio; file is None when the recording is entirely silent
+        or was not re-encoded
+    
+    Raises:
+        RuntimeError: If ffmpeg is missing or fails
+    """
+    start_position = audio.tell()
+    input_bytes = audio.seek(0, 2) - start_position
+    audio.seek(start_position)
+    
+    samples = decode_to_pcm(audio)
+    bounds = voiced_bounds(samples)
+    if bounds is None:
+        return PreprocessedAudio(
+            file=None,
+            filename="",
+            is_silent=True,
+            duration_seconds=0.0,
+            input_bytes=input_bytes,
+            output_bytes=0
+        )
+    
+    trimmed = samples[bounds[0]:bounds[1]]
+    duration_seconds = len(trimmed) / SAMPLE_RATE
+    if encode_max_seconds is not None and duration_seconds > encode_max_seconds:
+        encoded = None
+    else:
+        encoded = encode_pcm(trimmed)
+    
+    logger.info(
+        "Preprocessed audio: %s -> %s bytes, %.1fs -> %.1fs",
+        input_bytes, len(encoded) if encoded is not None else "(not encoded)",
+        len(samples) / SAMPLE_RATE, duration_seconds
+    )
+    return PreprocessedAudio(
+        file=io.BytesIO(encoded) if encoded is not None else None,
+        filename=f"audio.{settings.AUDIO_OUTPUT_FORMAT}",
+        is_silent=False,
+        duration_seconds=duration_seconds,
+        input_bytes=input_bytes,
+        output_bytes=len(encoded) if encoded is not None else 0,
+        samples=trimmed
+    )
+
+
+def _run_ffmpeg(args, input_stream: BinaryIO) -> bytes:
+    """Run ffmpeg, streaming input_stream to stdin from a feeder thread, and return stdout"""
+    executable = ffmpeg_executable()
+    if executable is None:
+        raise RuntimeError(f"ffmpeg not found ({settings.FFMPEG_PATH})")
+    
+    process = subprocess.Popen(
+        [executable, "-hide_banner", "-loglevel", "error", "-nostdin", *args],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    
+    def feed():
+        try:
+            for chunk in iter(lambda: input_stream.read(PIPE_CHUNK_SIZE), b""):
+                process.stdin.write(chunk)
+        except (BrokenPipeError, ValueError):
+            pass  # ffmpeg exited early; its stderr explains why
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+    
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    stderr_reader = _StreamReader(process.stderr)
+    output = process.stdout.read()
+    feeder.join()
+    process.wait()
+    
+    if process.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr_reader.result().decode(errors='replace').strip()}")
+    return output
+
+
+class _StreamReader:
+    """Drain a pipe on a background thread so ffmpeg never blocks on a full stderr"""
+    
+    def __init__(self, pipe):
+        self._chunks = []
+        self._thread = threading.Thread(target=self._run, args=(pipe,), daemon=True)
+        self._thread.start()
+    
+    def _run(self, pipe):
+        for chunk in iter(lambda: pipe.read(PIPE_CHUNK_SIZE), b""):
+            self._chunks.append(chunk)
+    
+    def result(self) -> bytes:
+        self._thread.join()
+        return b"".join(self._chunks)
+
+
+class StreamingDecoder:
+    """
+    Decode audio to 16 kHz mono samples while it is still arriving
+    
+    Container streams (MediaRecorder WebM/Opus, Ogg, ...) are piped through
+    one long-running ffmpeg process per stream; raw s16le 16 kHz mono input
+    ("pcm") is passed through without ffmpeg.
+    """
+    
+    def __init__(self, input_format: str = "webm"):
+        self.raw = input_format == "pcm"
+        self._pcm = bytearray()
+        self._process = None
+        self._readers = []
+        self._stderr = bytearray()
+    
+    async def start(self) -> None:
+        """
+        Raises:
+            RuntimeError: If the input needs ffmpeg and it is not installed
+        """
+        if self.raw:
+            return
+        executable = ffmpeg_executable()
+        if executable is None:
+            raise RuntimeError(f"ffmpeg not found ({settings.FFMPEG_PATH})")
+        self._process = await asyncio.create_subprocess_exec(
+            executable, "-hide_banner", "-loglevel", "error", "-nostdin",
+            "-i", "pipe:0", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        self._readers = [
+            asyncio.create_task(self._drain(self._process.stdout, self._pcm)),
+            asyncio.create_task(self._drain(self._process.stderr, self._stderr))
+        ]
+    
+    async def write(self, chunk: bytes) -> None:
+        """Feed the next piece of the stream"""
+        if self.raw:
+            self._pcm.extend(chunk)
+            return
+        self._process.stdin.write(chunk)
+        await self._process.stdin.drain()
+    
+    def read(self) -> np.ndarray:
+        """Take the samples decoded so far"""
+        usable = len(self._pcm) - len(self._pcm) % SAMPLE_WIDTH
+        samples = np.frombuffer(bytes(self._pcm[:usable]), dtype=np.int16)
+        del self._pcm[:usable]
+        return samples
+    
+    async def close(self) -> np.ndarray:
+        """
+        End the stream and return the remaining samples
+        
+        Raises:
+            RuntimeError: If ffmpeg could not decode the stream
+        """
+        if not self.raw:
+            self._process.stdin.close()
+            await asyncio.gather(*self._readers)
+            await self._process.wait()
+            if self._process.returncode != 0:
+                raise RuntimeError(f"ffmpeg failed: {self._stderr.decode(errors='replace').strip()}")
+        return self.read()
+    
+    def abort(self) -> None:
+        """Stop decoding without waiting for the remaining samples"""
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+        for reader in self._readers:
+            reader.cancel()
+    
+    @staticmethod
+    async def _drain(pipe: asyncio.StreamReader, target: bytearray) -> None:
+        while True:
+            chunk = await pipe.read(PIPE_CHUNK_SIZE)
+            if not chunk:
+                return
+            target.extend(chunk)
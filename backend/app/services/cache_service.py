@@ -0,0 +1,285 @@
+"""
+Cache service for AI results: bounded in-process LRU in front of a database table
+"""
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from sqlalchemy.exc import IntegrityError
+from app.config import settings
+from app.database import SessionLocal
+from app.models.evaluation_cache import EvaluationCacheEntry
+from app.models.transcription_cache import TranscriptionCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with a fixed number of entries"""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheCounters:
+    """Hit/miss counters for a two-tier cache"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.stores = 0
+    
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+    
+    def snapshot(self, cache: LRUCache) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.db_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_ratio": (self.memory_hits + self.db_hits) / lookups if lookups else None,
+                "memory_entries": len(cache),
+                "memory_max_entries": cache.max_size
+            }
+
+
+_evaluation_lru = LRUCache(settings.EVALUATION_CACHE_SIZE)
+_evaluation_counters = CacheCounters()
+
+_transcription_lru = LRUCache(settings.TRANSCRIPTION_CACHE_SIZE)
+_transcription_counters = CacheCounters()
+
+_report_lru = LRUCache(settings.REPORT_CACHE_SIZE)
+_report_counters = CacheCounters()
+
+
+def normalize_transcript(transcript: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so trivially different transcripts share a key"""
+    return re.sub(r"\s+", " ", (transcript or "").strip().lower())
+
+
+def evaluation_cache_key(
+    transcript: Optional[str],
+    question_text: Optional[str],
+    model: str,
+    prompt_version: str,
+    rubric: Optional[str] = None
+) -> str:
+    """SHA-256 over everything that can change an evaluation result"""
+    material = "\x1f".join([
+        normalize_transcript(transcript),
+        (question_text or "").strip(),
+        model,
+        prompt_version,
+        (rubric or "").strip()
+    ])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def get_cached_evaluation(cache_key: str) -> Optional[Tuple[int, str]]:
+    """
+    Look up an evaluation in the in-process LRU, then the evaluation_cache table
+    
+    Database hits are promoted into the LRU. Database errors are logged and
+    treated as a miss so a cache outage never blocks evaluation.
+    """
+    cached = _evaluation_lru.get(cache_key)
+    if cached is not None:
+        _evaluation_counters.incr("memory_hits")
+        return cached
+    
+    db = SessionLocal()
+    try:
+        entry = db.query(EvaluationCacheEntry).filter(
+            EvaluationCacheEntry.cache_key == cache_key
+        ).first()
+    except Exception:
+        logger.exception("Evaluation cache lookup failed")
+        entry = None
+    finally:
+        db.close()
+    
+    if entry is None:
+        _evaluation_counters.incr("misses")
+        return None
+    
+    result = (entry.score, entry.feedback)
+    _evaluation_lru.set(cache_key, result)
+    _evaluation_counters.incr("db_hits")
+    return result
+
+
+def store_cached_evaluation(cache_key: str, model: str, prompt_version: str, score: int, feedback: str) -> None:
+    """Write an evaluation to both cache tiers"""
+    _evaluation_lru.set(cache_key, (score, feedback))
+    _evaluation_counters.incr("stores")
+    
+    db = SessionLocal()
+    try:
+        db.add(EvaluationCacheEntry(
+            cache_key=cache_key,
+            model=model,
+            prompt_version=prompt_version,
+            score=score,
+            feedback=feedback
+        ))
+        db.commit()
+    except IntegrityError:
+        # Another worker stored the same key first
+        db.rollback()
+    except Exception:
+        db.rollback()
+        logger.exception("Evaluation cache store failed")
+    finally:
+        db.close()
+
+
+def invalidate_evaluation_cache(all_versions: bool = False) -> int:
+    """
+    Drop cached evaluations after the prompt template changes
+    
+    Args:
+        all_versions: Delete every entry instead of only those produced by
+            prompt versions other than EVALUATION_PROMPT_VERSION
+    
+    Returns:
+        Number of database rows deleted
+    """
+    _evaluation_lru.clear()
+    
+    db = SessionLocal()
+    try:
+        query = db.query(EvaluationCacheEntry)
+        if not all_versions:
+            query = query.filter(EvaluationCacheEntry.prompt_version != settings.EVALUATION_PROMPT_VERSION)
+        deleted = query.delete(synchronize_session=False)
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+def get_evaluation_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the evaluation cache in this process"""
+    return _evaluation_counters.snapshot(_evaluation_lru)
+
+
+def get_cached_transcription(audio_hash: str, model: str) -> Optional[str]:
+    """
+    Look up a transcript by audio hash in the in-process LRU, then the transcription_cache table
+    
+    Database hits are promoted into the LRU. Database errors are logged and
+    treated as a miss.
+    """
+    cached = _transcription_lru.get((audio_hash, model))
+    if cached is not None:
+        _transcription_counters.incr("memory_hits")
+        return cached
+    
+    db = SessionLocal()
+    try:
+        entry = db.query(TranscriptionCacheEntry).filter(
+            TranscriptionCacheEntry.audio_hash == audio_hash,
+            TranscriptionCacheEntry.model == model
+        ).first()
+    except Exception:
+        logger.exception("Transcription cache lookup failed")
+        entry = None
+    finally:
+        db.close()
+    
+    if entry is None:
+        _transcription_counters.incr("misses")
+        return None
+    
+    _transcription_lru.set((audio_hash, model), entry.transcript)
+    _transcription_counters.incr("db_hits")
+    return entry.transcript
+
+
+def store_cached_transcription(audio_hash: str, model: str, transcript: str, byte_size: Optional[int] = None) -> None:
+    """Write a transcript to both cache tiers"""
+    _transcription_lru.set((audio_hash, model), transcript)
+    _transcription_counters.incr("stores")
+    
+    db = SessionLocal()
+    try:
+        db.add(TranscriptionCacheEntry(
+            audio_hash=audio_hash,
+            model=model,
+            transcript=transcript,
+            byte_size=byte_size
+        ))
+        db.commit()
+    except IntegrityError:
+        # A concurrent retry stored the same audio first
+        db.rollback()
+    except Exception:
+        db.rollback()
+        logger.exception("Transcription cache store failed")
+    finally:
+        db.close()
+
+
+def get_transcription_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the transcription cache in this process"""
+    return _transcription_counters.snapshot(_transcription_lru)
+
+
+def get_cached_report(candidate_id: str, version: Hashable) -> Optional[bytes]:
+    """
+    Look up a candidate's serialized report in the in-process LRU
+    
+    Only an entry stored for the same version is returned; anything older
+    is a miss and gets replaced by the next store.
+    """
+    cached = _report_lru.get(str(candidate_id))
+    if cached is not None and cached[0] == version:
+        _report_counters.incr("memory_hits")
+        return cached[1]
+    _report_counters.incr("misses")
+    return None
+
+
+def store_cached_report(candidate_id: str, version: Hashable, payload: bytes) -> None:
+    """Keep a candidate's serialized report for the given version"""
+    _report_lru.set(str(candidate_id), (version, payload))
+    _report_counters.incr("stores")
+
+
+def get_report_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for the report cache in this process"""
+    return _report_counters.snapshot(_report_lru)
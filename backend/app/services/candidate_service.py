@@ -1,13 +1,15 @@
 """
 Candidate service for business logic related to candidates
 """
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.candidate import Candidate
 from app.models.candidate_auth import CandidateAuth
 from app.models.interview_link import InterviewLink
 from app.models.interview import Interview
 from app.services.auth_service import get_password_hash, verify_password
-from app.services.interview_service import get_interview_by_link_code
+from app.services.interview_service import get_interview_by_link_code, get_interview_by_link_code_async
 
 
 def register_candidate(
@@ -90,3 +92,34 @@ def get_candidate_by_id(db: Session, candidate_id: str) -> Candidate:
     """Get candidate by ID"""
     return db.query(Candidate).filter(Candidate.id == candidate_id).first()
 
+
+async def register_candidate_async(
+    db: AsyncSession,
+    name: str,
+    email: str,
+    link_code: str
+) -> tuple[Candidate, Interview]:
+    """
+    Async variant of register_candidate
+    
+    Raises:
+        ValueError: If link code is invalid
+    """
+    interview = await get_interview_by_link_code_async(db, link_code)
+    if not interview:
+        raise ValueError("Invalid interview link")
+    
+    candidate = Candidate(
+        interview_id=interview.id,
+        name=name,
+        email=email
+    )
+    db.add(candidate)
+    await db.commit()
+    
+    return candidate, interview
+
+
+async def get_candidate_by_id_async(db: AsyncSession, candidate_id) -> Optional[Candidate]:
+    """Get candidate by ID"""
+    return await db.get(Candidate, candidate_id)
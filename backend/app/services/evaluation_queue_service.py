@@ -0,0 +1,307 @@
+"""
+Evaluation job queue: durable jobs table drained by a pool of worker threads
+"""
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from collections import defaultdict
+from typing import Dict, List, Optional
+from sqlalchemy import or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import SessionLocal
+from app.models.evaluation_job import (
+    EvaluationJob,
+    JOB_STATUS_PENDING,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_COMPLETED,
+    JOB_STATUS_FAILED
+)
+from app.models.question import Question
+from app.models.candidate import Candidate
+from app.models.interview import Interview
+from app.services.ai_service import evaluate_texts_batch
+from app.services.rate_limit_service import ProviderThrottled
+from app.services.answer_service import upsert_answer
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (JOB_STATUS_COMPLETED, JOB_STATUS_FAILED)
+
+_stop_event = threading.Event()
+_worker_threads: List[threading.Thread] = []
+
+
+def enqueue_evaluation_job(
+    db: Session,
+    candidate_id: str,
+    transcript: str,
+    question_id: Optional[str] = None
+) -> EvaluationJob:
+    """
+    Insert a pending evaluation job
+    
+    Args:
+        db: Database session
+        candidate_id: Candidate who owns the answer
+        transcript: Transcribed text to evaluate
+        question_id: Optional question ID; when set the result is written
+            through to the candidate's Answer for that question
+    
+    Returns:
+        The persisted EvaluationJob
+    """
+    job = EvaluationJob(
+        candidate_id=candidate_id,
+        question_id=question_id,
+        transcript=transcript,
+        status=JOB_STATUS_PENDING
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+async def enqueue_evaluation_job_async(
+    db: AsyncSession,
+    candidate_id,
+    transcript: str,
+    question_id=None
+) -> EvaluationJob:
+    """Async variant of enqueue_evaluation_job"""
+    job = EvaluationJob(
+        candidate_id=candidate_id,
+        question_id=question_id,
+        transcript=transcript,
+        status=JOB_STATUS_PENDING
+    )
+    db.add(job)
+    await db.commit()
+    return job
+
+
+def get_evaluation_job(db: Session, job_id) -> Optional[EvaluationJob]:
+    """Get evaluation job by ID"""
+    return db.query(EvaluationJob).filter(EvaluationJob.id == job_id).first()
+
+
+async def wait_for_evaluation_job(db: Session, job_id, timeout: float) -> Optional[EvaluationJob]:
+    """
+    Wait until the job reaches a terminal state or the timeout elapses
+    
+    Sleeps on the event loop between polls so a waiting client does not
+    hold a threadpool thread; only the individual lookups run in the pool.
+    
+    Returns:
+        The job in its latest state, or None if it does not exist
+    """
+    deadline = time.monotonic() + max(0.0, timeout)
+    while True:
+        job = await run_in_threadpool(_reload_job, db, job_id)
+        if job is None or job.status in TERMINAL_STATUSES:
+            return job
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return job
+        
+        await asyncio.sleep(min(remaining, settings.EVALUATION_JOB_POLL_INTERVAL_SECONDS))
+
+
+def claim_next_jobs(db: Session, limit: int = 1) -> List[EvaluationJob]:
+    """
+    Atomically claim up to `limit` of the oldest runnable jobs
+    
+    Runnable jobs are pending ones whose throttle backoff (run_after) has
+    passed, plus running ones whose worker has gone quiet for longer than
+    EVALUATION_JOB_STALE_SECONDS. Rows locked by other workers are skipped
+    so concurrent workers never claim the same job.
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=settings.EVALUATION_JOB_STALE_SECONDS)
+    jobs = (
+        db.query(EvaluationJob)
+        .filter(or_(
+            and_(
+                EvaluationJob.status == JOB_STATUS_PENDING,
+                or_(EvaluationJob.run_after.is_(None), EvaluationJob.run_after <= now)
+            ),
+            and_(
+                EvaluationJob.status == JOB_STATUS_RUNNING,
+                EvaluationJob.started_at < stale_before
+            )
+        ))
+        .order_by(EvaluationJob.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not jobs:
+        db.rollback()
+        return []
+    
+    for job in jobs:
+        job.status = JOB_STATUS_RUNNING
+        job.started_at = now
+        job.attempts = (job.attempts or 0) + 1
+    db.commit()
+    return jobs
+
+
+def process_jobs(db: Session, jobs: List[EvaluationJob]) -> List[EvaluationJob]:
+    """
+    Evaluate claimed jobs in batches and write results through to their Answers
+    
+    Jobs are grouped by their interview's evaluator backend so each group
+    can share one batched request. Jobs that fail go back to pending until
+    EVALUATION_JOB_MAX_ATTEMPTS is reached, after which they are marked failed.
+    """
+    question_ids = {job.question_id for job in jobs if job.question_id is not None}
+    questions = {}
+    if question_ids:
+        questions = {
+            question.id: question
+            for question in db.query(Question).filter(Question.id.in_(question_ids)).all()
+        }
+    
+    candidate_backends = dict(
+        db.query(Candidate.id, Interview.evaluator_backend)
+        .join(Interview, Candidate.interview_id == Interview.id)
+        .filter(Candidate.id.in_({job.candidate_id for job in jobs}))
+        .all()
+    )
+    groups: Dict[Optional[str], List[EvaluationJob]] = defaultdict(list)
+    for job in jobs:
+        groups[candidate_backends.get(job.candidate_id)].append(job)
+    
+    for backend, group in groups.items():
+        try:
+            results = evaluate_texts_batch(
+                [job.transcript for job in group],
+                [questions.get(job.question_id) for job in group],
+                backend=backend
+            )
+        except Exception as e:
+            logger.exception("Evaluation of %s jobs failed", len(group))
+            for job in group:
+                _fail_job(db, job, e)
+            continue
+        
+        for job, (score, feedback) in zip(group, results):
+            try:
+                _complete_job(db, job, score, feedback)
+            except Exception as e:
+                db.rollback()
+                logger.exception("Saving evaluation job %s failed (attempt %s)", job.id, job.attempts)
+                _fail_job(db, job, e)
+    
+    return jobs
+
+
+def _complete_job(db: Session, job: EvaluationJob, score: int, feedback: str) -> None:
+    if job.question_id is not None:
+        upsert_answer(
+            db,
+            candidate_id=job.candidate_id,
+            question_id=job.question_id,
+            transcript=job.transcript,
+            score=score,
+            feedback=feedback
+        )
+    
+    job.score = score
+    job.feedback = feedback
+    job.error = None
+    job.status = JOB_STATUS_COMPLETED
+    job.completed_at = datetime.utcnow()
+    db.commit()
+
+
+def _fail_job(db: Session, job: EvaluationJob, error: Exception) -> None:
+    job.error = str(error)
+    if isinstance(error, ProviderThrottled):
+        # Rate limiting is not the job's fault: no attempt is used up, but the job
+        # backs off so workers do not spin re-claiming it while the provider is saturated
+        job.attempts -= 1
+        job.throttles = (job.throttles or 0) + 1
+        if job.throttles >= settings.EVALUATION_JOB_MAX_THROTTLES:
+            job.status = JOB_STATUS_FAILED
+            job.completed_at = datetime.utcnow()
+        else:
+            job.status = JOB_STATUS_PENDING
+            job.run_after = datetime.utcnow() + timedelta(seconds=throttle_backoff(job.throttles, error.retry_after))
+    elif job.attempts >= settings.EVALUATION_JOB_MAX_ATTEMPTS:
+        job.status = JOB_STATUS_FAILED
+        job.completed_at = datetime.utcnow()
+    else:
+        job.status = JOB_STATUS_PENDING
+    db.commit()
+
+
+def throttle_backoff(throttles: int, retry_after: float = 0.0) -> float:
+    """
+    Seconds a job waits before being re-claimed after its Nth consecutive throttle
+    
+    Exponential from EVALUATION_JOB_THROTTLE_BACKOFF_SECONDS, never shorter than
+    the provider's retry-after, capped at EVALUATION_JOB_THROTTLE_BACKOFF_MAX_SECONDS.
+    """
+    backoff = settings.EVALUATION_JOB_THROTTLE_BACKOFF_SECONDS * 2 ** max(0, throttles - 1)
+    return min(max(backoff, retry_after or 0.0), settings.EVALUATION_JOB_THROTTLE_BACKOFF_MAX_SECONDS)
+
+
+def run_worker(stop_event: threading.Event) -> None:
+    """Worker loop: claim and process jobs until stop_event is set"""
+    while not stop_event.is_set():
+        db = SessionLocal()
+        try:
+            jobs = claim_next_jobs(db, settings.EVALUATION_BATCH_SIZE)
+            if jobs:
+                process_jobs(db, jobs)
+                continue
+        except Exception:
+            db.rollback()
+            logger.exception("Evaluation worker error")
+        finally:
+            db.close()
+        
+        # Queue is empty (or the database hiccupped); back off before polling again
+        stop_event.wait(settings.EVALUATION_JOB_POLL_INTERVAL_SECONDS)
+
+
+def start_evaluation_workers(count: Optional[int] = None) -> None:
+    """Start the in-process worker pool (no-op if already running)"""
+    if _worker_threads:
+        return
+    
+    count = settings.EVALUATION_WORKERS if count is None else count
+    _stop_event.clear()
+    for index in range(count):
+        thread = threading.Thread(
+            target=run_worker,
+            args=(_stop_event,),
+            name=f"evaluation-worker-{index}",
+            daemon=True
+        )
+        thread.start()
+        _worker_threads.append(thread)
+    
+    if count:
+        logger.info("Started %s evaluation workers", count)
+
+
+def stop_evaluation_workers(timeout: float = 5.0) -> None:
+    """Signal workers to stop and wait for them to exit"""
+    _stop_event.set()
+    for thread in _worker_threads:
+        thread.join(timeout)
+    _worker_threads.clear()
+
+
+def _reload_job(db: Session, job_id) -> Optional[EvaluationJob]:
+    db.expire_all()
+    return get_evaluation_job(db, job_id)
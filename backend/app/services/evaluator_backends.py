@@ -0,0 +1,594 @@
+"""
+Evaluator backends: Gemini or a local rule-based heuristic evaluator
+"""
+import json
+import logging
+import math
+import re
+import statistics
+import threading
+import time
+from collections import deque
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.services.ai_client_service import generate_content, generate_content_async
+from app.services.rate_limit_service import ProviderThrottled, call_provider, call_provider_async
+from app.services.prompt_service import (
+    QuestionContext,
+    build_evaluation_prompt,
+    build_batch_evaluation_prompt,
+    record_usage
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Assessment:
+    """One scored answer, with what a router needs to judge the score"""
+    score: int
+    feedback: str
+    # Model's self-reported certainty, 1-10 (None when it did not say)
+    confidence: Optional[int] = None
+    # False when the response had no usable score and a default was used
+    parsed: bool = True
+
+
+class EvaluatorBackend(ABC):
+    """Answer scorer used by ai_service.evaluate_text"""
+    
+    name: str = ""
+    
+    @property
+    @abstractmethod
+    def model(self) -> str:
+        """Identifier of the model producing scores (part of the evaluation cache key)"""
+    
+    @abstractmethod
+    def evaluate(self, transcript: str, question: Optional[QuestionContext] = None) -> Tuple[int, str]:
+        """
+        Score one answer
+        
+        Args:
+            transcript: The answer text
+            question: Question and compiled rubric, if known
+        
+        Returns:
+            Tuple of (score 1-10, two-line feedback)
+        
+        Raises:
+            Exception: If the backend cannot produce a result
+        """
+    
+    async def evaluate_async(self, transcript: str, question: Optional[QuestionContext] = None) -> Tuple[int, str]:
+        """
+        Async variant of evaluate
+        
+        The default runs evaluate in the threadpool; backends with a native
+        async client override it so waiting does not hold a thread.
+        """
+        return await run_in_threadpool(self.evaluate, transcript, question)
+    
+    def evaluate_batch(
+        self,
+        transcripts: List[str],
+        questions: List[Optional[QuestionContext]]
+    ) -> Dict[int, Tuple[int, str]]:
+        """
+        Score several answers; returns results keyed by position
+        
+        Positions missing from the result are re-evaluated one at a time by
+        the caller. The default implementation simply loops.
+        """
+        return {
+            index: self.evaluate(transcript, question)
+            for index, (transcript, question) in enumerate(zip(transcripts, questions))
+        }
+    
+    def assess(self, transcript: str, question: Optional[QuestionContext] = None) -> Assessment:
+        """Score one answer, with confidence when the backend reports it"""
+        return Assessment(*self.evaluate(transcript, question))
+    
+    async def assess_async(self, transcript: str, question: Optional[QuestionContext] = None) -> Assessment:
+        """Async variant of assess"""
+        return Assessment(*await self.evaluate_async(transcript, question))
+    
+    def assess_batch(
+        self,
+        transcripts: List[str],
+        questions: List[Optional[QuestionContext]]
+    ) -> Dict[int, Assessment]:
+        """Batch variant of assess (same contract as evaluate_batch)"""
+        return {
+            index: Assessment(score, feedback)
+            for index, (score, feedback) in self.evaluate_batch(transcripts, questions).items()
+        }
+
+
+class GeminiEvaluator(EvaluatorBackend):
+    """Gemini LLM evaluation"""
+    
+    name = "gemini"
+    
+    def __init__(self, model_name: Optional[str] = None):
+        # None follows settings.GEMINI_MODEL
+        self._model_name = model_name
+    
+    @property
+    def model(self) -> str:
+        return self._model_name or settings.GEMINI_MODEL
+    
+    def evaluate(self, transcript: str, question: Optional[QuestionContext] = None) -> Tuple[int, str]:
+        assessment = self.assess(transcript, question)
+        return assessment.score, assessment.feedback
+    
+    async def evaluate_async(self, transcript: str, question: Optional[QuestionContext] = None) -> Tuple[int, str]:
+        assessment = await self.assess_async(transcript, question)
+        return assessment.score, assessment.feedback
+    
+    def evaluate_batch(
+        self,
+        transcripts: List[str],
+        questions: List[Optional[QuestionContext]]
+    ) -> Dict[int, Tuple[int, str]]:
+        return {
+            index: (assessment.score, assessment.feedback)
+            for index, assessment in self.assess_batch(transcripts, questions).items()
+        }
+    
+    def assess(self, transcript: str, question: Optional[QuestionContext] = None) -> Assessment:
+        prompt = build_evaluation_prompt(transcript, question)
+        # Generate response on the shared model handle
+        response = call_provider(
+            "gemini",
+            generate_content,
+            prompt.text,
+            model_name=self.model,
+            generation_config=prompt.generation_config
+        )
+        record_usage(self.model, prompt, response)
+        return parse_assessment(response.text.strip())
+    
+    async def assess_async(self, transcript: str, question: Optional[QuestionContext] = None) -> Assessment:
+        prompt = build_evaluation_prompt(transcript, question)
+        response = await call_provider_async(
+            "gemini",
+            generate_content_async,
+            prompt.text,
+            model_name=self.model,
+            generation_config=prompt.generation_config
+        )
+        record_usage(self.model, prompt, response)
+        return parse_assessment(response.text.strip())
+    
+    def assess_batch(
+        self,
+        transcripts: List[str],
+        questions: List[Optional[QuestionContext]]
+    ) -> Dict[int, Assessment]:
+        """Send one batch prompt and return the results that parsed cleanly"""
+        if len(transcripts) == 1:
+            return {0: self.assess(transcripts[0], questions[0])}
+        
+        prompt = build_batch_evaluation_prompt(transcripts, questions)
+        response = call_provider(
+            "gemini",
+            generate_content,
+            prompt.text,
+            model_name=self.model,
+            generation_config=prompt.generation_config
+        )
+        record_usage(self.model, prompt, response)
+        response_text = response.text.strip()
+        
+        # Gemini sometimes wraps JSON in a markdown code fence
+        if response_text.startswith("```"):
+            response_text = response_text.strip("`")
+            if response_text.lower().startswith("json"):
+                response_text = response_text[4:]
+        
+        items = json.loads(response_text)
+        if not isinstance(items, list):
+            raise ValueError("Batch evaluation response is not a JSON array")
+        
+        parsed: Dict[int, Assessment] = {}
+        for item in items:
+            try:
+                offset = int(item["answer"]) - 1
+                score = _scaled_value(item["score"])
+                feedback = "\n".join(str(item["feedback"]).strip().split("\n")[:2])
+                confidence = _clamp_confidence(_scaled_value(item.get("confidence")))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+            # Unreadable scores are left out, so only that answer is re-evaluated on its own
+            if score is not None and 0 <= offset < len(transcripts) and feedback.strip():
+                parsed[offset] = Assessment(_clamp_score(score), feedback, confidence)
+        
+        return parsed
+
+
+# Words ignored when measuring keyword coverage
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could describe did do does explain for from had has have how
+i if in is it its me my of on or our please should so tell than that the their them then there
+these they this to us was we were what when where which while who why will with would you your
+""".split())
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+class HeuristicEvaluator(EvaluatorBackend):
+    """
+    Deterministic, network-free scoring from answer length and coverage of
+    the question's keywords; used as a degraded mode and for load tests
+    """
+    
+    name = "heuristic"
+    
+    @property
+    def model(self) -> str:
+        return "heuristic-v1"
+    
+    def evaluate(self, transcript: str, question: Optional[QuestionContext] = None) -> Tuple[int, str]:
+        words = WORD_PATTERN.findall((transcript or "").lower())
+        
+        if len(words) < settings.HEURISTIC_MIN_WORDS:
+            return 1, (
+                "No substantive answer was detected.\n"
+                "Try to answer the question fully in your own words."
+            )
+        
+        # Length: ramps up to 1.0 at HEURISTIC_TARGET_WORDS
+        length_factor = min(1.0, len(words) / settings.HEURISTIC_TARGET_WORDS)
+        
+        keywords = {
+            word for word in WORD_PATTERN.findall((question.text if question else "").lower())
+            if len(word) > 2 and word not in STOPWORDS
+        }
+        if keywords:
+            covered = keywords & set(words)
+            coverage = len(covered) / len(keywords)
+            quality = 0.5 * length_factor + 0.5 * coverage
+        else:
+            coverage = None
+            quality = length_factor
+        
+        score = max(1, min(10, 1 + round(9 * quality)))
+        
+        if length_factor < 1.0:
+            first_line = "The answer is brief; expand on your reasoning with concrete examples."
+        else:
+            first_line = "The answer has a good level of detail."
+        if coverage is None:
+            second_line = "Automated scoring: the answer was rated on length only."
+        elif coverage < 0.5:
+            second_line = "Address the key points the question asks about more directly."
+        else:
+            second_line = "The answer addresses the main points of the question."
+        
+        return score, f"{first_line}\n{second_line}"
+    
+    async def evaluate_async(self, transcript: str, question: Optional[QuestionContext] = None) -> Tuple[int, str]:
+        # Pure CPU work measured in microseconds; not worth a thread hop
+        return self.evaluate(transcript, question)
+
+
+# Why an answer was re-scored by the primary model
+ESCALATION_REASONS = ("borderline", "low_confidence", "unparsed", "error")
+
+
+def escalation_reason(assessment: Assessment) -> Optional[str]:
+    """Why a fast-model assessment should be re-scored (None = accept it)"""
+    if not assessment.parsed:
+        return "unparsed"
+    if settings.EVALUATION_ESCALATE_SCORE_MIN <= assessment.score <= settings.EVALUATION_ESCALATE_SCORE_MAX:
+        return "borderline"
+    if assessment.confidence is None or assessment.confidence < settings.EVALUATION_ESCALATE_MIN_CONFIDENCE:
+        return "low_confidence"
+    return None
+
+
+class EscalatingEvaluator(EvaluatorBackend):
+    """
+    Cheap-model-first routing: every answer is scored by the fast model and
+    only borderline, unparseable, low-confidence or failed results are
+    re-scored by the primary model
+    """
+    
+    def __init__(self, fast: EvaluatorBackend, primary: EvaluatorBackend):
+        self.fast = fast
+        self.primary = primary
+        self.name = primary.name
+        self._lock = threading.Lock()
+        self.answers = 0
+        self.escalations = {reason: 0 for reason in ESCALATION_REASONS}
+        # Recent single-answer latencies as (seconds, escalated)
+        self._latencies = deque(maxlen=1000)
+    
+    @property
+    def model(self) -> str:
+        # Routed results are not the primary model's, so they get their own cache key
+        return f"{self.fast.model}>{self.primary.model}"
+    
+    def evaluate(self, transcript: str, question: Optional[QuestionContext] = None) -> Tuple[int, str]:
+        started = time.monotonic()
+        try:
+            assessment = self.fast.assess(transcript, question)
+            reason = escalation_reason(assessment)
+        except ProviderThrottled:
+            raise
+        except Exception as e:
+            logger.warning("%s evaluation failed (%r), escalating to %s", self.fast.model, e, self.primary.model)
+            reason = "error"
+        
+        # Counted even if the primary fails: the answer was still escalated
+        try:
+            if reason is not None:
+                assessment = self.primary.assess(transcript, question)
+        finally:
+            self._record(reason, time.monotonic() - started)
+        return assessment.score, assessment.feedback
+    
+    async def evaluate_async(self, transcript: str, question: Optional[QuestionContext] = None) -> Tuple[int, str]:
+        started = time.monotonic()
+        try:
+            assessment = await self.fast.assess_async(transcript, question)
+            reason = escalation_reason(assessment)
+        except ProviderThrottled:
+            raise
+        except Exception as e:
+            logger.warning("%s evaluation failed (%r), escalating to %s", self.fast.model, e, self.primary.model)
+            reason = "error"
+        
+        # Counted even if the primary fails: the answer was still escalated
+        try:
+            if reason is not None:
+                assessment = await self.primary.assess_async(transcript, question)
+        finally:
+            self._record(reason, time.monotonic() - started)
+        return assessment.score, assessment.feedback
+    
+    def evaluate_batch(
+        self,
+        transcripts: List[str],
+        questions: List[Optional[QuestionContext]]
+    ) -> Dict[int, Tuple[int, str]]:
+        """Score the batch with the fast model, then re-score the escalated answers in one primary batch"""
+        try:
+            first_pass = self.fast.assess_batch(transcripts, questions)
+            missing_reason = "unparsed"
+        except ProviderThrottled:
+            raise
+        except Exception as e:
+            logger.warning("%s batch evaluation failed (%r), escalating to %s", self.fast.model, e, self.primary.model)
+            first_pass, missing_reason = {}, "error"
+        
+        results: Dict[int, Tuple[int, str]] = {}
+        escalate = []
+        for index in range(len(transcripts)):
+            assessment = first_pass.get(index)
+            reason = missing_reason if assessment is None else escalation_reason(assessment)
+            self._record(reason)
+            if reason is None:
+                results[index] = (assessment.score, assessment.feedback)
+            else:
+                escalate.append(index)
+        
+        if escalate:
+            try:
+                second_pass = self.primary.assess_batch(
+                    [transcripts[index] for index in escalate],
+                    [questions[index] for index in escalate]
+                )
+            except ProviderThrottled:
+                raise
+            except Exception:
+                # Keep the accepted fast results; the caller re-scores the rest one at a time
+                logger.exception("Escalated batch evaluation failed")
+                second_pass = {}
+            for offset, assessment in second_pass.items():
+                results[escalate[offset]] = (assessment.score, assessment.feedback)
+        
+        return results
+    
+    def _record(self, reason: Optional[str], seconds: Optional[float] = None) -> None:
+        with self._lock:
+            self.answers += 1
+            if reason is not None:
+                self.escalations[reason] += 1
+            if seconds is not None:
+                self._latencies.append((seconds, reason is not None))
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            answers = self.answers
+            escalations = dict(self.escalations)
+            latencies = list(self._latencies)
+        
+        def median(samples: List[float]) -> Optional[float]:
+            return statistics.median(samples) if samples else None
+        
+        escalated = sum(escalations.values())
+        return {
+            "fast_model": self.fast.model,
+            "primary_model": self.primary.model,
+            "answers": answers,
+            "escalated": escalated,
+            "escalation_rate": escalated / answers if answers else 0.0,
+            "reasons": escalations,
+            "p50_seconds": median([seconds for seconds, _ in latencies]),
+            "fast_p50_seconds": median([seconds for seconds, was_escalated in latencies if not was_escalated]),
+            "escalated_p50_seconds": median([seconds for seconds, was_escalated in latencies if was_escalated])
+        }
+
+
+BACKENDS = {
+    GeminiEvaluator.name: GeminiEvaluator,
+    HeuristicEvaluator.name: HeuristicEvaluator
+}
+
+_instances: Dict[str, EvaluatorBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def get_evaluator_backend(name: Optional[str] = None) -> EvaluatorBackend:
+    """
+    Get the (shared) evaluator backend instance
+    
+    Args:
+        name: Backend name; defaults to settings.EVALUATOR_BACKEND
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = name or settings.EVALUATOR_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown evaluator backend: {name}")
+    
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
+
+
+_routers: Dict[str, EscalatingEvaluator] = {}
+
+
+def get_routed_evaluator(name: Optional[str] = None) -> EvaluatorBackend:
+    """
+    Get the evaluator to score answers with: the backend itself, or for Gemini
+    an EscalatingEvaluator when EVALUATION_FAST_MODEL is set
+    
+    Args:
+        name: Backend name; defaults to settings.EVALUATOR_BACKEND
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    primary = get_evaluator_backend(name)
+    fast_model = settings.EVALUATION_FAST_MODEL
+    if primary.name != GeminiEvaluator.name or not fast_model or fast_model == primary.model:
+        return primary
+    
+    key = f"{primary.model}>{fast_model}"
+    with _instances_lock:
+        if key not in _routers:
+            _routers[key] = EscalatingEvaluator(GeminiEvaluator(fast_model), primary)
+        return _routers[key]
+
+
+def get_routing_stats() -> dict:
+    """
+    Get escalation counters and latency medians for cheap-model-first routing
+    
+    Returns:
+        Dictionary with the configured thresholds and per-route counters
+    """
+    with _instances_lock:
+        routers = list(_routers.values())
+    return {
+        "fast_model": settings.EVALUATION_FAST_MODEL,
+        "escalate_score_min": settings.EVALUATION_ESCALATE_SCORE_MIN,
+        "escalate_score_max": settings.EVALUATION_ESCALATE_SCORE_MAX,
+        "escalate_min_confidence": settings.EVALUATION_ESCALATE_MIN_CONFIDENCE,
+        "routes": {router.model: router.snapshot() for router in routers}
+    }
+
+
+# A number, optionally out of a scale: "8", "7.5", "8/10", "4 / 5"
+_SCALED_VALUE = r"(\d+(?:\.\d+)?)(?:\s*/\s*(\d+(?:\.\d+)?))?"
+
+# "LABEL: value" in a response, case-insensitive; the label may be
+# markdown-bold ("**Score:** 8")
+_LABELLED_VALUE = r"\b{label}[*_\s]*:[*_\s]*" + _SCALED_VALUE
+
+# Score used when the response has none we can read
+DEFAULT_SCORE = 5
+
+
+def parse_evaluation(response_text: str) -> Tuple[int, str]:
+    """Parse a SCORE:/FEEDBACK: formatted LLM response"""
+    assessment = parse_assessment(response_text)
+    return assessment.score, assessment.feedback
+
+
+def parse_assessment(response_text: str) -> Assessment:
+    """
+    Parse a SCORE:/CONFIDENCE:/FEEDBACK: formatted LLM response
+    
+    Labels are matched case-insensitively and "8/10" style values are read
+    on their 10-point scale. Without a readable score DEFAULT_SCORE is used
+    and parsed is False.
+    """
+    score = _labelled_value(response_text, "SCORE")
+    return Assessment(
+        score=DEFAULT_SCORE if score is None else _clamp_score(score),
+        feedback=_parse_feedback(response_text),
+        confidence=_clamp_confidence(_labelled_value(response_text, "CONFIDENCE")),
+        parsed=score is not None
+    )
+
+
+def _labelled_value(response_text: str, label: str) -> Optional[int]:
+    """First value given for label, scaled to 10 when written as N/M; None if absent"""
+    match = re.search(_LABELLED_VALUE.format(label=label), response_text, re.IGNORECASE)
+    return None if match is None else _scaled_match(match)
+
+
+def _scaled_value(value) -> Optional[int]:
+    """A score or confidence from JSON (number or text such as "8/10") on the 10-point scale; None if unreadable"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return _round_half_up(value) if math.isfinite(value) else None
+    if not isinstance(value, str):
+        return None
+    match = re.fullmatch(r"\s*" + _SCALED_VALUE + r"\s*", value)
+    return None if match is None else _scaled_match(match)
+
+
+def _scaled_match(match: re.Match) -> Optional[int]:
+    value = float(match.group(1))
+    if match.group(2) is not None:
+        scale = float(match.group(2))
+        if scale <= 0:
+            return None
+        value = value * 10 / scale
+    return _round_half_up(value)
+
+
+def _round_half_up(value: float) -> int:
+    return math.floor(value + 0.5)
+
+
+def _clamp_score(score: int) -> int:
+    return max(1, min(10, score))
+
+
+def _parse_feedback(response_text: str) -> str:
+    feedback = "No specific feedback available."
+    parts = re.split(r"FEEDBACK[*_\s]*:[*_]*", response_text, maxsplit=1, flags=re.IGNORECASE)
+    if len(parts) == 2:
+        feedback_lines = parts[1].strip().split("\n")
+        feedback = "\n".join(feedback_lines[:2])  # Take first 2 lines
+        if not feedback.strip():
+            feedback = "No specific feedback available."
+    else:
+        # Try to extract feedback from response
+        lines = response_text.split("\n")
+        feedback_lines = [
+            line.strip() for line in lines
+            if line.strip() and not re.search(r"\b(SCORE|CONFIDENCE)[*_\s]*:", line, re.IGNORECASE)
+        ]
+        if feedback_lines:
+            feedback = "\n".join(feedback_lines[:2])
+    return feedback
+
+
+def _clamp_confidence(value) -> Optional[int]:
+    if value is None:
+        return None
+    return max(1, min(10, int(value)))
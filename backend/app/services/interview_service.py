@@ -3,6 +3,9 @@ Interview service for business logic related to interviews
 """
 import uuid
 import secrets
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.interview import Interview
 from app.models.question import Question
@@ -19,7 +22,8 @@ def generate_link_code() -> str:
 def create_interview_with_link(
     db: Session,
     title: str,
-    description: str = None
+    description: str = None,
+    evaluator_backend: str = None
 ) -> tuple[Interview, str]:  # Changed return type - no password
     """
     Create an interview and generate shareable link
@@ -28,12 +32,13 @@ def create_interview_with_link(
         db: Database session
         title: Interview title
         description: Interview description
+        evaluator_backend: Evaluator backend for this interview's answers
     
     Returns:
         Tuple of (Interview, link_code)
     """
     # Create interview
-    interview = Interview(title=title, description=description)
+    interview = Interview(title=title, description=description, evaluator_backend=evaluator_backend)
     db.add(interview)
     db.flush()  # Flush to get the interview ID
     
@@ -65,3 +70,21 @@ def get_interview_by_id(db: Session, interview_id: str) -> Interview:
     """Get interview by ID"""
     return db.query(Interview).filter(Interview.id == interview_id).first()
 
+
+async def get_interview_by_link_code_async(db: AsyncSession, link_code: str) -> Optional[Interview]:
+    """Get interview by link code (one query, for the async routes)"""
+    return await db.scalar(
+        select(Interview)
+        .join(InterviewLink, InterviewLink.interview_id == Interview.id)
+        .where(InterviewLink.link_code == link_code)
+    )
+
+
+async def get_interview_questions_async(db: AsyncSession, interview_id) -> List[Question]:
+    """Get an interview's questions in order"""
+    result = await db.scalars(
+        select(Question)
+        .where(Question.interview_id == interview_id)
+        .order_by(Question.created_at)
+    )
+    return list(result)
@@ -0,0 +1,81 @@
+"""
+Keyset (cursor) pagination for admin listings, newest first
+
+Pages are ordered by (created_at, id) descending and each page continues
+strictly after the last row of the previous one, so fetching page N costs
+the same as page 1 and rows inserted meanwhile never shift a page.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not produced by encode_cursor"""
+
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    """Opaque cursor pointing just past the given row"""
+    raw = json.dumps({"created_at": created_at.isoformat(), "id": str(row_id)})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["created_at"]), uuid.UUID(data["id"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursor("Invalid pagination cursor") from e
+
+
+def search_pattern(search: str) -> str:
+    """LIKE pattern matching search anywhere in a column (use with escape="\\")"""
+    escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def keyset_page(
+    query: Query,
+    created_at_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int
+) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page of query, newest first
+
+    Args:
+        query: Filtered query whose rows expose created_at and id
+        created_at_column: Column the rows are ordered by
+        id_column: Primary key column (tie-break)
+        cursor: next_cursor of the previous page, None for the first page
+        limit: Rows per page
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            created_at_column < created_at,
+            and_(created_at_column == created_at, id_column < row_id)
+        ))
+
+    # One extra row tells whether another page follows
+    rows = query.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
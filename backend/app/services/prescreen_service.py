@@ -0,0 +1,173 @@
+"""
+Local pre-screen for answers that do not need an LLM: empty, filler-only and
+clearly off-topic answers get deterministic scores without a network call
+
+Off-topic detection compares character trigram TF-IDF vectors of the answer
+and the question (plus its rubric key points). The trigrams are hashed into
+a fixed-size vector with numpy, so a whole batch is screened with a few
+array operations.
+"""
+import threading
+from typing import List, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.services.evaluator_backends import STOPWORDS, WORD_PATTERN
+from app.services.prompt_service import QuestionContext
+
+# Words that carry no answer content on their own
+FILLER_WORDS = frozenset("""
+um umm uh uhh er erm ah hmm mm mhm like well okay ok yeah yes no nope so basically actually
+skip pass next dunno idk sorry nothing know don't not sure really just think
+""".split())
+
+# Hashed trigram vector size; collisions only add a little noise to the similarity
+HASH_DIMENSIONS = 1 << 14
+
+EMPTY_RESULT = (1, "No answer was detected.\nTry to answer the question fully in your own words.")
+FILLER_RESULT = (1, "No substantive answer was detected.\nTry to answer the question fully in your own words.")
+OFF_TOPIC_RESULT = (
+    2,
+    "The answer does not appear to address the question.\n"
+    "Focus on what the question asks and explain it in your own words."
+)
+
+_counters_lock = threading.Lock()
+_counters = {"screened": 0, "empty": 0, "filler": 0, "off_topic": 0}
+
+
+def prescreen(transcript: str, question: Optional[QuestionContext] = None) -> Optional[Tuple[int, str]]:
+    """
+    Screen one answer
+
+    Returns:
+        (score, feedback) for a trivial answer, or None when it needs a real evaluation
+    """
+    return prescreen_batch([transcript], [question])[0]
+
+
+def prescreen_batch(
+    transcripts: List[str],
+    questions: List[Optional[QuestionContext]]
+) -> List[Optional[Tuple[int, str]]]:
+    """
+    Screen several answers at once
+
+    Args:
+        transcripts: Answer texts
+        questions: Question (and rubric) per answer, None when unknown
+
+    Returns:
+        Per answer: (score, feedback) when it is trivial, otherwise None
+    """
+    if not settings.PRESCREEN_ENABLED or not transcripts:
+        return [None] * len(transcripts)
+
+    word_lists = [WORD_PATTERN.findall((transcript or "").lower()) for transcript in transcripts]
+    content_words = [[word for word in words if word not in FILLER_WORDS and word not in STOPWORDS] for words in word_lists]
+    content_counts = np.array([len(words) for words in content_words])
+
+    similarities = _question_similarities(content_words, questions)
+
+    results: List[Optional[Tuple[int, str]]] = []
+    verdicts = []
+    for index, words in enumerate(word_lists):
+        if not words:
+            verdict, result = "empty", EMPTY_RESULT
+        elif content_counts[index] < settings.PRESCREEN_MIN_CONTENT_WORDS:
+            verdict, result = "filler", FILLER_RESULT
+        elif (
+            not np.isnan(similarities[index])
+            and similarities[index] < settings.PRESCREEN_MIN_SIMILARITY
+            and content_counts[index] <= settings.PRESCREEN_OFF_TOPIC_MAX_WORDS
+        ):
+            verdict, result = "off_topic", OFF_TOPIC_RESULT
+        else:
+            verdict, result = None, None
+        verdicts.append(verdict)
+        results.append(result)
+
+    with _counters_lock:
+        _counters["screened"] += len(transcripts)
+        for verdict in verdicts:
+            if verdict is not None:
+                _counters[verdict] += 1
+    return results
+
+
+def _question_similarities(
+    content_words: List[List[str]],
+    questions: List[Optional[QuestionContext]]
+) -> np.ndarray:
+    """Cosine similarity of each answer to its question (NaN when there is no question)"""
+    similarities = np.full(len(content_words), np.nan)
+    question_texts = [_question_terms(question) for question in questions]
+    indexes = [index for index, text in enumerate(question_texts) if text]
+    if not indexes:
+        return similarities
+
+    unique_questions = sorted({question_texts[index] for index in indexes})
+    row_of_question = {text: row for row, text in enumerate(unique_questions)}
+
+    answers = _trigram_counts([" ".join(content_words[index]) for index in indexes])
+    question_matrix = _trigram_counts(unique_questions)
+
+    # TF-IDF over the answers and questions in this batch (smoothed idf, sublinear tf)
+    documents = np.vstack([answers, question_matrix])
+    document_frequency = np.count_nonzero(documents, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    answers = _normalize(np.log1p(answers) * idf)
+    question_matrix = _normalize(np.log1p(question_matrix) * idf)
+
+    paired = question_matrix[[row_of_question[question_texts[index]] for index in indexes]]
+    similarities[indexes] = np.einsum("ij,ij->i", answers, paired)
+    return similarities
+
+
+def _question_terms(question: Optional[QuestionContext]) -> str:
+    """Question text plus rubric key points, reduced to content words"""
+    if question is None or not question.text:
+        return ""
+    text = question.text
+    if question.rubric:
+        # The scoring guide is the same for every question; only the key points are useful
+        text += " " + " ".join(line for line in question.rubric.splitlines() if not line.startswith("Scoring:"))
+    words = WORD_PATTERN.findall(text.lower())
+    return " ".join(word for word in words if word not in STOPWORDS and word not in FILLER_WORDS)
+
+
+def _trigram_counts(texts: List[str]) -> np.ndarray:
+    """Hashed character trigram counts, one row per text"""
+    matrix = np.zeros((len(texts), HASH_DIMENSIONS), dtype=np.float32)
+    for row, text in enumerate(texts):
+        # Doubled spaces keep trigrams within words (plus word start/end markers)
+        data = np.frombuffer(f" {text.replace(' ', '  ')} ".encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+        if len(data) < 3:
+            continue
+        # Three bytes form an exact 24-bit key; a multiplicative hash spreads it over the buckets
+        keys = (data[:-2] << np.uint64(16)) | (data[1:-1] << np.uint64(8)) | data[2:]
+        buckets = (keys * np.uint64(2654435761)) % np.uint64(HASH_DIMENSIONS)
+        matrix[row] = np.bincount(buckets.astype(np.int64), minlength=HASH_DIMENSIONS)
+    return matrix
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def get_prescreen_stats() -> dict:
+    """
+    Get pre-screen counters for this worker process
+
+    Returns:
+        Dictionary of answers screened and how many were scored locally, by reason
+    """
+    with _counters_lock:
+        counters = dict(_counters)
+    skipped = counters["empty"] + counters["filler"] + counters["off_topic"]
+    return {
+        "enabled": settings.PRESCREEN_ENABLED,
+        **counters,
+        "skipped_rate": skipped / counters["screened"] if counters["screened"] else 0.0
+    }
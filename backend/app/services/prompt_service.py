@@ -0,0 +1,279 @@
+"""
+Evaluation prompts: a stable instruction/question/rubric prefix followed by
+the answer, with answers trimmed to a token budget and token usage recorded
+"""
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+from app.config import settings
+from app.models.question import Question
+
+logger = logging.getLogger(__name__)
+
+# Static instructions come first and the answer last, so every prompt for the
+# same question shares a byte-identical prefix the provider can cache
+SINGLE_INSTRUCTIONS = """Evaluate the interview answer below and provide:
+1. A score from 1 to 10 (where 10 is excellent)
+2. Two lines of constructive feedback
+
+Please respond in this exact format:
+SCORE: [number from 1-10]
+CONFIDENCE: [number from 1-10, how certain you are of the score]
+FEEDBACK: [two lines of feedback, each on a new line]
+"""
+
+BATCH_INSTRUCTIONS = """Evaluate each of the interview answers below independently. For each answer provide:
+1. A score from 1 to 10 (where 10 is excellent)
+2. Two lines of constructive feedback
+
+Respond with only a JSON array containing one object per answer, in this exact format:
+[{"answer": 1, "score": 7, "confidence": 9, "feedback": "first line\\nsecond line"}]
+where confidence (1-10) is how certain you are of the score
+"""
+
+TRUNCATION_MARKER = " [... part of the answer omitted ...] "
+
+
+@dataclass(frozen=True)
+class QuestionContext:
+    """What an evaluator knows about the question being answered"""
+    text: str
+    rubric: Optional[str] = None
+
+
+def question_context(question: Optional[Question]) -> Optional[QuestionContext]:
+    """Build the evaluation context for a Question (None when there is no question)"""
+    if question is None:
+        return None
+    return QuestionContext(text=question.question_text, rubric=question.rubric)
+
+
+@dataclass
+class EvaluationPrompt:
+    """A prompt split into its reusable prefix and the per-call body"""
+    prefix: str
+    body: str
+    max_output_tokens: int
+    truncated_answers: int = 0
+
+    @property
+    def text(self) -> str:
+        return self.prefix + self.body
+
+    @property
+    def input_tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    @property
+    def generation_config(self) -> dict:
+        return {"max_output_tokens": self.max_output_tokens}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (EVALUATION_CHARS_PER_TOKEN characters per token)"""
+    return math.ceil(len(text or "") / settings.EVALUATION_CHARS_PER_TOKEN)
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Shorten text to about max_tokens, keeping its beginning and end
+
+    Answers usually state their point first and conclude last, so the middle
+    is what gets dropped. Whitespace runs (common in transcripts) are
+    collapsed first so they never take up the budget, and cuts fall on word
+    boundaries.
+    """
+    if max_tokens <= 0:
+        return text
+    text = " ".join(text.split())
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    budget = int(max_tokens * settings.EVALUATION_CHARS_PER_TOKEN) - len(TRUNCATION_MARKER)
+    head_chars = max(0, budget * 2 // 3)
+    tail_chars = max(0, budget - head_chars)
+
+    head = text[:head_chars]
+    if head and not head[-1].isspace() and not text[head_chars].isspace():
+        # A cut inside a word drops the partial word (all of it when it is the only one)
+        head = head.rsplit(" ", 1)[0] if " " in head else ""
+
+    tail_start = len(text) - tail_chars
+    tail = text[tail_start:] if tail_chars else ""
+    if tail and not tail[0].isspace() and not text[tail_start - 1].isspace():
+        tail = tail.split(" ", 1)[1] if " " in tail else ""
+
+    return head.rstrip() + TRUNCATION_MARKER + tail.lstrip()
+
+
+def _was_cut(transcript: str, answer: str) -> bool:
+    """Whether fit_to_budget dropped part of transcript (collapsing whitespace does not count)"""
+    return answer != transcript and answer != " ".join(transcript.split())
+
+
+def _question_section(question: Optional[QuestionContext], number: str = "") -> str:
+    if question is None or not question.text:
+        return ""
+    section = f"\nQUESTION{number}:\n\"{question.text}\"\n"
+    if question.rubric:
+        section += f"RUBRIC{number}:\n{question.rubric}\n"
+    return section
+
+
+@lru_cache(maxsize=1024)
+def _single_prefix(question: Optional[QuestionContext]) -> str:
+    # One string per question/rubric, so repeat evaluations reuse the identical prefix
+    return SINGLE_INSTRUCTIONS + _question_section(question)
+
+
+@lru_cache(maxsize=1024)
+def _batch_prefix(question: Optional[QuestionContext]) -> str:
+    return BATCH_INSTRUCTIONS + _question_section(question)
+
+
+def build_evaluation_prompt(transcript: str, question: Optional[QuestionContext] = None) -> EvaluationPrompt:
+    """
+    Build the prompt for scoring one answer
+
+    Args:
+        transcript: The answer text
+        question: Question and rubric being answered (the cacheable prefix)
+
+    Returns:
+        EvaluationPrompt
+    """
+    answer = fit_to_budget(transcript, settings.EVALUATION_MAX_ANSWER_TOKENS)
+    return EvaluationPrompt(
+        prefix=_single_prefix(question),
+        body=f"\nAnswer to evaluate:\n\"{answer}\"",
+        max_output_tokens=settings.EVALUATION_MAX_OUTPUT_TOKENS,
+        truncated_answers=int(_was_cut(transcript, answer))
+    )
+
+
+def build_batch_evaluation_prompt(
+    transcripts: List[str],
+    questions: List[Optional[QuestionContext]]
+) -> EvaluationPrompt:
+    """
+    Build the prompt for scoring several answers in one request
+
+    When every answer is to the same question, the question and rubric go
+    into the prefix once; otherwise each answer is preceded by its own.
+
+    Args:
+        transcripts: The answer texts
+        questions: Question and rubric for each answer (None when unknown)
+
+    Returns:
+        EvaluationPrompt whose output limit scales with the number of answers
+    """
+    shared = len(set(questions)) == 1
+    sections = []
+    truncated = 0
+    for index, (transcript, question) in enumerate(zip(transcripts, questions)):
+        answer = fit_to_budget(transcript, settings.EVALUATION_MAX_ANSWER_TOKENS)
+        truncated += int(_was_cut(transcript, answer))
+        context = "" if shared else _question_section(question, f" {index + 1}")
+        sections.append(f"{context}\nANSWER {index + 1}:\n\"{answer}\"\n")
+
+    return EvaluationPrompt(
+        prefix=_batch_prefix(questions[0] if shared else None),
+        body="".join(sections),
+        max_output_tokens=settings.EVALUATION_MAX_OUTPUT_TOKENS * len(transcripts),
+        truncated_answers=truncated
+    )
+
+
+class _TokenUsage:
+    """Thread-safe token counters for one model"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.input_tokens = 0
+        self.prefix_tokens = 0
+        self.output_tokens = 0
+        self.truncated_answers = 0
+
+    def add(self, input_tokens: int, prefix_tokens: int, output_tokens: int, truncated_answers: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.prefix_tokens += prefix_tokens
+            self.output_tokens += output_tokens
+            self.truncated_answers += truncated_answers
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls = self.calls
+            return {
+                "calls": calls,
+                "input_tokens": self.input_tokens,
+                "prefix_tokens": self.prefix_tokens,
+                "output_tokens": self.output_tokens,
+                "truncated_answers": self.truncated_answers,
+                "avg_input_tokens": self.input_tokens / calls if calls else 0.0,
+                "avg_output_tokens": self.output_tokens / calls if calls else 0.0
+            }
+
+
+_usage: Dict[str, _TokenUsage] = {}
+_usage_lock = threading.Lock()
+
+
+def _response_token_counts(prompt: EvaluationPrompt, response) -> tuple:
+    """
+    (input, output) token counts reported by the provider, estimated where it reports none
+
+    Newer Gemini responses carry usage_metadata; older ones only a token_count per candidate.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None and getattr(usage, "prompt_token_count", 0):
+        return usage.prompt_token_count, getattr(usage, "candidates_token_count", 0)
+
+    output_tokens = sum(getattr(candidate, "token_count", 0) or 0 for candidate in getattr(response, "candidates", []))
+    if not output_tokens:
+        try:
+            output_tokens = estimate_tokens(response.text)
+        except (AttributeError, ValueError):
+            output_tokens = 0
+    return prompt.input_tokens, output_tokens
+
+
+def record_usage(model: str, prompt: EvaluationPrompt, response) -> None:
+    """Record the token counts of one provider call"""
+    input_tokens, output_tokens = _response_token_counts(prompt, response)
+    prefix_tokens = estimate_tokens(prompt.prefix)
+
+    with _usage_lock:
+        if model not in _usage:
+            _usage[model] = _TokenUsage()
+        usage = _usage[model]
+    usage.add(input_tokens, prefix_tokens, output_tokens, prompt.truncated_answers)
+
+    logger.debug(
+        "%s evaluation call: %s input tokens (%s prefix), %s output tokens, %s answers truncated",
+        model, input_tokens, prefix_tokens, output_tokens, prompt.truncated_answers
+    )
+
+
+def get_token_usage_stats() -> dict:
+    """
+    Get evaluation token usage for this worker process
+
+    Returns:
+        Dictionary keyed by model, plus the configured budgets
+    """
+    with _usage_lock:
+        models = dict(_usage)
+    prefixes = _single_prefix.cache_info()
+    return {
+        "max_answer_tokens": settings.EVALUATION_MAX_ANSWER_TOKENS,
+        "max_output_tokens": settings.EVALUATION_MAX_OUTPUT_TOKENS,
+        "prefix_cache": {"hits": prefixes.hits, "misses": prefixes.misses, "size": prefixes.currsize},
+        "models": {model: usage.snapshot() for model, usage in sorted(models.items())}
+    }
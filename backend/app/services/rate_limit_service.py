@@ -0,0 +1,340 @@
+"""
+Per-provider rate limiting: a token bucket plus an adaptive (AIMD) concurrency
+window, with jittered backoff when the provider answers 429 or 503
+"""
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from app.config import settings
+
+T = TypeVar("T")
+
+# HTTP statuses that mean "slow down" rather than "this request is bad"
+THROTTLE_STATUSES = (429, 503)
+
+# How often async callers re-check for a free slot while queued
+ASYNC_POLL_SECONDS = 0.02
+
+# Absolute time.monotonic() by which the current caller needs its result (see provider_deadline)
+_caller_deadline: ContextVar[Optional[float]] = ContextVar("provider_caller_deadline", default=None)
+
+
+class ProviderThrottled(Exception):
+    """Raised when a provider call could not be made before its queue deadline"""
+
+    def __init__(self, provider: str, retry_after: float, message: Optional[str] = None):
+        super().__init__(message or f"{provider} is rate limited; retry in {retry_after:.0f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """Check whether a provider SDK exception is a 429/503 response"""
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        # google.api_core exceptions expose the HTTP status as `code`
+        status_code = getattr(error, "code", None)
+    return status_code in THROTTLE_STATUSES
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(0.0, float(headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+@contextmanager
+def provider_deadline(deadline: float):
+    """
+    Stop queueing and retrying provider calls made in this context at `deadline`
+
+    Used by callers with their own timeout, so a call still waiting for a slot
+    when the caller gives up raises ProviderThrottled instead of being made
+    later for nobody. Nested deadlines keep the earliest.
+    """
+    current = _caller_deadline.get()
+    token = _caller_deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _caller_deadline.reset(token)
+
+
+def _queue_deadline() -> float:
+    """PROVIDER_QUEUE_TIMEOUT_SECONDS from now, or the caller's deadline if that is sooner"""
+    deadline = time.monotonic() + settings.PROVIDER_QUEUE_TIMEOUT_SECONDS
+    caller_deadline = _caller_deadline.get()
+    return deadline if caller_deadline is None else min(deadline, caller_deadline)
+
+
+class ProviderLimiter:
+    """
+    Admission control for one provider
+
+    A call needs a free slot in the concurrency window and a token from the
+    bucket (refilled at requests_per_minute). The window grows by one slot
+    per window's worth of successful calls and halves on every throttled
+    response, so it settles just under the provider's real limit. Callers
+    queue until a slot is free, up to PROVIDER_QUEUE_TIMEOUT_SECONDS or the
+    caller's provider_deadline, whichever comes first.
+    """
+
+    def __init__(self, name: str, requests_per_minute: float, max_concurrency: int):
+        self.name = name
+        self.rate = requests_per_minute / 60.0
+        self.max_window = max(1, max_concurrency)
+        self.min_window = max(1, min(settings.PROVIDER_MIN_CONCURRENCY, self.max_window))
+        self.burst = float(self.max_window)
+
+        self._condition = threading.Condition()
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self.window = float(self.max_window)
+        self.in_flight = 0
+        self.queue_depth = 0
+
+        self.peak_queue_depth = 0
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run func under the limiter, retrying throttled responses with backoff
+
+        Raises:
+            ProviderThrottled: If no slot frees up (or retries are exhausted)
+                before the queue deadline
+            Exception: Any non-throttle error raised by func
+        """
+        deadline = _queue_deadline()
+        attempt = 0
+        while True:
+            self._acquire(deadline)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_throttle_error(e):
+                    self._release(succeeded=False)
+                    raise
+                self._release(succeeded=False, throttled=True)
+
+                delay = self._backoff_delay(attempt, _retry_after_seconds(e))
+                attempt += 1
+                if attempt > settings.PROVIDER_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                    raise ProviderThrottled(self.name, delay) from e
+                with self._condition:
+                    self.retries += 1
+                time.sleep(delay)
+                continue
+
+            self._release(succeeded=True)
+            return result
+
+    async def call_async(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """
+        Await func under the limiter (async twin of call; shares the same window and bucket)
+
+        Raises:
+            ProviderThrottled: If no slot frees up (or retries are exhausted)
+                before the queue deadline
+            Exception: Any non-throttle error raised by func
+        """
+        deadline = _queue_deadline()
+        attempt = 0
+        while True:
+            await self._acquire_async(deadline)
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                if not is_throttle_error(e):
+                    self._release(succeeded=False)
+                    raise
+                self._release(succeeded=False, throttled=True)
+
+                delay = self._backoff_delay(attempt, _retry_after_seconds(e))
+                attempt += 1
+                if attempt > settings.PROVIDER_MAX_RETRIES or time.monotonic() + delay >= deadline:
+                    raise ProviderThrottled(self.name, delay) from e
+                with self._condition:
+                    self.retries += 1
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (e.g. the client disconnected): give the slot back
+                self._release(succeeded=False)
+                raise
+
+            self._release(succeeded=True)
+            return result
+
+    def _acquire(self, deadline: float) -> None:
+        with self._condition:
+            self._enqueue()
+            started = time.monotonic()
+            try:
+                while True:
+                    wait = self._try_acquire(started, deadline)
+                    if wait is None:
+                        return
+                    self._condition.wait(wait)
+            finally:
+                self.queue_depth -= 1
+
+    async def _acquire_async(self, deadline: float) -> None:
+        with self._condition:
+            self._enqueue()
+        started = time.monotonic()
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_acquire(started, deadline)
+                if wait is None:
+                    return
+                # Releases notify threads, not the event loop, so re-check at a short interval
+                await asyncio.sleep(min(wait, ASYNC_POLL_SECONDS))
+        finally:
+            with self._condition:
+                self.queue_depth -= 1
+
+    def _enqueue(self) -> None:
+        self.queue_depth += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+
+    def _try_acquire(self, started: float, deadline: float) -> Optional[float]:
+        """
+        Take a slot and a token if both are available (caller holds the condition)
+
+        Returns:
+            None once acquired, otherwise how long to wait before trying again
+
+        Raises:
+            ProviderThrottled: If the deadline has passed
+        """
+        now = time.monotonic()
+        self._refill(now)
+        has_slot = self.in_flight < int(self.window)
+        if has_slot and self._tokens >= 1:
+            self._tokens -= 1
+            self.in_flight += 1
+            self.requests += 1
+            self.wait_seconds += now - started
+            return None
+
+        remaining = deadline - now
+        if remaining <= 0:
+            self.rejected += 1
+            raise ProviderThrottled(self.name, self._estimated_wait())
+
+        if has_slot and self.rate > 0:
+            # Only short of a token: sleep until the next one arrives
+            return min(remaining, (1 - self._tokens) / self.rate)
+        return remaining
+
+    def _release(self, succeeded: bool, throttled: bool = False) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.throttled += 1
+                self.window = max(float(self.min_window), self.window / 2)
+            elif succeeded:
+                self.window = min(float(self.max_window), self.window + 1 / self.window)
+            self._condition.notify_all()
+
+    def _refill(self, now: float) -> None:
+        if self.rate <= 0:
+            self._tokens = self.burst  # No request-rate cap, only the concurrency window
+        else:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _estimated_wait(self) -> float:
+        if self.rate <= 0:
+            return settings.PROVIDER_BACKOFF_BASE_SECONDS
+        return max(1.0, (self.queue_depth + 1) / self.rate)
+
+    @staticmethod
+    def _backoff_delay(attempt: int, retry_after: Optional[float]) -> float:
+        # "Full jitter": spread retries out so throttled callers do not return in lockstep
+        cap = min(settings.PROVIDER_BACKOFF_MAX_SECONDS, settings.PROVIDER_BACKOFF_BASE_SECONDS * 2 ** attempt)
+        delay = random.uniform(0, cap)
+        if retry_after is not None:
+            delay += retry_after
+        return delay
+
+    def snapshot(self) -> dict:
+        with self._condition:
+            self._refill(time.monotonic())
+            return {
+                "requests_per_minute": self.rate * 60,
+                "window": round(self.window, 2),
+                "max_window": self.max_window,
+                "in_flight": self.in_flight,
+                "tokens": round(self._tokens, 2),
+                "queue_depth": self.queue_depth,
+                "peak_queue_depth": self.peak_queue_depth,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "rejected": self.rejected,
+                "avg_wait_seconds": self.wait_seconds / self.requests if self.requests else 0.0
+            }
+
+
+def _provider_limits() -> Dict[str, tuple]:
+    return {
+        "openai": (settings.OPENAI_REQUESTS_PER_MINUTE, settings.OPENAI_MAX_CONCURRENCY),
+        "gemini": (settings.GEMINI_REQUESTS_PER_MINUTE, settings.GEMINI_MAX_CONCURRENCY)
+    }
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """
+    Get the shared limiter for a provider ("openai" or "gemini")
+
+    Raises:
+        ValueError: If the provider is unknown
+    """
+    limits = _provider_limits()
+    if provider not in limits:
+        raise ValueError(f"Unknown provider: {provider}")
+
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = ProviderLimiter(provider, *limits[provider])
+        return _limiters[provider]
+
+
+def call_provider(provider: str, func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a provider request through that provider's limiter"""
+    return get_limiter(provider).call(func, *args, **kwargs)
+
+
+async def call_provider_async(provider: str, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+    """Await a provider request through that provider's limiter"""
+    return await get_limiter(provider).call_async(func, *args, **kwargs)
+
+
+def get_limiter_stats() -> dict:
+    """
+    Get queue depth, window size and throttling counters per provider
+
+    Returns:
+        Dictionary keyed by provider name
+    """
+    return {provider: get_limiter(provider).snapshot() for provider in _provider_limits()}
@@ -0,0 +1,298 @@
+"""
+Tail-latency and failure handling for provider calls: hedged requests driven
+by observed latency percentiles, and per-backend circuit breakers
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, TimeoutError as FuturesTimeout, wait
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+from app.config import settings
+
+T = TypeVar("T")
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitOpen(Exception):
+    """Raised when a backend's circuit breaker is rejecting calls"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable (circuit open); retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class LatencyTracker:
+    """Sliding sample of successful call latencies plus hedging counters"""
+
+    def __init__(self, sample_size: int):
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=max(1, sample_size))
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def count_hedge(self, won: bool = False) -> None:
+        with self._lock:
+            if won:
+                self.hedge_wins += 1
+            else:
+                self.hedges += 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Latency at the given percentile, or None until HEDGE_MIN_SAMPLES calls were seen"""
+        with self._lock:
+            if len(self._samples) < max(1, settings.TRANSCRIPTION_HEDGE_MIN_SAMPLES):
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def hedge_delay(self) -> Optional[float]:
+        """How long to wait for the first attempt before sending a hedge (None = do not hedge)"""
+        delay = self.percentile(settings.TRANSCRIPTION_HEDGE_PERCENTILE)
+        if delay is None:
+            return None
+        return max(settings.TRANSCRIPTION_HEDGE_MIN_DELAY_SECONDS, delay)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = len(self._samples)
+            hedges, hedge_wins = self.hedges, self.hedge_wins
+        return {
+            "samples": samples,
+            "p50_seconds": self.percentile(50),
+            "p99_seconds": self.percentile(99),
+            "hedge_delay_seconds": self.hedge_delay(),
+            "hedges": hedges,
+            "hedge_wins": hedge_wins
+        }
+
+
+def hedged_call(
+    executor: Executor,
+    attempt: Callable[[], T],
+    tracker: LatencyTracker
+) -> T:
+    """
+    Run attempt, sending a second copy if the first is slower than the hedge delay
+
+    Whichever attempt succeeds first wins; the other is left to finish in the
+    background and its result is discarded. An attempt that fails before the
+    hedge delay is raised straight away (errors are not hedged).
+
+    Args:
+        executor: Pool both attempts run on
+        attempt: Zero-argument callable making one provider request
+        tracker: Latency sample for this backend (updated by every successful attempt)
+    """
+    def timed() -> T:
+        started = time.monotonic()
+        result = attempt()
+        tracker.record(time.monotonic() - started)
+        return result
+
+    delay = tracker.hedge_delay()
+    if delay is None:
+        return timed()
+
+    first = executor.submit(timed)
+    try:
+        return first.result(timeout=delay)
+    except FuturesTimeout:
+        pass
+
+    tracker.count_hedge()
+    second = executor.submit(timed)
+
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is second:
+                    tracker.count_hedge(won=True)
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+async def hedged_call_async(
+    attempt: Callable[[], Awaitable[T]],
+    tracker: LatencyTracker
+) -> T:
+    """
+    Async twin of hedged_call: both attempts are tasks on the event loop
+
+    The losing attempt is cancelled once a winner is known.
+    """
+    async def timed() -> T:
+        started = time.monotonic()
+        result = await attempt()
+        tracker.record(time.monotonic() - started)
+        return result
+
+    delay = tracker.hedge_delay()
+    if delay is None:
+        return await timed()
+
+    first = asyncio.ensure_future(timed())
+    try:
+        done, _pending = await asyncio.wait({first}, timeout=delay)
+    except BaseException:
+        first.cancel()
+        raise
+    if done:
+        return first.result()
+
+    tracker.count_hedge()
+    second = asyncio.ensure_future(timed())
+
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        tracker.count_hedge(won=True)
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker
+
+    Opens when at least CIRCUIT_BREAKER_MIN_REQUESTS calls in the last
+    CIRCUIT_BREAKER_WINDOW_SECONDS failed at CIRCUIT_BREAKER_ERROR_THRESHOLD
+    or more. After CIRCUIT_BREAKER_OPEN_SECONDS one trial call is let through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self.state = CIRCUIT_CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= settings.CIRCUIT_BREAKER_OPEN_SECONDS:
+                self.state = CIRCUIT_HALF_OPEN
+            if self.state == CIRCUIT_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state == CIRCUIT_HALF_OPEN:
+                self.state = CIRCUIT_CLOSED
+                self._trial_in_flight = False
+                self._outcomes.clear()
+            self._add_outcome(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self.state == CIRCUIT_HALF_OPEN:
+                self._open()
+                return
+            self._add_outcome(False)
+            total = len(self._outcomes)
+            failures = sum(1 for _at, succeeded in self._outcomes if not succeeded)
+            if (
+                self.state == CIRCUIT_CLOSED
+                and total >= settings.CIRCUIT_BREAKER_MIN_REQUESTS
+                and failures / total >= settings.CIRCUIT_BREAKER_ERROR_THRESHOLD
+            ):
+                self._open()
+
+    def retry_after(self) -> float:
+        with self._lock:
+            remaining = settings.CIRCUIT_BREAKER_OPEN_SECONDS - (time.monotonic() - self._opened_at)
+        return max(1.0, remaining)
+
+    def _open(self) -> None:
+        self.state = CIRCUIT_OPEN
+        self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+        self.times_opened += 1
+
+    def _add_outcome(self, succeeded: bool) -> None:
+        now = time.monotonic()
+        self._outcomes.append((now, succeeded))
+        while self._outcomes and now - self._outcomes[0][0] > settings.CIRCUIT_BREAKER_WINDOW_SECONDS:
+            self._outcomes.popleft()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = len(self._outcomes)
+            failures = sum(1 for _at, succeeded in self._outcomes if not succeeded)
+            return {
+                "state": self.state,
+                "window_requests": total,
+                "window_failures": failures,
+                "error_rate": failures / total if total else 0.0,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_trackers: Dict[str, LatencyTracker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get the shared circuit breaker for a backend"""
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def get_latency_tracker(name: str) -> LatencyTracker:
+    """Get the shared latency sample for a backend"""
+    with _registry_lock:
+        if name not in _trackers:
+            _trackers[name] = LatencyTracker(settings.TRANSCRIPTION_HEDGE_SAMPLE_SIZE)
+        return _trackers[name]
+
+
+def get_resilience_stats() -> dict:
+    """
+    Get breaker state and hedging counters for every backend used so far
+
+    Returns:
+        Dictionary keyed by backend name
+    """
+    with _registry_lock:
+        names = sorted(set(_breakers) | set(_trackers))
+    return {
+        name: {
+            "circuit": get_circuit_breaker(name).snapshot(),
+            "latency": get_latency_tracker(name).snapshot()
+        }
+        for name in names
+    }
@@ -0,0 +1,88 @@
+"""
+Question rubrics: expected key points compiled once when a question is added
+and stored with it, so evaluations reuse them instead of re-deriving them
+"""
+import logging
+import re
+from typing import List, Optional
+from app.config import settings
+from app.services.ai_client_service import generate_content
+from app.services.evaluator_backends import STOPWORDS, WORD_PATTERN
+from app.services.rate_limit_service import call_provider
+
+logger = logging.getLogger(__name__)
+
+SCORING_GUIDE = (
+    "Scoring: 9-10 covers every key point accurately with concrete examples; "
+    "6-8 covers most key points; 3-5 covers some or stays vague; "
+    "1-2 is off-topic or has no substantive answer."
+)
+
+KEY_POINTS_PROMPT = """List the {count} most important key points a strong answer to this interview question should cover.
+Reply with one short key point per line, each starting with "- ", and nothing else.
+
+Question:
+"{question}"
+"""
+
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+
+def compile_rubric(question_text: str, expected_points: Optional[str] = None) -> str:
+    """
+    Compile the rubric stored with a question
+
+    Key points come from expected_points when the admin supplied them,
+    otherwise from one Gemini request (RUBRIC_GENERATION_ENABLED), and as a
+    last resort from the question's own key terms.
+
+    Args:
+        question_text: Question text
+        expected_points: Admin-supplied key points, one per line
+
+    Returns:
+        Rubric text: a bulleted key point list followed by the scoring guide
+    """
+    points = _parse_points(expected_points or "")
+    if not points and settings.RUBRIC_GENERATION_ENABLED:
+        try:
+            points = _generate_points(question_text)
+        except Exception as e:
+            logger.warning("Generating key points failed (%r), using question terms", e)
+
+    if points:
+        lines = ["Expected key points:"] + [f"- {point}" for point in points]
+    else:
+        terms = _key_terms(question_text)
+        if not terms:
+            return SCORING_GUIDE
+        lines = [f"Key terms the answer should address: {', '.join(terms)}"]
+    return "\n".join(lines + [SCORING_GUIDE])
+
+
+def _generate_points(question_text: str) -> List[str]:
+    prompt = KEY_POINTS_PROMPT.format(count=settings.RUBRIC_MAX_POINTS, question=question_text)
+    response = call_provider(
+        "gemini",
+        generate_content,
+        prompt,
+        generation_config={"max_output_tokens": settings.EVALUATION_MAX_OUTPUT_TOKENS}
+    )
+    return _parse_points(response.text)
+
+
+def _parse_points(text: str) -> List[str]:
+    points = []
+    for line in text.splitlines():
+        point = BULLET_PATTERN.sub("", line).strip()
+        if point:
+            points.append(point)
+    return points[:settings.RUBRIC_MAX_POINTS]
+
+
+def _key_terms(question_text: str) -> List[str]:
+    terms = []
+    for word in WORD_PATTERN.findall((question_text or "").lower()):
+        if len(word) > 2 and word not in STOPWORDS and word not in terms:
+            terms.append(word)
+    return terms
@@ -0,0 +1,276 @@
+"""
+Single-flight for AI calls: concurrent identical requests share one provider call
+
+Within a worker, duplicates wait on the in-flight call and receive its result
+(or its error). With SINGLE_FLIGHT_CROSS_WORKER, a row in ai_call_locks marks
+the call in flight for other workers, which poll the shared result cache
+until the owner has stored its result.
+"""
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.database import SessionLocal
+from app.models.ai_call_lock import AICallLock
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight call that duplicates can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+_calls: Dict[str, _Call] = {}
+_calls_lock = threading.Lock()
+
+# In-flight calls of the async variant (event-loop only, so no lock is needed)
+_async_calls: Dict[str, "asyncio.Future"] = {}
+
+_counters_lock = threading.Lock()
+_counters = {"leaders": 0, "coalesced": 0, "cross_worker_waits": 0, "cross_worker_hits": 0}
+
+
+def _incr(name: str) -> None:
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def single_flight(
+    key: str,
+    compute: Callable[[], T],
+    lookup: Optional[Callable[[], Optional[T]]] = None
+) -> T:
+    """
+    Run compute once for all concurrent callers using the same key
+
+    Args:
+        key: Content-derived key identifying identical calls
+        compute: Makes the call; expected to store its result in the shared cache
+        lookup: Reads that shared cache (None on a miss); enables cross-worker waiting
+
+    Returns:
+        The result of compute (possibly computed by another caller)
+
+    Raises:
+        Exception: Whatever compute raised for the caller that ran it
+    """
+    if not settings.SINGLE_FLIGHT_ENABLED:
+        return compute()
+
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        _incr("coalesced")
+        if call.done.wait(settings.SINGLE_FLIGHT_WAIT_SECONDS):
+            if call.error is not None:
+                raise call.error
+            return call.result
+        # The in-flight call is taking too long; stop waiting and make our own
+        return compute()
+
+    _incr("leaders")
+    try:
+        if settings.SINGLE_FLIGHT_CROSS_WORKER and lookup is not None:
+            call.result = _run_with_db_lock(key, compute, lookup)
+        else:
+            call.result = compute()
+        return call.result
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _calls_lock:
+            _calls.pop(key, None)
+        call.done.set()
+
+
+async def single_flight_async(
+    key: str,
+    compute: Callable[[], Awaitable[T]],
+    lookup: Optional[Callable[[], Awaitable[Optional[T]]]] = None
+) -> T:
+    """
+    Async twin of single_flight: duplicates await the first caller's future
+
+    Coalesces callers on the same event loop; the cross-worker lock table is
+    shared with the threaded variant.
+    """
+    if not settings.SINGLE_FLIGHT_ENABLED:
+        return await compute()
+
+    future = _async_calls.get(key)
+    if future is not None:
+        _incr("coalesced")
+        try:
+            # shield: a waiter being cancelled must not cancel the shared call
+            return await asyncio.wait_for(asyncio.shield(future), settings.SINGLE_FLIGHT_WAIT_SECONDS)
+        except asyncio.TimeoutError:
+            return await compute()
+
+    future = asyncio.get_running_loop().create_future()
+    _async_calls[key] = future
+    _incr("leaders")
+    try:
+        if settings.SINGLE_FLIGHT_CROSS_WORKER and lookup is not None:
+            result = await _run_with_db_lock_async(key, compute, lookup)
+        else:
+            result = await compute()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        # Mark the exception retrieved so it is not reported when nobody was waiting
+        future.exception()
+        raise
+    finally:
+        _async_calls.pop(key, None)
+
+
+async def _run_with_db_lock_async(
+    key: str,
+    compute: Callable[[], Awaitable[T]],
+    lookup: Callable[[], Awaitable[Optional[T]]]
+) -> T:
+    deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT_SECONDS
+    waited = False
+    while True:
+        owner = _new_lock_owner()
+        if await run_in_threadpool(_acquire_db_lock, key, owner):
+            try:
+                if waited:
+                    cached = await lookup()
+                    if cached is not None:
+                        return cached
+                return await compute()
+            finally:
+                await run_in_threadpool(_release_db_lock, key, owner)
+
+        if not waited:
+            _incr("cross_worker_waits")
+            waited = True
+        await asyncio.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL_SECONDS)
+
+        cached = await lookup()
+        if cached is not None:
+            _incr("cross_worker_hits")
+            return cached
+        if time.monotonic() >= deadline:
+            return await compute()
+
+
+def _run_with_db_lock(key: str, compute: Callable[[], T], lookup: Callable[[], Optional[T]]) -> T:
+    deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT_SECONDS
+    waited = False
+    while True:
+        owner = _new_lock_owner()
+        if _acquire_db_lock(key, owner):
+            try:
+                # Another worker may have finished between our cache miss and the lock
+                if waited:
+                    cached = lookup()
+                    if cached is not None:
+                        return cached
+                return compute()
+            finally:
+                _release_db_lock(key, owner)
+
+        if not waited:
+            _incr("cross_worker_waits")
+            waited = True
+        time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL_SECONDS)
+
+        cached = lookup()
+        if cached is not None:
+            _incr("cross_worker_hits")
+            return cached
+        if time.monotonic() >= deadline:
+            return compute()
+
+
+def _new_lock_owner() -> str:
+    """Unique token for one lock acquisition (the release may run on another thread)"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"[-100:]
+
+
+def _acquire_db_lock(key: str, owner: str) -> bool:
+    """
+    Insert the lock row for key (after clearing an expired one)
+
+    Database errors other than the key being held are logged and treated as
+    acquired, so an unavailable lock table never blocks AI calls.
+    """
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        db.query(AICallLock).filter(
+            AICallLock.call_key == key,
+            AICallLock.expires_at < now
+        ).delete(synchronize_session=False)
+        db.add(AICallLock(
+            call_key=key,
+            owner=owner,
+            expires_at=now + timedelta(seconds=settings.SINGLE_FLIGHT_LOCK_TTL_SECONDS)
+        ))
+        db.commit()
+        return True
+    except IntegrityError:
+        db.rollback()
+        return False
+    except Exception:
+        db.rollback()
+        logger.exception("Acquiring AI call lock failed")
+        return True
+    finally:
+        db.close()
+
+
+def _release_db_lock(key: str, owner: str) -> None:
+    db = SessionLocal()
+    try:
+        db.query(AICallLock).filter(
+            AICallLock.call_key == key,
+            AICallLock.owner == owner
+        ).delete(synchronize_session=False)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Releasing AI call lock failed")
+    finally:
+        db.close()
+
+
+def get_single_flight_stats() -> dict:
+    """
+    Get single-flight counters for this worker process
+
+    Returns:
+        Dictionary with leader/coalesced counts and calls currently in flight
+    """
+    with _calls_lock:
+        in_flight = len(_calls)
+    with _counters_lock:
+        return {
+            "enabled": settings.SINGLE_FLIGHT_ENABLED,
+            "cross_worker": settings.SINGLE_FLIGHT_CROSS_WORKER,
+            "in_flight": in_flight,
+            **_counters
+        }
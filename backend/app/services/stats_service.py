@@ -0,0 +1,235 @@
+"""
+Answer aggregates: per-candidate stats and the interview rollup
+
+Both are adjusted in the same transaction as the answer change they
+describe, so dashboards read one row per candidate instead of rescanning
+answers. rebuild_stats recomputes them from the answers table (backfill
+and repair).
+"""
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import case, func, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.answer import Answer
+from app.models.candidate import Candidate
+from app.models.candidate_stats import CandidateStats
+from app.models.interview_stats import InterviewStats
+
+
+def score_change(old_score: Optional[int], new_score: Optional[int]) -> Tuple[int, int]:
+    """
+    (scored_count, score_sum) deltas for an answer whose score goes from old_score to new_score
+
+    None means unscored, so it neither counts towards nor adds to the average.
+    """
+    scored_delta = int(new_score is not None) - int(old_score is not None)
+    return scored_delta, (new_score or 0) - (old_score or 0)
+
+
+def record_answer_change(
+    db: Session,
+    candidate_id,
+    answer_delta: int,
+    scored_delta: int,
+    score_delta: int,
+    answered_at: Optional[datetime] = None
+) -> None:
+    """
+    Apply an answer change to the candidate's stats and its interview's rollup
+
+    Counters are updated in place with relative UPDATEs, so concurrent saves
+    for the same candidate or interview never overwrite each other, and
+    both rows' version is bumped (cached reports are keyed by it). The
+    caller commits, together with the answer itself.
+
+    Args:
+        db: Database session
+        candidate_id: Candidate whose answer changed
+        answer_delta: 1 for a new answer, 0 for an updated one
+        scored_delta: Change in the number of scored answers
+        score_delta: Change in the sum of scores
+        answered_at: When the answer was saved (None leaves the last answer time
+            unchanged, e.g. when existing answers are re-scored)
+    """
+    now = datetime.utcnow()
+    interview_id = (
+        select(Candidate.interview_id)
+        .where(Candidate.id == candidate_id)
+        .scalar_subquery()
+    )
+
+    _apply_delta(
+        db,
+        CandidateStats,
+        CandidateStats.candidate_id == candidate_id,
+        answer_delta, scored_delta, score_delta, answered_at, now,
+        lambda: CandidateStats(
+            candidate_id=candidate_id,
+            interview_id=db.query(Candidate.interview_id).filter(Candidate.id == candidate_id).scalar()
+        )
+    )
+    _apply_delta(
+        db,
+        InterviewStats,
+        InterviewStats.interview_id == interview_id,
+        answer_delta, scored_delta, score_delta, answered_at, now,
+        lambda: InterviewStats(
+            interview_id=db.query(Candidate.interview_id).filter(Candidate.id == candidate_id).scalar()
+        )
+    )
+
+
+async def record_answer_change_async(
+    db: AsyncSession,
+    candidate_id,
+    answer_delta: int,
+    scored_delta: int,
+    score_delta: int,
+    answered_at: Optional[datetime] = None
+) -> None:
+    """Async variant of record_answer_change"""
+    now = datetime.utcnow()
+    interview_id = await db.scalar(select(Candidate.interview_id).where(Candidate.id == candidate_id))
+
+    await _apply_delta_async(
+        db,
+        CandidateStats,
+        CandidateStats.candidate_id == candidate_id,
+        answer_delta, scored_delta, score_delta, answered_at, now,
+        lambda: CandidateStats(candidate_id=candidate_id, interview_id=interview_id)
+    )
+    await _apply_delta_async(
+        db,
+        InterviewStats,
+        InterviewStats.interview_id == interview_id,
+        answer_delta, scored_delta, score_delta, answered_at, now,
+        lambda: InterviewStats(interview_id=interview_id)
+    )
+
+
+def _delta_values(model, answer_delta, scored_delta, score_delta, answered_at, now) -> dict:
+    values = {
+        model.answer_count: model.answer_count + answer_delta,
+        model.scored_count: model.scored_count + scored_delta,
+        model.score_sum: model.score_sum + score_delta,
+        model.version: model.version + 1,
+        model.updated_at: now
+    }
+    if answered_at is not None:
+        values[model.last_answer_at] = case(
+            (or_(model.last_answer_at.is_(None), model.last_answer_at < answered_at), answered_at),
+            else_=model.last_answer_at
+        )
+    return values
+
+
+def _new_row(create, answer_delta, scored_delta, score_delta, answered_at, now):
+    row = create()
+    row.answer_count = answer_delta
+    row.scored_count = scored_delta
+    row.score_sum = score_delta
+    row.last_answer_at = answered_at
+    row.version = 1
+    row.updated_at = now
+    return row
+
+
+def _apply_delta(db: Session, model, key, answer_delta, scored_delta, score_delta, answered_at, now, create) -> None:
+    values = _delta_values(model, answer_delta, scored_delta, score_delta, answered_at, now)
+    if db.query(model).filter(key).update(values, synchronize_session=False):
+        return
+
+    # First answer: create the row, unless a concurrent save just did
+    row = _new_row(create, answer_delta, scored_delta, score_delta, answered_at, now)
+    try:
+        with db.begin_nested():
+            db.add(row)
+    except IntegrityError:
+        db.query(model).filter(key).update(values, synchronize_session=False)
+
+
+async def _apply_delta_async(db: AsyncSession, model, key, answer_delta, scored_delta, score_delta, answered_at, now, create) -> None:
+    statement = (
+        update(model)
+        .where(key)
+        .values(_delta_values(model, answer_delta, scored_delta, score_delta, answered_at, now))
+        .execution_options(synchronize_session=False)
+    )
+    if (await db.execute(statement)).rowcount:
+        return
+
+    # First answer: create the row, unless a concurrent save just did
+    row = _new_row(create, answer_delta, scored_delta, score_delta, answered_at, now)
+    try:
+        async with db.begin_nested():
+            db.add(row)
+    except IntegrityError:
+        await db.execute(statement)
+
+
+def rebuild_stats(db: Session, interview_id: Optional[str] = None) -> dict:
+    """
+    Recompute candidate stats and interview rollups from the answers table
+
+    Used to backfill existing data and to repair drift. Rows are replaced
+    in one transaction; answers saved while it runs are picked up by the
+    next rebuild at the latest.
+
+    Args:
+        db: Database session
+        interview_id: Only rebuild this interview (default: all interviews)
+
+    Returns:
+        Dictionary with the number of candidate and interview rows written
+    """
+    candidate_filter = [Candidate.interview_id == interview_id] if interview_id else []
+
+    candidate_query = db.query(CandidateStats)
+    interview_query = db.query(InterviewStats)
+    if interview_id:
+        candidate_query = candidate_query.filter(CandidateStats.interview_id == interview_id)
+        interview_query = interview_query.filter(InterviewStats.interview_id == interview_id)
+    candidate_query.delete(synchronize_session=False)
+    interview_query.delete(synchronize_session=False)
+
+    now = datetime.utcnow()
+    aggregates = (
+        select(
+            Candidate.id,
+            Candidate.interview_id,
+            func.count(Answer.id),
+            func.count(Answer.score),
+            func.coalesce(func.sum(Answer.score), 0),
+            func.max(Answer.created_at),
+            literal(now)
+        )
+        .join(Answer, Answer.candidate_id == Candidate.id)
+        .where(*candidate_filter)
+        .group_by(Candidate.id, Candidate.interview_id)
+    )
+
+    candidates = db.execute(
+        CandidateStats.__table__.insert().from_select(
+            ["candidate_id", "interview_id", "answer_count", "scored_count", "score_sum", "last_answer_at", "updated_at"],
+            aggregates
+        )
+    ).rowcount
+    interviews = db.execute(
+        InterviewStats.__table__.insert().from_select(
+            ["interview_id", "answer_count", "scored_count", "score_sum", "last_answer_at", "updated_at"],
+            select(
+                CandidateStats.interview_id,
+                func.sum(CandidateStats.answer_count),
+                func.sum(CandidateStats.scored_count),
+                func.sum(CandidateStats.score_sum),
+                func.max(CandidateStats.last_answer_at),
+                literal(now)
+            )
+            .where(*([CandidateStats.interview_id == interview_id] if interview_id else []))
+            .group_by(CandidateStats.interview_id)
+        )
+    ).rowcount
+    db.commit()
+    return {"candidates": candidates, "interviews": interviews}
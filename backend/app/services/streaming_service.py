@@ -0,0 +1,208 @@
+"""
+Streaming transcription: audio arrives in chunks while the candidate is still
+speaking and finished segments are transcribed straight away
+
+Segments end at the candidate's natural pauses, so by the time recording
+stops only the last few seconds are left to transcribe.
+"""
+import asyncio
+import hashlib
+import io
+import logging
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.services.ai_pipeline_service import SegmentTiming, TranscriptionResult, stitch_transcripts
+from app.services.async_ai_service import call_transcription_backend_async
+from app.services.audio_service import (
+    FRAME_MS,
+    SAMPLE_RATE,
+    StreamingDecoder,
+    encode_pcm,
+    encode_wav,
+    ffmpeg_executable,
+    find_pause,
+    frame_levels_dbfs,
+    voiced_bounds
+)
+from app.services.cache_service import store_cached_transcription
+from app.services.transcription_backends import get_transcription_backend
+from app.services.upload_service import AudioUploadTooLarge
+
+logger = logging.getLogger(__name__)
+
+FRAME_SIZE = SAMPLE_RATE * FRAME_MS // 1000
+
+
+class StreamingTranscription:
+    """
+    Rolling transcript of one recording that is still being streamed
+
+    Usage: start(), feed() each chunk as it arrives, then finish() once the
+    candidate stops (or abort() if the stream is abandoned).
+    """
+
+    def __init__(
+        self,
+        input_format: str = "webm",
+        on_transcript: Optional[Callable[[str], Awaitable[None]]] = None
+    ):
+        """
+        Args:
+            input_format: "pcm" for raw s16le 16 kHz mono, anything else is decoded by ffmpeg
+            on_transcript: Awaited with the rolling transcript whenever it grows
+        """
+        self.backend = get_transcription_backend()
+        self.bytes_received = 0
+        self._decoder = StreamingDecoder(input_format)
+        self._on_transcript = on_transcript
+        self._hasher = hashlib.sha256()
+        self._pending = np.empty(0, dtype=np.int16)
+        self._pending_offset = 0  # sample offset of _pending within the recording
+        self._tasks: List[asyncio.Task] = []
+        self._results: List[Optional[Tuple[str, str, SegmentTiming]]] = []
+        self._published = ""
+
+    async def start(self) -> None:
+        """
+        Raises:
+            RuntimeError: If the input format needs ffmpeg and it is not installed
+        """
+        await self._decoder.start()
+
+    async def feed(self, chunk: bytes) -> None:
+        """
+        Add the next chunk of audio, sending any finished segments for transcription
+
+        Raises:
+            AudioUploadTooLarge: If the stream exceeds MAX_AUDIO_UPLOAD_BYTES
+        """
+        self.bytes_received += len(chunk)
+        if self.bytes_received > settings.MAX_AUDIO_UPLOAD_BYTES:
+            raise AudioUploadTooLarge(
+                f"Audio stream exceeds the {settings.MAX_AUDIO_UPLOAD_BYTES} byte limit"
+            )
+        self._hasher.update(chunk)
+        await self._decoder.write(chunk)
+        self._append(self._decoder.read())
+        self._cut_segments()
+
+    @property
+    def transcript(self) -> str:
+        """Transcript of the leading segments that have finished, in order"""
+        transcript = ""
+        for result in self._results:
+            if result is None:
+                break
+            transcript = stitch_transcripts(transcript, result[0])
+        return transcript
+
+    async def finish(self) -> TranscriptionResult:
+        """
+        End the stream, transcribe what is left and return the full transcript
+
+        wall_seconds is the time from this call (the candidate stopping) until
+        the transcript was complete.
+
+        Raises:
+            ProviderThrottled: If the provider's rate limit left no capacity in time
+            CircuitOpen: If the backend's circuit breaker is open and there is no fallback
+            Exception: If decoding or transcription fails
+        """
+        stopped = time.monotonic()
+        self._append(await self._decoder.close())
+        self._dispatch(self._pending)
+        self._pending = np.empty(0, dtype=np.int16)
+
+        await asyncio.gather(*self._tasks)
+        transcript = self.transcript
+
+        if self.bytes_received and {used for _text, used, _timing in self._results} <= {self.backend.name}:
+            await run_in_threadpool(
+                store_cached_transcription,
+                self._hasher.hexdigest(),
+                self.backend.model,
+                transcript,
+                self.bytes_received
+            )
+        return TranscriptionResult(
+            text=transcript,
+            wall_seconds=time.monotonic() - stopped,
+            segments=[timing for _text, _used, timing in self._results]
+        )
+
+    async def abort(self) -> None:
+        """Stop decoding and cancel segment transcriptions still in flight"""
+        self._decoder.abort()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _append(self, samples: np.ndarray) -> None:
+        if samples.size:
+            self._pending = np.concatenate([self._pending, samples])
+
+    def _cut_segments(self) -> None:
+        """Send complete segments from the pending audio for transcription"""
+        min_frames = int(settings.STREAMING_SEGMENT_MIN_SECONDS * 1000 / FRAME_MS)
+        max_frames = int(settings.STREAMING_SEGMENT_MAX_SECONDS * 1000 / FRAME_MS)
+        pause_frames = max(1, settings.STREAMING_PAUSE_MS // FRAME_MS)
+        search_frames = min(int(settings.TRANSCRIPTION_CHUNK_SEARCH_SECONDS * 1000 / FRAME_MS), max_frames // 2)
+
+        while True:
+            levels = frame_levels_dbfs(self._pending)
+            if len(levels) < min_frames:
+                return
+
+            overlap = 0
+            cut = find_pause(levels[:max_frames], min_frames, pause_frames)
+            if cut is None:
+                if len(levels) < max_frames:
+                    return
+                # No pause: cut at the quietest point and overlap so a split word appears whole once
+                low = max_frames - search_frames
+                cut = low + int(np.argmin(levels[low:max_frames]))
+                overlap = int(settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS * SAMPLE_RATE)
+
+            end = cut * FRAME_SIZE
+            self._dispatch(self._pending[:end])
+            keep_from = max(0, end - overlap)
+            self._pending = self._pending[keep_from:]
+            self._pending_offset += keep_from
+
+    def _dispatch(self, samples: np.ndarray) -> None:
+        """Start transcribing a segment (segments that are entirely silent are skipped)"""
+        bounds = voiced_bounds(samples)
+        if bounds is None:
+            return
+        start_seconds = (self._pending_offset + bounds[0]) / SAMPLE_RATE
+        index = len(self._results)
+        self._results.append(None)
+        self._tasks.append(asyncio.create_task(
+            self._transcribe_segment(index, samples[bounds[0]:bounds[1]], start_seconds)
+        ))
+
+    async def _transcribe_segment(self, index: int, samples: np.ndarray, start_seconds: float) -> None:
+        if ffmpeg_executable() is not None:
+            encoded = await run_in_threadpool(encode_pcm, samples)
+            filename = f"segment.{settings.AUDIO_OUTPUT_FORMAT}"
+        else:
+            encoded, filename = encode_wav(samples), "segment.wav"
+
+        started = time.monotonic()
+        text, used = await call_transcription_backend_async(self.backend, io.BytesIO(encoded), filename)
+        self._results[index] = (text, used.name, SegmentTiming(
+            start_seconds=start_seconds,
+            end_seconds=start_seconds + len(samples) / SAMPLE_RATE,
+            latency_seconds=time.monotonic() - started
+        ))
+
+        transcript = self.transcript
+        if self._on_transcript is not None and transcript != self._published:
+            self._published = transcript
+            try:
+                await self._on_transcript(transcript)
+            except Exception as e:
+                logger.debug("Could not publish the rolling transcript: %r", e)
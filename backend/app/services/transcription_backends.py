@@ -0,0 +1,182 @@
+"""
+Transcription backends: OpenAI Whisper API or a local CPU Whisper model
+"""
+import asyncio
+import importlib.util
+import io
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, Optional
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.services.ai_client_service import get_openai_client, get_async_openai_client
+from app.services.rate_limit_service import call_provider, call_provider_async
+
+
+class TranscriptionBackend(ABC):
+    """Speech-to-text provider used by ai_service.transcribe_audio"""
+    
+    name: str = ""
+    # Whether slow calls may be duplicated (pointless for local, CPU-bound backends)
+    hedge: bool = False
+    
+    @property
+    @abstractmethod
+    def model(self) -> str:
+        """Identifier of the model producing transcripts (part of the transcription cache key)"""
+    
+    @abstractmethod
+    def transcribe(self, audio: BinaryIO, filename: str) -> str:
+        """
+        Transcribe a recording
+        
+        Args:
+            audio: Readable stream positioned at the start of the recording
+            filename: Filename whose extension identifies the audio format
+        
+        Returns:
+            Transcribed text
+        """
+    
+    async def transcribe_async(self, audio: BinaryIO, filename: str) -> str:
+        """
+        Async variant of transcribe
+        
+        The default runs transcribe in the threadpool; backends with a native
+        async client override it so waiting does not hold a thread.
+        """
+        return await run_in_threadpool(self.transcribe, audio, filename)
+
+
+class OpenAIWhisperBackend(TranscriptionBackend):
+    """Hosted Whisper through the OpenAI API"""
+    
+    name = "openai"
+    hedge = True
+    
+    @property
+    def model(self) -> str:
+        return settings.WHISPER_MODEL
+    
+    def transcribe(self, audio: BinaryIO, filename: str) -> str:
+        start = audio.tell()
+        
+        def request():
+            audio.seek(start)  # Rewind for retries after a throttled attempt
+            return get_openai_client().audio.transcriptions.create(
+                model=settings.WHISPER_MODEL,
+                file=(filename, audio),
+                response_format="text"
+            )
+        
+        transcript = call_provider("openai", request)
+        return transcript if isinstance(transcript, str) else str(transcript)
+    
+    async def transcribe_async(self, audio: BinaryIO, filename: str) -> str:
+        start = audio.tell()
+        
+        async def request():
+            audio.seek(start)
+            return await get_async_openai_client().audio.transcriptions.create(
+                model=settings.WHISPER_MODEL,
+                file=(filename, audio),
+                response_format="text"
+            )
+        
+        transcript = await call_provider_async("openai", request)
+        return transcript if isinstance(transcript, str) else str(transcript)
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Quantized Whisper (faster-whisper / CTranslate2) running on local CPU cores
+    
+    Each pool process loads the model once and then serves requests, so
+    inference runs outside the API process's GIL.
+    """
+    
+    name = "local"
+    
+    def __init__(self):
+        if importlib.util.find_spec("faster_whisper") is None:
+            raise RuntimeError("TRANSCRIPTION_BACKEND=local requires the faster-whisper package")
+        
+        self._pool = ProcessPoolExecutor(
+            max_workers=settings.LOCAL_WHISPER_WORKERS,
+            initializer=_load_local_model,
+            initargs=(
+                settings.LOCAL_WHISPER_MODEL,
+                settings.LOCAL_WHISPER_COMPUTE_TYPE,
+                settings.LOCAL_WHISPER_CPU_THREADS
+            )
+        )
+    
+    @property
+    def model(self) -> str:
+        return f"local:{settings.LOCAL_WHISPER_MODEL}:{settings.LOCAL_WHISPER_COMPUTE_TYPE}"
+    
+    def transcribe(self, audio: BinaryIO, filename: str) -> str:
+        # Recordings cross the process boundary as bytes (already compact after preprocessing)
+        future = self._pool.submit(_transcribe_in_worker, audio.read())
+        return future.result(timeout=settings.LOCAL_WHISPER_TIMEOUT_SECONDS)
+    
+    async def transcribe_async(self, audio: BinaryIO, filename: str) -> str:
+        # The pool process does the work; the event loop just awaits its future
+        future = asyncio.wrap_future(self._pool.submit(_transcribe_in_worker, audio.read()))
+        return await asyncio.wait_for(future, settings.LOCAL_WHISPER_TIMEOUT_SECONDS)
+    
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+BACKENDS = {
+    OpenAIWhisperBackend.name: OpenAIWhisperBackend,
+    LocalWhisperBackend.name: LocalWhisperBackend
+}
+
+_instances: Dict[str, TranscriptionBackend] = {}
+_instances_lock = threading.Lock()
+
+
+def get_transcription_backend(name: Optional[str] = None) -> TranscriptionBackend:
+    """
+    Get the (shared) transcription backend instance
+    
+    Args:
+        name: Backend name; defaults to settings.TRANSCRIPTION_BACKEND
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = name or settings.TRANSCRIPTION_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend: {name}")
+    
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
+
+
+# --- local pool process side ---
+
+_local_model = None
+
+
+def _load_local_model(model_size: str, compute_type: str, cpu_threads: int) -> None:
+    global _local_model
+    from faster_whisper import WhisperModel
+    
+    _local_model = WhisperModel(
+        model_size,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads or os.cpu_count() or 1
+    )
+
+
+def _transcribe_in_worker(audio_data: bytes) -> str:
+    segments, _info = _local_model.transcribe(io.BytesIO(audio_data), beam_size=1, vad_filter=False)
+    return " ".join(segment.text.strip() for segment in segments).strip()
@@ -0,0 +1,103 @@
+"""
+Upload service for streaming audio uploads with a bounded memory footprint
+"""
+import hashlib
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+from app.config import settings
+
+# Read uploads in 64 KiB chunks
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class AudioUploadTooLarge(ValueError):
+    """Raised when an upload exceeds MAX_AUDIO_UPLOAD_BYTES"""
+
+
+@dataclass
+class AudioUpload:
+    """An uploaded recording positioned at offset 0, ready to hand to a provider"""
+    file: BinaryIO
+    filename: str
+    sha256: str
+    size: int
+
+
+def prepare_audio_upload(stream: BinaryIO, filename: Optional[str] = None) -> AudioUpload:
+    """
+    Hash and size-check an uploaded audio stream chunk by chunk
+    
+    Seekable streams (Starlette already spools UploadFile bodies to disk past
+    1 MB) are hashed in place and rewound, so no copy of the audio is made.
+    Non-seekable streams are copied into a SpooledTemporaryFile that moves to
+    disk once it grows past AUDIO_SPOOL_MAX_MEMORY_BYTES.
+    
+    Args:
+        stream: File-like object of the uploaded audio
+        filename: Original filename (its extension tells Whisper the format)
+    
+    Returns:
+        AudioUpload with a readable file handle, SHA-256 and byte count
+    
+    Raises:
+        AudioUploadTooLarge: If the upload exceeds MAX_AUDIO_UPLOAD_BYTES
+    """
+    if _is_seekable(stream):
+        start = stream.tell()
+        target = None
+    else:
+        start = 0
+        target = tempfile.SpooledTemporaryFile(max_size=settings.AUDIO_SPOOL_MAX_MEMORY_BYTES)
+    
+    hasher = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > settings.MAX_AUDIO_UPLOAD_BYTES:
+            if target is not None:
+                target.close()
+            raise AudioUploadTooLarge(
+                f"Audio upload exceeds the {settings.MAX_AUDIO_UPLOAD_BYTES} byte limit"
+            )
+        hasher.update(chunk)
+        if target is not None:
+            target.write(chunk)
+    
+    audio_file = target if target is not None else stream
+    audio_file.seek(start)
+    
+    return AudioUpload(
+        file=audio_file,
+        filename=filename or "audio.wav",
+        sha256=hasher.hexdigest(),
+        size=size
+    )
+
+
+def hash_stream(stream: BinaryIO) -> str:
+    """SHA-256 of a seekable stream from its current position; the position is restored"""
+    start = stream.tell()
+    hasher = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(UPLOAD_CHUNK_SIZE), b""):
+        hasher.update(chunk)
+    stream.seek(start)
+    return hasher.hexdigest()
+
+
+def stream_size(stream: BinaryIO) -> int:
+    """Bytes remaining in a seekable stream from its current position"""
+    start = stream.tell()
+    end = stream.seek(0, 2)
+    stream.seek(start)
+    return end - start
+
+
+def _is_seekable(stream: BinaryIO) -> bool:
+    try:
+        return stream.seekable()
+    except (AttributeError, ValueError):
+        return False
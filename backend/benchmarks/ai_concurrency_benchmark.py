@@ -0,0 +1,271 @@
+"""
+Benchmark: threadpool (sync routes) vs event loop (async routes) under many
+concurrent transcription requests
+
+A local fake Whisper endpoint answers every request after --delay seconds and
+the OpenAI clients are pointed at it. The same number of concurrent
+transcriptions is then run in both modes:
+
+    sync:  transcribe_audio through run_in_threadpool, as a sync `def` route runs
+    async: transcribe_audio_async awaited on the event loop, as the async routes run
+
+Rate limiting, hedging and audio preprocessing are disabled and every
+request has unique audio, so only the concurrency model differs. The
+transcription cache reads/writes are skipped unless --with-cache is given
+(they would otherwise measure the database instead).
+
+--path answer runs the full POST /ai/answer controller instead
+(submit_answer / submit_answer_async), each request on its own database
+session, with the heuristic evaluator so no Gemini calls are made. The peak
+number of database connections checked out while provider calls are in
+flight is reported: answers must not hold one while the provider is
+working, or concurrency is capped by DB_POOL_SIZE + DB_MAX_OVERFLOW. A throwaway interview with one candidate
+per request is created for the run and deleted afterwards.
+
+Usage (from backend/, with the usual .env):
+    python -m benchmarks.ai_concurrency_benchmark --requests 400 --delay 1.0
+    python -m benchmarks.ai_concurrency_benchmark --requests 400 --delay 1.0 --path answer
+"""
+import argparse
+import asyncio
+import io
+import os
+import socket
+import statistics
+import threading
+import time
+import uuid
+from typing import Callable
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_whisper(port: int, delay: float, on_request: Callable[[], None] = None) -> None:
+    """Serve POST /v1/audio/transcriptions, answering after `delay` seconds"""
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import PlainTextResponse
+    from starlette.routing import Route
+
+    async def transcriptions(request):
+        await request.body()
+        await asyncio.sleep(delay / 2)
+        if on_request is not None:
+            on_request()
+        await asyncio.sleep(delay / 2)
+        return PlainTextResponse("benchmark transcript")
+
+    app = Starlette(routes=[Route("/v1/audio/transcriptions", transcriptions, methods=["POST"])])
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Fake Whisper server did not start")
+        time.sleep(0.05)
+
+
+def configure_environment(port: int, requests: int) -> None:
+    """Point the app at the fake provider; must run before app.config is imported"""
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ["TRANSCRIPTION_BACKEND"] = "openai"
+    os.environ["OPENAI_REQUESTS_PER_MINUTE"] = "0"
+    os.environ["OPENAI_MAX_CONCURRENCY"] = str(requests)
+    os.environ["AI_HTTP_MAX_CONNECTIONS"] = str(requests)
+    os.environ["AI_HTTP_MAX_KEEPALIVE_CONNECTIONS"] = str(requests)
+    os.environ["TRANSCRIPTION_HEDGING_ENABLED"] = "false"
+    os.environ["AUDIO_PREPROCESSING_ENABLED"] = "false"
+    os.environ["TRANSCRIPTION_CACHE_SIZE"] = "0"
+
+
+def disable_transcription_cache() -> None:
+    """Replace the cache lookups/stores used by both pipelines with no-ops"""
+    from app.services import ai_service, async_ai_service
+
+    for module in (ai_service, async_ai_service):
+        module.get_cached_transcription = lambda audio_hash, model: None
+        module.store_cached_transcription = lambda *args, **kwargs: None
+
+
+def create_answer_interview(candidates: int) -> tuple:
+    """Create the --path answer interview; returns (interview_id, question_id, candidate_ids)"""
+    from app.database import SessionLocal
+    from app.models.candidate import Candidate
+    from app.models.question import Question
+    from app.services.interview_service import create_interview_with_link
+
+    db = SessionLocal()
+    try:
+        interview, _link_code = create_interview_with_link(db, f"AI benchmark {uuid.uuid4().hex[:8]}")
+        interview.evaluator_backend = "heuristic"
+        question = Question(interview_id=interview.id, question_text="Benchmark question")
+        candidate_rows = [
+            Candidate(interview_id=interview.id, name=f"Candidate {index}", email=f"candidate{index}@example.com")
+            for index in range(candidates)
+        ]
+        db.add_all([question] + candidate_rows)
+        db.commit()
+        return interview.id, str(question.id), [candidate.id for candidate in candidate_rows]
+    finally:
+        db.close()
+
+
+class ConnectionGauge:
+    """
+    Connections checked out of the sync engine's pool, sampled halfway
+    through each fake provider call (the peak sample is reported)
+    """
+
+    def __init__(self):
+        from sqlalchemy import event
+        from app.database import engine
+
+        self.current = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "checkout", self._checkout)
+        event.listen(engine, "checkin", self._checkin)
+
+    def _checkout(self, *args) -> None:
+        with self._lock:
+            self.current += 1
+
+    def _checkin(self, *args) -> None:
+        with self._lock:
+            self.current -= 1
+
+    def sample(self) -> None:
+        with self._lock:
+            self.peak = max(self.peak, self.current)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.peak = 0
+
+
+def _submit_answer(candidate_id, question_id: str, audio: bytes) -> dict:
+    """Sync /ai/answer route body: load the authenticated candidate, then submit"""
+    from app.controllers.ai_controller import submit_answer
+    from app.database import SessionLocal
+    from app.services.candidate_service import get_candidate_by_id
+
+    db = SessionLocal()
+    try:
+        candidate = get_candidate_by_id(db, candidate_id)
+        return submit_answer(db, candidate, question_id, io.BytesIO(audio), "answer.wav")
+    finally:
+        db.close()
+
+
+async def _submit_answer_async(candidate_id, question_id: str, audio: bytes) -> dict:
+    """Async /ai/answer route body (the candidate is loaded in the threadpool, as the dependency is)"""
+    from starlette.concurrency import run_in_threadpool
+    from app.controllers.ai_controller import submit_answer_async
+    from app.database import SessionLocal
+    from app.services.candidate_service import get_candidate_by_id
+
+    db = SessionLocal()
+    try:
+        candidate = await run_in_threadpool(get_candidate_by_id, db, candidate_id)
+        return await submit_answer_async(db, candidate, question_id, io.BytesIO(audio), "answer.wav")
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def run_mode(mode: str, requests: int, answer_target: tuple = None, gauge: ConnectionGauge = None) -> dict:
+    from starlette.concurrency import run_in_threadpool
+    from app.services.ai_service import transcribe_audio
+    from app.services.async_ai_service import transcribe_audio_async
+
+    run_id = uuid.uuid4().hex
+    latencies = []
+    if gauge is not None:
+        gauge.reset()
+
+    async def one(index: int) -> None:
+        audio = f"benchmark-{run_id}-{index}".encode() * 64
+        started = time.monotonic()
+        if answer_target is not None:
+            question_id, candidate_ids = answer_target
+            if mode == "sync":
+                await run_in_threadpool(_submit_answer, candidate_ids[index], question_id, audio)
+            else:
+                await _submit_answer_async(candidate_ids[index], question_id, audio)
+        elif mode == "sync":
+            await run_in_threadpool(transcribe_audio, audio)
+        else:
+            await transcribe_audio_async(audio)
+        latencies.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    wall = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "requests": requests,
+        "wall_seconds": wall,
+        "throughput": requests / wall,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+        "threads": threading.active_count(),
+        "db_connections": gauge.peak if gauge is not None else None
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sync (threadpool) and async AI call concurrency")
+    parser.add_argument("--requests", type=int, default=400, help="concurrent transcriptions per mode")
+    parser.add_argument("--delay", type=float, default=1.0, help="fake provider latency in seconds")
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    parser.add_argument("--with-cache", action="store_true", help="include transcription cache database I/O")
+    parser.add_argument(
+        "--path", choices=["transcribe", "answer"], default="transcribe",
+        help="transcription only, or the full /ai/answer controller (database sessions included)"
+    )
+    args = parser.parse_args()
+
+    gauge = None
+    port = _free_port()
+    start_fake_whisper(port, args.delay, lambda: gauge.sample() if gauge is not None else None)
+    configure_environment(port, args.requests)
+    if not args.with_cache:
+        disable_transcription_cache()
+
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+    answer_target = None
+    if args.path == "answer":
+        from benchmarks.db_concurrency_benchmark import delete_interview
+
+        interview_id, question_id, candidate_ids = create_answer_interview(args.requests)
+        answer_target = (question_id, candidate_ids)
+        gauge = ConnectionGauge()
+
+    async def run_all():
+        return [await run_mode(mode, args.requests, answer_target, gauge) for mode in modes]
+
+    try:
+        results = asyncio.run(run_all())
+    finally:
+        if answer_target is not None:
+            delete_interview(interview_id)
+
+    print(f"{args.requests} concurrent {args.path} requests, provider latency {args.delay:.2f}s")
+    print(f"{'mode':<6} {'wall s':>8} {'req/s':>8} {'p50 s':>8} {'p99 s':>8} {'threads':>8} {'db conns':>9}")
+    for result in results:
+        print(
+            f"{result['mode']:<6} {result['wall_seconds']:>8.2f} {result['throughput']:>8.1f} "
+            f"{result['p50']:>8.2f} {result['p99']:>8.2f} {result['threads']:>8} "
+            f"{result['db_connections'] if result['db_connections'] is not None else '-':>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Benchmark: sync engine in the threadpool vs async engine on the event loop
+for the candidate hot path
+
+Each simulated candidate makes the four requests of a real interview start,
+each with its own session as the routes get one per request:
+
+    link lookup -> register -> start -> save-answer
+
+    sync:  the sync controllers through run_in_threadpool, as the `def` routes run
+    async: the async controllers awaited with an AsyncSession, as the
+           DB_ASYNC_ROUTES routes run
+
+Both modes use the same pool settings (DB_POOL_SIZE, DB_MAX_OVERFLOW, ...), so
+only the concurrency model differs. A throwaway interview is created for the
+run and deleted afterwards together with its candidates, answers and the
+evaluation jobs save-answer queued (stop evaluation workers pointed at the same
+database while it runs, or they will spend provider calls on them).
+
+Usage (from backend/, with the usual .env pointing at PostgreSQL):
+    python -m benchmarks.db_concurrency_benchmark --candidates 500
+"""
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+import uuid
+
+
+def create_interview(questions: int) -> tuple:
+    """Create the benchmark interview; returns (interview_id, link_code, question_ids)"""
+    from app.database import SessionLocal
+    from app.services.interview_service import create_interview_with_link
+    from app.models.question import Question
+
+    db = SessionLocal()
+    try:
+        interview, link_code = create_interview_with_link(db, f"DB benchmark {uuid.uuid4().hex[:8]}")
+        question_rows = [
+            Question(interview_id=interview.id, question_text=f"Benchmark question {index}")
+            for index in range(questions)
+        ]
+        db.add_all(question_rows)
+        db.commit()
+        return interview.id, link_code, [str(question.id) for question in question_rows]
+    finally:
+        db.close()
+
+
+def delete_interview(interview_id) -> None:
+    """Remove the benchmark interview and everything created under it"""
+    from app.database import SessionLocal
+    from app.models.candidate import Candidate
+    from app.models.candidate_stats import CandidateStats
+    from app.models.evaluation_job import EvaluationJob
+    from app.models.interview import Interview
+    from app.models.interview_stats import InterviewStats
+
+    db = SessionLocal()
+    try:
+        candidate_ids = db.query(Candidate.id).filter(Candidate.interview_id == interview_id)
+        db.query(EvaluationJob).filter(EvaluationJob.candidate_id.in_(candidate_ids.scalar_subquery())).delete(synchronize_session=False)
+        db.query(CandidateStats).filter(CandidateStats.interview_id == interview_id).delete(synchronize_session=False)
+        db.query(InterviewStats).filter(InterviewStats.interview_id == interview_id).delete(synchronize_session=False)
+        interview = db.query(Interview).filter(Interview.id == interview_id).first()
+        if interview:
+            db.delete(interview)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _sync_request(handler, *args):
+    """One sync route call: fresh session, closed afterwards"""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return handler(db, *args)
+    finally:
+        db.close()
+
+
+def _save_answer(db, candidate_id: str, question_id: str) -> dict:
+    """Sync save-answer route body: load the authenticated candidate, then save"""
+    from app.controllers.ai_controller import save_answer
+    from app.services.candidate_service import get_candidate_by_id
+
+    return save_answer(db, get_candidate_by_id(db, candidate_id), question_id, "Benchmark answer")
+
+
+async def run_sync_candidate(link_code: str, question_id: str, index: int) -> None:
+    from starlette.concurrency import run_in_threadpool
+    from app.controllers.candidate_controller import (
+        get_interview_by_link,
+        register_candidate_for_interview,
+        start_interview
+    )
+    from app.schemas.candidate import CandidateRegister
+
+    await run_in_threadpool(_sync_request, get_interview_by_link, link_code)
+    login = await run_in_threadpool(
+        _sync_request,
+        register_candidate_for_interview,
+        CandidateRegister(name=f"Candidate {index}", email=f"candidate{index}@example.com", link_code=link_code)
+    )
+    await run_in_threadpool(_sync_request, start_interview, login.candidate_id)
+    await run_in_threadpool(_sync_request, _save_answer, login.candidate_id, question_id)
+
+
+async def run_async_candidate(link_code: str, question_id: str, index: int) -> None:
+    from app.database import AsyncSessionLocal
+    from app.controllers.ai_controller import save_answer_async_session
+    from app.controllers.candidate_controller import (
+        get_interview_by_link_async,
+        register_candidate_for_interview_async,
+        start_interview_async
+    )
+    from app.schemas.candidate import CandidateRegister
+    from app.services.candidate_service import get_candidate_by_id_async
+
+    async with AsyncSessionLocal() as db:
+        await get_interview_by_link_async(db, link_code)
+    async with AsyncSessionLocal() as db:
+        login = await register_candidate_for_interview_async(
+            db,
+            CandidateRegister(name=f"Candidate {index}", email=f"candidate{index}@example.com", link_code=link_code)
+        )
+    candidate_id = uuid.UUID(login.candidate_id)
+    async with AsyncSessionLocal() as db:
+        # The authentication dependency loads the candidate on the request's session
+        await start_interview_async(db, await get_candidate_by_id_async(db, candidate_id))
+    async with AsyncSessionLocal() as db:
+        candidate = await get_candidate_by_id_async(db, candidate_id)
+        await save_answer_async_session(db, candidate, question_id, "Benchmark answer")
+
+
+async def run_mode(mode: str, candidates: int, link_code: str, question_ids: list) -> dict:
+    run_candidate = run_sync_candidate if mode == "sync" else run_async_candidate
+    latencies = []
+
+    async def one(index: int) -> None:
+        started = time.monotonic()
+        await run_candidate(link_code, question_ids[index % len(question_ids)], index)
+        latencies.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    await asyncio.gather(*(one(index) for index in range(candidates)))
+    wall = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "candidates": candidates,
+        "wall_seconds": wall,
+        "throughput": candidates * 4 / wall,
+        "p50": statistics.median(latencies),
+        "p99": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))],
+        "threads": threading.active_count()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sync (threadpool) and async database access on the candidate hot path")
+    parser.add_argument("--candidates", type=int, default=500, help="concurrent candidates per mode (4 requests each)")
+    parser.add_argument("--questions", type=int, default=5, help="questions in the benchmark interview")
+    parser.add_argument("--mode", choices=["sync", "async", "both"], default="both")
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.database import dispose_async_engine
+
+    interview_id, link_code, question_ids = create_interview(args.questions)
+    modes = ["sync", "async"] if args.mode == "both" else [args.mode]
+
+    async def run_all():
+        try:
+            return [await run_mode(mode, args.candidates, link_code, question_ids) for mode in modes]
+        finally:
+            await dispose_async_engine()
+
+    try:
+        results = asyncio.run(run_all())
+    finally:
+        delete_interview(interview_id)
+
+    print(
+        f"{args.candidates} concurrent candidates, pool {settings.DB_POOL_SIZE}+{settings.DB_MAX_OVERFLOW} "
+        f"connections per engine"
+    )
+    print(f"{'mode':<6} {'wall s':>8} {'req/s':>8} {'p50 s':>8} {'p99 s':>8} {'threads':>8}")
+    for result in results:
+        print(
+            f"{result['mode']:<6} {result['wall_seconds']:>8.2f} {result['throughput']:>8.1f} "
+            f"{result['p50']:>8.2f} {result['p99']:>8.2f} {result['threads']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ CREATE TABLE interviews (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     title VARCHAR(255) NOT NULL,
     description TEXT,
+    evaluator_backend VARCHAR(50),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -25,6 +26,7 @@ CREATE TABLE questions (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     interview_id UUID NOT NULL REFERENCES interviews(id) ON DELETE CASCADE,
     question_text TEXT NOT NULL,
+    rubric TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -67,8 +69,89 @@ CREATE TABLE interview_links (
 -- Create indexes for better query performance
 CREATE INDEX idx_questions_interview_id ON questions(interview_id);
 CREATE INDEX idx_candidates_interview_id ON candidates(interview_id);
+CREATE INDEX idx_candidates_interview_created ON candidates(interview_id, created_at, id);
+CREATE INDEX idx_interviews_created_at ON interviews(created_at, id);
 CREATE INDEX idx_answers_candidate_id ON answers(candidate_id);
 CREATE INDEX idx_answers_question_id ON answers(question_id);
 CREATE INDEX idx_candidate_auth_interview_id ON candidate_auth(interview_id);
 CREATE INDEX idx_interview_links_link_code ON interview_links(link_code);
 
+
+-- Evaluation jobs table (queue drained by evaluation workers)
+CREATE TABLE evaluation_jobs (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    candidate_id UUID NOT NULL REFERENCES candidates(id) ON DELETE CASCADE,
+    question_id UUID REFERENCES questions(id) ON DELETE CASCADE,
+    transcript TEXT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    throttles INTEGER NOT NULL DEFAULT 0,
+    run_after TIMESTAMP,
+    score INTEGER CHECK (score >= 1 AND score <= 10),
+    feedback TEXT,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP
+);
+
+CREATE INDEX idx_evaluation_jobs_candidate_id ON evaluation_jobs(candidate_id);
+CREATE INDEX idx_evaluation_jobs_status ON evaluation_jobs(status);
+CREATE INDEX idx_evaluation_jobs_created_at ON evaluation_jobs(created_at);
+
+-- Evaluation cache table (results keyed by hash of transcript, question, model and prompt version)
+CREATE TABLE evaluation_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    model VARCHAR(100) NOT NULL,
+    prompt_version VARCHAR(50) NOT NULL,
+    score INTEGER NOT NULL CHECK (score >= 1 AND score <= 10),
+    feedback TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_evaluation_cache_prompt_version ON evaluation_cache(prompt_version);
+
+-- Transcription cache table (transcripts keyed by SHA-256 of the uploaded audio)
+CREATE TABLE transcription_cache (
+    audio_hash VARCHAR(64) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    transcript TEXT NOT NULL,
+    byte_size INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (audio_hash, model)
+);
+
+-- AI call locks (cross-worker single-flight for identical transcription/evaluation calls)
+CREATE TABLE ai_call_locks (
+    call_key VARCHAR(255) PRIMARY KEY,
+    owner VARCHAR(100) NOT NULL,
+    expires_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_ai_call_locks_expires_at ON ai_call_locks(expires_at);
+
+-- Per-candidate answer aggregates (maintained when answers are saved; rebuild with rebuild_stats.py)
+CREATE TABLE candidate_stats (
+    candidate_id UUID PRIMARY KEY REFERENCES candidates(id) ON DELETE CASCADE,
+    interview_id UUID NOT NULL REFERENCES interviews(id) ON DELETE CASCADE,
+    answer_count INTEGER NOT NULL DEFAULT 0,
+    scored_count INTEGER NOT NULL DEFAULT 0,
+    score_sum INTEGER NOT NULL DEFAULT 0,
+    last_answer_at TIMESTAMP,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_candidate_stats_interview_id ON candidate_stats(interview_id);
+
+-- Interview-wide answer rollup (maintained alongside candidate_stats)
+CREATE TABLE interview_stats (
+    interview_id UUID PRIMARY KEY REFERENCES interviews(id) ON DELETE CASCADE,
+    answer_count INTEGER NOT NULL DEFAULT 0,
+    scored_count INTEGER NOT NULL DEFAULT 0,
+    score_sum INTEGER NOT NULL DEFAULT 0,
+    last_answer_at TIMESTAMP,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
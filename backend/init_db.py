@@ -10,7 +10,13 @@ from app.models import (
     Candidate,
     Answer,
     CandidateAuth,
-    InterviewLink
+    InterviewLink,
+    EvaluationJob,
+    EvaluationCacheEntry,
+    TranscriptionCacheEntry,
+    AICallLock,
+    CandidateStats,
+    InterviewStats
 )
 
 def init_db():
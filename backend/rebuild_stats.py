@@ -0,0 +1,25 @@
+"""
+Candidate stats backfill/repair
+Recomputes the candidate_stats and interview_stats aggregates from the answers table
+"""
+import argparse
+from app.database import SessionLocal
+from app.services.stats_service import rebuild_stats
+
+
+def main():
+    """Rebuild answer aggregates for one interview or all of them"""
+    parser = argparse.ArgumentParser(description="Rebuild candidate and interview answer stats")
+    parser.add_argument("--interview-id", help="Only rebuild this interview")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print("Rebuilding answer stats...")
+        written = rebuild_stats(db, args.interview_id)
+        print(f"Wrote stats for {written['candidates']} candidates and {written['interviews']} interviews")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Standalone evaluation worker
+Drains the evaluation_jobs table outside the API process
+"""
+import argparse
+import logging
+import signal
+import threading
+from app.config import settings
+from app.services.evaluation_queue_service import start_evaluation_workers, stop_evaluation_workers
+
+
+def main():
+    """Run a pool of evaluation workers until interrupted"""
+    parser = argparse.ArgumentParser(description="Run evaluation job workers")
+    parser.add_argument("--workers", type=int, default=settings.EVALUATION_WORKERS or 1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    shutdown = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: shutdown.set())
+
+    print(f"Starting {args.workers} evaluation workers...")
+    start_evaluation_workers(args.workers)
+    try:
+        while not shutdown.wait(1.0):
+            pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_evaluation_workers()
+    print("Evaluation workers stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Test configuration
+
+Settings are read from the environment when app.config is imported, so the
+required ones are filled in here first. Nothing in the tests talks to the
+real providers.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("WHISPER_API_KEY", "test-key")
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("EVALUATION_WORKERS", "0")
+os.environ.setdefault("AI_CLIENT_WARMUP_ENABLED", "false")
+os.environ.setdefault("RUBRIC_GENERATION_ENABLED", "false")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_for_sqlite(type_, compiler, **kwargs):
+    # The models use PostgreSQL's UUID type; SQLite stores it as 32 hex characters
+    return "CHAR(32)"
+
+
+@pytest.fixture
+def db_engine():
+    """Fresh in-memory SQLite database with the full schema"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)()
+    yield session
+    session.close()
@@ -0,0 +1,23 @@
+from app.services.ai_client_service import _CountingTransport, _RequestStats
+
+
+def test_connection_counts_reads_the_pool():
+    transport = _CountingTransport(_RequestStats())
+
+    assert transport.connection_counts() == {
+        "open_connections": 0,
+        "idle_connections": 0,
+        "active_connections": 0
+    }
+
+
+def test_connection_counts_unavailable_without_the_pool():
+    # httpx may rename or drop its private pool attribute
+    transport = _CountingTransport(_RequestStats())
+    del transport._pool
+
+    assert transport.connection_counts() == {
+        "open_connections": None,
+        "idle_connections": None,
+        "active_connections": None
+    }
@@ -0,0 +1,87 @@
+import asyncio
+import io
+import pytest
+from fastapi import HTTPException
+from app.controllers import ai_controller
+from app.controllers.ai_controller import evaluate_answer
+from app.models.candidate import Candidate
+from app.models.evaluation_job import EvaluationJob
+from app.models.interview import Interview
+from app.models.question import Question
+
+
+def seed_interview(db, title: str):
+    """Interview with one question and one candidate"""
+    interview = Interview(title=title)
+    db.add(interview)
+    db.flush()
+    question = Question(interview_id=interview.id, question_text="What is Python?")
+    candidate = Candidate(interview_id=interview.id, name="Candidate", email=f"{title}@example.com")
+    db.add_all([question, candidate])
+    db.commit()
+    return candidate, question
+
+
+def test_evaluate_answer_queues_job_for_own_question(db):
+    candidate, question = seed_interview(db, "own")
+
+    result = evaluate_answer(db, candidate, "Python is a language", str(question.id))
+
+    job = db.query(EvaluationJob).one()
+    assert result == {"job_id": str(job.id), "status": job.status}
+    assert job.question_id == question.id
+
+
+def test_evaluate_answer_rejects_question_of_another_interview(db):
+    candidate, _question = seed_interview(db, "own")
+    _other_candidate, other_question = seed_interview(db, "other")
+
+    with pytest.raises(HTTPException) as error:
+        evaluate_answer(db, candidate, "Python is a language", str(other_question.id))
+
+    assert error.value.status_code == 404
+    assert db.query(EvaluationJob).count() == 0
+
+
+def test_submit_answer_releases_connection_during_provider_calls(db, monkeypatch):
+    candidate, question = seed_interview(db, "submit")
+    in_transaction = []
+
+    def fake_transcribe(*args):
+        in_transaction.append(db.in_transaction())
+        return "Python is a language"
+
+    def fake_evaluate(transcript, question, backend=None):
+        in_transaction.append(db.in_transaction())
+        return 7, "Good answer."
+
+    monkeypatch.setattr(ai_controller, "transcribe_audio", fake_transcribe)
+    monkeypatch.setattr(ai_controller, "evaluate_text", fake_evaluate)
+
+    answer = ai_controller.submit_answer(db, candidate, str(question.id), io.BytesIO(b"audio"), "answer.webm")
+
+    assert in_transaction == [False, False]
+    assert (answer["transcript"], answer["score"]) == ("Python is a language", 7)
+
+
+def test_submit_answer_async_releases_connection_during_provider_calls(db, monkeypatch):
+    candidate, question = seed_interview(db, "submit-async")
+    in_transaction = []
+
+    async def fake_transcribe(*args):
+        in_transaction.append(db.in_transaction())
+        return "Python is a language"
+
+    async def fake_evaluate(transcript, question, backend=None):
+        in_transaction.append(db.in_transaction())
+        return 7, "Good answer."
+
+    monkeypatch.setattr(ai_controller, "transcribe_audio_async", fake_transcribe)
+    monkeypatch.setattr(ai_controller, "evaluate_text_async", fake_evaluate)
+
+    answer = asyncio.run(ai_controller.submit_answer_async(
+        db, candidate, str(question.id), io.BytesIO(b"audio"), "answer.webm"
+    ))
+
+    assert in_transaction == [False, False]
+    assert (answer["transcript"], answer["score"]) == ("Python is a language", 7)
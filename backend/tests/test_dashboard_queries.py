@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app.controllers.admin_controller import get_interview_dashboard
+from app.models.candidate import Candidate
+from app.models.interview import Interview
+from app.models.question import Question
+from app.services.answer_service import upsert_answer
+
+QUESTIONS = 3
+
+
+def seed_interview(db, candidates: int):
+    """Interview with `candidates` candidates, each answering every question"""
+    interview = Interview(title="Dashboard test")
+    db.add(interview)
+    db.flush()
+    questions = [
+        Question(interview_id=interview.id, question_text=f"Question {index}")
+        for index in range(QUESTIONS)
+    ]
+    candidate_rows = [
+        Candidate(interview_id=interview.id, name=f"Candidate {index}", email=f"candidate{index}@example.com")
+        for index in range(candidates)
+    ]
+    db.add_all(questions + candidate_rows)
+    db.commit()
+
+    for index, candidate in enumerate(candidate_rows):
+        for question in questions:
+            upsert_answer(db, candidate.id, question.id, "An answer", 1 + index % 10, "Feedback")
+    return interview.id
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize("candidates", [1, 10, 100])
+def test_dashboard_query_count_does_not_grow_with_candidates(db, db_engine, candidates):
+    interview_id = seed_interview(db, candidates)
+    db.expire_all()
+
+    with count_statements(db_engine) as statements:
+        dashboard = get_interview_dashboard(db, interview_id, page_size=200)
+
+    assert len(statements) == 2
+    assert dashboard.total_candidates == candidates
+    assert len(dashboard.candidates) == candidates
+    assert all(candidate.total_answers == QUESTIONS for candidate in dashboard.candidates)
@@ -0,0 +1,119 @@
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from app.services import evaluator_backends
+from app.services.evaluator_backends import (
+    DEFAULT_SCORE,
+    EscalatingEvaluator,
+    EvaluatorBackend,
+    GeminiEvaluator,
+    parse_assessment,
+    parse_evaluation
+)
+
+
+@pytest.mark.parametrize("response_text, score", [
+    ("SCORE: 8\nCONFIDENCE: 9\nFEEDBACK: good", 8),
+    ("SCORE: 8/10\nCONFIDENCE: 9\nFEEDBACK: good", 8),
+    ("Score: 8\nConfidence: 9\nFeedback: good", 8),
+    ("score: 8 / 10\nconfidence: 9/10\nfeedback: good", 8),
+    ("**Score:** 8/10\n**Confidence:** 9\n**Feedback:** good", 8),
+    ("SCORE: 4/5\nFEEDBACK: good", 8),
+    ("SCORE: 7.6\nFEEDBACK: good", 8),
+    ("SCORE: 14\nFEEDBACK: good", 10),
+    ("SCORE: 0/10\nFEEDBACK: good", 1),
+])
+def test_parse_assessment_reads_score_formats(response_text, score):
+    assessment = parse_assessment(response_text)
+
+    assert assessment.score == score
+    assert assessment.parsed
+    assert assessment.feedback == "good"
+    assert parse_evaluation(response_text) == (score, "good")
+
+
+def test_parse_assessment_reads_confidence_on_ten_point_scale():
+    assert parse_assessment("SCORE: 8/10\nCONFIDENCE: 9\nFEEDBACK: good").confidence == 9
+    assert parse_assessment("Score: 8\nConfidence: 3/5\nFeedback: good").confidence == 6
+    assert parse_assessment("SCORE: 8\nFEEDBACK: good").confidence is None
+
+
+@pytest.mark.parametrize("response_text", [
+    "FEEDBACK: good",
+    "SCORE: eight\nFEEDBACK: good",
+    "SCORE: 8/0\nFEEDBACK: good",
+    "SCORE:\nCONFIDENCE: 9\nFEEDBACK: good",
+])
+def test_parse_assessment_without_a_score_uses_the_default(response_text):
+    assessment = parse_assessment(response_text)
+
+    assert assessment.score == DEFAULT_SCORE
+    assert not assessment.parsed
+
+
+def test_parse_assessment_feedback_without_label():
+    assessment = parse_assessment("Score: 6/10\nClear answer.\nMention trade-offs.\nExtra line.")
+
+    assert assessment.score == 6
+    assert assessment.feedback == "Clear answer.\nMention trade-offs."
+
+
+def test_parse_assessment_keeps_two_feedback_lines():
+    response_text = "SCORE: 7\nFEEDBACK: First line.\nSecond line.\nThird line."
+
+    assert parse_assessment(response_text).feedback == "First line.\nSecond line."
+
+
+def test_assess_batch_reads_scores_like_the_single_path(monkeypatch):
+    items = [
+        {"answer": 1, "score": 7.5, "confidence": "9/10", "feedback": "good"},
+        {"answer": 2, "score": "8/10", "confidence": 9, "feedback": "good"},
+        {"answer": 3, "score": 14, "feedback": "good"},
+        {"answer": 4, "score": "4 / 5", "feedback": "good"},
+        {"answer": 5, "score": "eight", "feedback": "good"},
+    ]
+    response = SimpleNamespace(text=json.dumps(items))
+    monkeypatch.setattr(evaluator_backends, "call_provider", lambda *args, **kwargs: response)
+
+    parsed = GeminiEvaluator("test-model").assess_batch(["answer"] * 5, [None] * 5)
+
+    assert {offset: assessment.score for offset, assessment in parsed.items()} == {0: 8, 1: 8, 2: 10, 3: 8}
+    assert parsed[0].confidence == 9
+    assert parsed[2].confidence is None
+    for offset, assessment in parsed.items():
+        assert assessment.score == parse_assessment(
+            f"SCORE: {items[offset]['score']}\nFEEDBACK: good"
+        ).score
+
+
+class StubEvaluator(EvaluatorBackend):
+    """Returns a fixed result, or raises error"""
+
+    def __init__(self, result=(DEFAULT_SCORE, "ok"), error=None):
+        self.result = result
+        self.error = error
+
+    @property
+    def model(self) -> str:
+        return "stub"
+
+    def evaluate(self, transcript, question=None):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def test_escalation_is_recorded_when_the_primary_fails():
+    # A mid-range score is borderline, so every answer goes to the failing primary
+    router = EscalatingEvaluator(StubEvaluator(result=(5, "ok")), StubEvaluator(error=RuntimeError("down")))
+
+    with pytest.raises(RuntimeError):
+        router.evaluate("answer")
+    with pytest.raises(RuntimeError):
+        asyncio.run(router.evaluate_async("answer"))
+
+    stats = router.snapshot()
+    assert stats["answers"] == 2
+    assert stats["reasons"]["borderline"] == 2
+    assert stats["escalated_p50_seconds"] is not None
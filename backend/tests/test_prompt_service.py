@@ -0,0 +1,75 @@
+from app.config import settings
+from app.services.prompt_service import TRUNCATION_MARKER, estimate_tokens, fit_to_budget
+
+
+def test_fit_to_budget_keeps_short_text():
+    assert fit_to_budget("A short answer.", 100) == "A short answer."
+
+
+def test_fit_to_budget_cuts_the_middle_on_word_boundaries():
+    text = " ".join(f"word{index}" for index in range(500))
+
+    fitted = fit_to_budget(text, 60)
+
+    head, tail = fitted.split(TRUNCATION_MARKER)
+    assert text.startswith(head)
+    assert text.endswith(tail)
+    assert head.split()[-1] in text.split()
+    assert tail.split()[0] in text.split()
+    assert estimate_tokens(fitted) <= 60
+
+
+def cut_sizes(max_tokens: int):
+    """(head_chars, tail_chars) fit_to_budget keeps for max_tokens: two thirds head, one third tail"""
+    budget = int(max_tokens * settings.EVALUATION_CHARS_PER_TOKEN) - len(TRUNCATION_MARKER)
+    return budget * 2 // 3, budget - budget * 2 // 3
+
+
+def test_fit_to_budget_whitespace_only_input():
+    assert fit_to_budget(" " * 5000, 50) == ""
+
+
+def test_fit_to_budget_ignores_whitespace_padding():
+    # Whisper output padded with whitespace: the padding must not use up the budget
+    text = " " * 2000 + "the actual answer " * 20 + "\n\t " * 1000
+
+    assert fit_to_budget(text, 200) == " ".join(("the actual answer " * 20).split())
+
+    fitted = fit_to_budget(text, 50)
+    assert fitted.startswith("the actual answer")
+    assert fitted.endswith("the actual answer")
+    assert TRUNCATION_MARKER in fitted
+
+
+def test_fit_to_budget_keeps_word_ending_at_head_cut():
+    head_chars, _tail_chars = cut_sizes(60)
+    head = "one " + "a" * (head_chars - 4)
+
+    fitted = fit_to_budget(head + " " + "word " * 200, 60)
+
+    assert fitted.startswith(head + TRUNCATION_MARKER)
+
+
+def test_fit_to_budget_drops_partial_single_token_head():
+    head_chars, _tail_chars = cut_sizes(60)
+
+    fitted = fit_to_budget("a" * (head_chars + 10) + " " + "word " * 200, 60)
+
+    assert fitted.startswith(TRUNCATION_MARKER)
+
+
+def test_fit_to_budget_keeps_word_starting_at_tail_cut():
+    _head_chars, tail_chars = cut_sizes(60)
+    tail = "b" * (tail_chars - 4) + " end"
+
+    fitted = fit_to_budget("word " * 200 + tail, 60)
+
+    assert fitted.endswith(TRUNCATION_MARKER + tail)
+
+
+def test_fit_to_budget_drops_partial_single_token_tail():
+    _head_chars, tail_chars = cut_sizes(60)
+
+    fitted = fit_to_budget("word " * 200 + "z" * (tail_chars + 10), 60)
+
+    assert fitted.endswith(TRUNCATION_MARKER)
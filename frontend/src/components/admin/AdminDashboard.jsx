@@ -7,27 +7,70 @@ import api from '../../hooks/useApi';
 import InterviewCard from './InterviewCard';
 import { ROUTES } from '../../utils/constants';
 
+const PAGE_SIZE = 50;
+
+const EMPTY_FILTERS = { search: '', createdFrom: '', createdTo: '' };
+
 const AdminDashboard = () => {
   const [interviews, setInterviews] = useState([]);
+  const [total, setTotal] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [filters, setFilters] = useState(EMPTY_FILTERS);
+  const [appliedFilters, setAppliedFilters] = useState(EMPTY_FILTERS);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const navigate = useNavigate();
 
   useEffect(() => {
     fetchInterviews();
-  }, []);
+  }, [appliedFilters]);
+
+  const fetchInterviews = async (cursor = null) => {
+    const params = { limit: PAGE_SIZE, include_total: cursor === null };
+    if (cursor) params.cursor = cursor;
+    if (appliedFilters.search) params.search = appliedFilters.search;
+    if (appliedFilters.createdFrom) params.created_from = appliedFilters.createdFrom;
+    if (appliedFilters.createdTo) params.created_to = appliedFilters.createdTo;
 
-  const fetchInterviews = async () => {
     try {
-      const response = await api.get('/admin/interviews');
-      setInterviews(response.data.interviews || []);
+      const response = await api.get('/admin/interviews', { params });
+      const page = response.data.interviews || [];
+      if (cursor) {
+        setInterviews((current) => [...current, ...page]);
+      } else {
+        setInterviews(page);
+        setTotal(response.data.total ?? page.length);
+      }
+      setNextCursor(response.data.next_cursor || null);
+      setError('');
     } catch (err) {
       setError(err.response?.data?.detail || 'Failed to load interviews');
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
+  const handleLoadMore = () => {
+    setLoadingMore(true);
+    fetchInterviews(nextCursor);
+  };
+
+  const handleFilterChange = (e) => {
+    setFilters({ ...filters, [e.target.name]: e.target.value });
+  };
+
+  const handleFilterSubmit = (e) => {
+    e.preventDefault();
+    setAppliedFilters({ ...filters, search: filters.search.trim() });
+  };
+
+  const handleClearFilters = () => {
+    setFilters(EMPTY_FILTERS);
+    setAppliedFilters(EMPTY_FILTERS);
+  };
+
   const handleCreateInterview = () => {
     navigate('/admin/create-interview');
   };
@@ -47,19 +90,48 @@ const AdminDashboard = () => {
 
       {error && <div className="error">{error}</div>}
 
+      <form onSubmit={handleFilterSubmit} style={{ display: 'flex', gap: '10px', alignItems: 'center', marginBottom: '20px' }}>
+        <input
+          type="text"
+          name="search"
+          placeholder="Search titles"
+          value={filters.search}
+          onChange={handleFilterChange}
+        />
+        <label>
+          Created from{' '}
+          <input type="date" name="createdFrom" value={filters.createdFrom} onChange={handleFilterChange} />
+        </label>
+        <label>
+          before{' '}
+          <input type="date" name="createdTo" value={filters.createdTo} onChange={handleFilterChange} />
+        </label>
+        <button type="submit" className="btn btn-secondary">Filter</button>
+        <button type="button" className="btn btn-secondary" onClick={handleClearFilters}>Clear</button>
+      </form>
+
       <div style={{ marginBottom: '20px' }}>
-        <strong>Total Interviews:</strong> {interviews.length}
+        <strong>Total Interviews:</strong> {total}
       </div>
 
       {interviews.length === 0 ? (
         <div className="card">
-          <p>No interviews yet. Create your first interview to get started.</p>
+          {appliedFilters === EMPTY_FILTERS ? (
+            <p>No interviews yet. Create your first interview to get started.</p>
+          ) : (
+            <p>No interviews match these filters.</p>
+          )}
         </div>
       ) : (
         <div>
           {interviews.map((interview) => (
             <InterviewCard key={interview.id} interview={interview} />
           ))}
+          {nextCursor && (
+            <button className="btn btn-secondary" disabled={loadingMore} onClick={handleLoadMore}>
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -67,4 +139,3 @@ const AdminDashboard = () => {
 };
 
 export default AdminDashboard;
-
@@ -9,19 +9,20 @@ import { ROUTES } from '../../utils/constants';
 const CreateInterview = () => {
   const [title, setTitle] = useState('');
   const [description, setDescription] = useState('');
-  const [questions, setQuestions] = useState(['']);
+  const [evaluatorBackend, setEvaluatorBackend] = useState('');
+  const [questions, setQuestions] = useState([{ text: '', expectedPoints: '' }]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
   const navigate = useNavigate();
 
   const handleAddQuestion = () => {
-    setQuestions([...questions, '']);
+    setQuestions([...questions, { text: '', expectedPoints: '' }]);
   };
 
-  const handleQuestionChange = (index, value) => {
+  const handleQuestionChange = (index, field, value) => {
     const newQuestions = [...questions];
-    newQuestions[index] = value;
+    newQuestions[index] = { ...newQuestions[index], [field]: value };
     setQuestions(newQuestions);
   };
 
@@ -41,17 +42,19 @@ const CreateInterview = () => {
       const interviewResponse = await api.post('/admin/create-interview', {
         title,
         description: description || null,
+        evaluator_backend: evaluatorBackend || null,
       });
 
       const interviewId = interviewResponse.data.id;
 
       // Add questions
-      const validQuestions = questions.filter(q => q.trim() !== '');
-      for (const questionText of validQuestions) {
+      const validQuestions = questions.filter(q => q.text.trim() !== '');
+      for (const question of validQuestions) {
         await api.post('/admin/add-question', null, {
           params: {
             interview_id: interviewId,
-            question_text: questionText,
+            question_text: question.text,
+            expected_points: question.expectedPoints.trim() || undefined,
           },
         });
       }
@@ -104,6 +107,19 @@ const CreateInterview = () => {
           />
         </div>
 
+        <div className="form-group">
+          <label>Answer Evaluation</label>
+          <select
+            value={evaluatorBackend}
+            onChange={(e) => setEvaluatorBackend(e.target.value)}
+            disabled={loading}
+          >
+            <option value="">Server default</option>
+            <option value="gemini">Gemini (AI)</option>
+            <option value="heuristic">Heuristic (local, instant)</option>
+          </select>
+        </div>
+
         <div className="form-group">
           <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', marginBottom: '10px' }}>
             <label>Questions *</label>
@@ -118,26 +134,36 @@ const CreateInterview = () => {
           </div>
 
           {questions.map((question, index) => (
-            <div key={index} style={{ display: 'flex', gap: '10px', marginBottom: '10px' }}>
-              <input
-                type="text"
-                value={question}
-                onChange={(e) => handleQuestionChange(index, e.target.value)}
-                placeholder={`Question ${index + 1}`}
-                required={index === 0}
+            <div key={index} style={{ marginBottom: '10px' }}>
+              <div style={{ display: 'flex', gap: '10px' }}>
+                <input
+                  type="text"
+                  value={question.text}
+                  onChange={(e) => handleQuestionChange(index, 'text', e.target.value)}
+                  placeholder={`Question ${index + 1}`}
+                  required={index === 0}
+                  disabled={loading}
+                  style={{ flex: 1 }}
+                />
+                {questions.length > 1 && (
+                  <button
+                    type="button"
+                    className="btn btn-secondary"
+                    onClick={() => handleRemoveQuestion(index)}
+                    disabled={loading}
+                  >
+                    Remove
+                  </button>
+                )}
+              </div>
+              <textarea
+                value={question.expectedPoints}
+                onChange={(e) => handleQuestionChange(index, 'expectedPoints', e.target.value)}
+                placeholder="Expected key points, one per line (optional; generated if left empty)"
                 disabled={loading}
-                style={{ flex: 1 }}
+                rows={2}
+                style={{ marginTop: '5px' }}
               />
-              {questions.length > 1 && (
-                <button
-                  type="button"
-                  className="btn btn-secondary"
-                  onClick={() => handleRemoveQuestion(index)}
-                  disabled={loading}
-                >
-                  Remove
-                </button>
-              )}
             </div>
           ))}
         </div>
@@ -6,20 +6,33 @@ import { useParams, useNavigate } from 'react-router-dom';
 import api from '../../hooks/useApi';
 import { ROUTES } from '../../utils/constants';
 
+const PAGE_SIZE = 50;
+
+const SORT_OPTIONS = [
+  { value: 'created_at', label: 'Registration date' },
+  { value: 'average_score', label: 'Average score' },
+  { value: 'last_answer_at', label: 'Latest answer' },
+];
+
 const InterviewDashboard = () => {
   const { id } = useParams();
   const navigate = useNavigate();
   const [dashboard, setDashboard] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
+  const [page, setPage] = useState(1);
+  const [sortBy, setSortBy] = useState('created_at');
+  const [order, setOrder] = useState('desc');
 
   useEffect(() => {
     fetchDashboard();
-  }, [id]);
+  }, [id, page, sortBy, order]);
 
   const fetchDashboard = async () => {
     try {
-      const response = await api.get(`/admin/interview/${id}/dashboard`);
+      const response = await api.get(`/admin/interview/${id}/dashboard`, {
+        params: { page, page_size: PAGE_SIZE, sort_by: sortBy, order },
+      });
       setDashboard(response.data);
     } catch (err) {
       setError(err.response?.data?.detail || 'Failed to load dashboard');
@@ -32,6 +45,16 @@ const InterviewDashboard = () => {
     navigate(`/admin/report/${candidateId}`);
   };
 
+  const handleSortChange = (value) => {
+    setSortBy(value);
+    setPage(1);
+  };
+
+  const handleOrderChange = (value) => {
+    setOrder(value);
+    setPage(1);
+  };
+
   if (loading) {
     return <div className="container">Loading...</div>;
   }
@@ -44,6 +67,8 @@ const InterviewDashboard = () => {
     return <div className="container">No data available</div>;
   }
 
+  const totalPages = Math.max(1, Math.ceil(dashboard.total_candidates / dashboard.page_size));
+
   return (
     <div className="container">
       <div style={{ marginBottom: '20px' }}>
@@ -60,7 +85,20 @@ const InterviewDashboard = () => {
         <p><strong>Total Questions:</strong> {dashboard.total_questions}</p>
       </div>
 
-      <h2>Candidates</h2>
+      <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
+        <h2>Candidates</h2>
+        <div>
+          <select value={sortBy} onChange={(e) => handleSortChange(e.target.value)}>
+            {SORT_OPTIONS.map((option) => (
+              <option key={option.value} value={option.value}>{option.label}</option>
+            ))}
+          </select>
+          <select value={order} onChange={(e) => handleOrderChange(e.target.value)} style={{ marginLeft: '10px' }}>
+            <option value="desc">Descending</option>
+            <option value="asc">Ascending</option>
+          </select>
+        </div>
+      </div>
 
       {dashboard.candidates.length === 0 ? (
         <div className="card">
@@ -88,6 +126,15 @@ const InterviewDashboard = () => {
               </div>
             </div>
           ))}
+          <div style={{ display: 'flex', justifyContent: 'center', alignItems: 'center', gap: '10px' }}>
+            <button className="btn btn-secondary" disabled={page <= 1} onClick={() => setPage(page - 1)}>
+              Previous
+            </button>
+            <span>Page {dashboard.page} of {totalPages}</span>
+            <button className="btn btn-secondary" disabled={page >= totalPages} onClick={() => setPage(page + 1)}>
+              Next
+            </button>
+          </div>
         </div>
       )}
     </div>
@@ -1,11 +1,12 @@
 /**
  * Question screen component - displays question, handles reading timer, recording, and auto-progress
  */
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import Timer from '../shared/Timer';
 import { useReadingTimer } from '../../hooks/useReadingTimer';
 import { useAutoRecorder } from '../../hooks/useAutoRecorder';
 import api from '../../hooks/useApi';
+import { openAnswerStream } from '../../utils/answerStream';
 
 const QuestionScreen = ({ question, questionNumber, totalQuestions, onNext, onComplete }) => {
   const [stage, setStage] = useState('reading'); // reading, recording, transcribing, evaluating, results
@@ -13,6 +14,7 @@ const QuestionScreen = ({ question, questionNumber, totalQuestions, onNext, onCo
   const [score, setScore] = useState(null);
   const [feedback, setFeedback] = useState('');
   const [error, setError] = useState('');
+  const streamRef = useRef(null);
 
   // Reading timer (30 seconds)
   const readingTimer = useReadingTimer(() => {
@@ -21,13 +23,27 @@ const QuestionScreen = ({ question, questionNumber, totalQuestions, onNext, onCo
   });
 
   // Auto recorder (60 seconds) - starts when stage is 'recording'
-  const { isRecording, audioBlob, timeRemaining: recordingTime, error: recordingError } = useAutoRecorder(stage === 'recording');
+  // Audio is streamed to the server while recording so the transcript is ready when it stops
+  const { isRecording, audioBlob, timeRemaining: recordingTime, error: recordingError } = useAutoRecorder(
+    stage === 'recording',
+    (chunk) => streamRef.current?.send(chunk)
+  );
 
   // Start reading timer when component mounts
   useEffect(() => {
     readingTimer.start();
   }, []);
 
+  // Open the answer stream when recording starts
+  useEffect(() => {
+    if (stage === 'recording' && !streamRef.current) {
+      streamRef.current = openAnswerStream(question.id, setTranscript);
+    }
+  }, [stage, question.id]);
+
+  // Close an unfinished stream when leaving the question
+  useEffect(() => () => streamRef.current?.close(), []);
+
   // Handle recording completion
   useEffect(() => {
     if (audioBlob && stage === 'recording') {
@@ -48,47 +64,38 @@ const QuestionScreen = ({ question, questionNumber, totalQuestions, onNext, onCo
     setStage('transcribing');
     setError('');
 
+    const stream = streamRef.current;
+    streamRef.current = null;
+
     try {
-      // Create FormData for audio file
-      const formData = new FormData();
-      formData.append('audio_file', audioBlob, 'recording.wav');
-
-      // Transcribe audio
-      const transcriptResponse = await api.post('/ai/transcribe', formData, {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-      });
-
-      const transcribedText = transcriptResponse.data.transcript;
-      setTranscript(transcribedText);
-
-      // Evaluate transcript
-      setStage('evaluating');
-      const evaluateFormData = new FormData();
-      evaluateFormData.append('transcript', transcribedText);
-      const evaluateResponse = await api.post('/ai/evaluate', evaluateFormData, {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-      });
-
-      const evaluationScore = evaluateResponse.data.score;
-      const evaluationFeedback = evaluateResponse.data.feedback;
-      setScore(evaluationScore);
-      setFeedback(evaluationFeedback);
-
-      // Save answer
-      const saveFormData = new FormData();
-      saveFormData.append('question_id', question.id);
-      saveFormData.append('transcript', transcribedText);
-      saveFormData.append('score', evaluationScore.toString());
-      saveFormData.append('feedback', evaluationFeedback);
-      await api.post('/candidate/save-answer', saveFormData, {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-      });
+      let answer = null;
+      if (stream) {
+        try {
+          answer = await stream.finish();
+        } catch (streamError) {
+          console.warn('Streaming answer failed, uploading the recording instead:', streamError.message);
+        } finally {
+          stream.close();
+        }
+      }
+
+      if (!answer) {
+        // Transcribe, evaluate and save in a single server-side pipeline
+        const formData = new FormData();
+        formData.append('audio_file', audioBlob, 'recording.wav');
+        formData.append('question_id', question.id);
+
+        const answerResponse = await api.post('/ai/answer', formData, {
+          headers: {
+            'Content-Type': 'multipart/form-data',
+          },
+        });
+        answer = answerResponse.data;
+      }
+
+      setTranscript(answer.transcript);
+      setScore(answer.score);
+      setFeedback(answer.feedback);
 
       setStage('results');
 
@@ -101,7 +108,7 @@ const QuestionScreen = ({ question, questionNumber, totalQuestions, onNext, onCo
         }
       }, 3000);
     } catch (err) {
-      setError(err.response?.data?.detail || 'Failed to process answer');
+      setError(err.response?.data?.detail || err.message || 'Failed to process answer');
       setStage('recording');
     }
   };
@@ -141,12 +148,17 @@ const QuestionScreen = ({ question, questionNumber, totalQuestions, onNext, onCo
               <p style={{ marginTop: '10px' }}>Recording in progress...</p>
             </div>
           )}
+          {transcript && (
+            <p style={{ marginTop: '20px', padding: '10px', backgroundColor: '#f5f5f5', borderRadius: '5px', color: '#666' }}>
+              {transcript}
+            </p>
+          )}
         </div>
       )}
 
       {stage === 'transcribing' && (
         <div style={{ textAlign: 'center', padding: '40px' }}>
-          <p>Transcribing your answer...</p>
+          <p>Transcribing and evaluating your answer...</p>
         </div>
       )}
 
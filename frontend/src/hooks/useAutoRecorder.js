@@ -1,12 +1,15 @@
 /**
  * Custom hook for automatic audio recording (60 seconds)
  * Auto-starts microphone on mount and stops after 60 seconds
+ * When onChunk is given, recorded audio is also handed over every
+ * CHUNK_INTERVAL_MS so it can be streamed while recording
  */
 import { useState, useEffect, useRef, useCallback } from 'react';
 
 const RECORDING_DURATION = 60; // 60 seconds
+const CHUNK_INTERVAL_MS = 250;
 
-export const useAutoRecorder = (autoStart = true) => {
+export const useAutoRecorder = (autoStart = true, onChunk = null) => {
   const [isRecording, setIsRecording] = useState(false);
   const [audioBlob, setAudioBlob] = useState(null);
   const [error, setError] = useState(null);
@@ -17,6 +20,8 @@ export const useAutoRecorder = (autoStart = true) => {
   const streamRef = useRef(null);
   const timerRef = useRef(null);
   const isRecordingRef = useRef(false); // Add ref to track recording state
+  const onChunkRef = useRef(onChunk);
+  onChunkRef.current = onChunk;
 
   const stopRecording = useCallback(() => {
     if (mediaRecorderRef.current && isRecordingRef.current) {
@@ -48,6 +53,7 @@ export const useAutoRecorder = (autoStart = true) => {
       mediaRecorder.ondataavailable = (event) => {
         if (event.data.size > 0) {
           audioChunksRef.current.push(event.data);
+          onChunkRef.current?.(event.data);
         }
       };
 
@@ -64,8 +70,8 @@ export const useAutoRecorder = (autoStart = true) => {
         }
       };
 
-      // Start recording
-      mediaRecorder.start();
+      // Start recording (in timeslices when the audio is streamed)
+      mediaRecorder.start(onChunkRef.current ? CHUNK_INTERVAL_MS : undefined);
       isRecordingRef.current = true;
       setIsRecording(true);
       setTimeRemaining(RECORDING_DURATION);
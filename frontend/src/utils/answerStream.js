@@ -0,0 +1,63 @@
+/**
+ * WebSocket client for streaming an answer while it is being recorded
+ */
+import { WS_BASE_URL } from './constants';
+import { getCandidateToken } from './auth';
+
+/**
+ * Open a streaming answer session
+ * Chunks sent before the socket is open are queued. finish() resolves with
+ * the saved answer, or rejects if the stream failed (callers fall back to
+ * uploading the whole recording)
+ */
+export const openAnswerStream = (questionId, onTranscript) => {
+  const params = new URLSearchParams({ token: getCandidateToken() || '', question_id: questionId });
+  const socket = new WebSocket(`${WS_BASE_URL}/ai/answer/stream?${params}`);
+  const queue = [];
+  let failed = null;
+  let settle = null;
+
+  const fail = (message) => {
+    failed = failed || new Error(message);
+    if (settle) settle.reject(failed);
+  };
+
+  socket.onopen = () => {
+    queue.splice(0).forEach((chunk) => socket.send(chunk));
+  };
+
+  socket.onmessage = (event) => {
+    const message = JSON.parse(event.data);
+    if (message.type === 'transcript') {
+      onTranscript?.(message.text);
+    } else if (message.type === 'answer') {
+      settle?.resolve(message);
+      settle = null;
+    } else if (message.type === 'error') {
+      fail(message.detail);
+    }
+  };
+
+  socket.onerror = () => fail('Streaming connection failed');
+  socket.onclose = () => fail('Streaming connection closed');
+
+  return {
+    send: (chunk) => {
+      if (failed) return;
+      if (socket.readyState === WebSocket.OPEN) {
+        socket.send(chunk);
+      } else {
+        queue.push(chunk);
+      }
+    },
+    finish: () => new Promise((resolve, reject) => {
+      if (failed || socket.readyState !== WebSocket.OPEN) {
+        reject(failed || new Error('Streaming connection is not open'));
+        return;
+      }
+      settle = { resolve, reject };
+      socket.send('stop');
+    }),
+    close: () => socket.close(),
+  };
+};
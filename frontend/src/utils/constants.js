@@ -4,6 +4,8 @@
 
 export const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 
+export const WS_BASE_URL = API_BASE_URL.replace(/^http/, 'ws');
+
 export const ROUTES = {
   ADMIN_LOGIN: '/admin/login',
   ADMIN_DASHBOARD: '/admin/dashboard',